@@ -0,0 +1,65 @@
+# calibration.py
+# Offset calibration helpers for the MPU6050: a streaming mean/variance
+# accumulator and a small binary cache file, one per I2C address.
+
+from array import array
+import struct
+
+# magic, addr, accel range, gyro range, temperature (degC), 6 raw offsets
+_FMT = "<4sBBBf6h"
+_MAGIC = b"MPU6"
+
+
+class Welford:
+    """Streaming mean and variance per channel (Welford's algorithm)."""
+
+    def __init__(self, channels):
+        self.channels = channels
+        self.n = 0
+        self.mean = array('f', [0.0] * channels)
+        self._m2 = array('f', [0.0] * channels)
+
+    def update(self, values):
+        self.n += 1
+        n = self.n
+        mean = self.mean
+        m2 = self._m2
+        for i in range(self.channels):
+            x = values[i]
+            d = x - mean[i]
+            mean[i] += d / n
+            m2[i] += d * (x - mean[i])
+
+    def variance(self, i):
+        if self.n < 2:
+            return 0.0
+        return self._m2[i] / (self.n - 1)
+
+    def std(self, i):
+        return self.variance(i) ** 0.5
+
+
+def default_path(addr):
+    return "/mpu6050_{:02x}.cal".format(addr)
+
+
+def save(path, addr, accel_range, gyro_range, temp, offsets):
+    with open(path, "wb") as f:
+        f.write(struct.pack(_FMT, _MAGIC, addr, accel_range, gyro_range,
+                            temp, *offsets))
+
+
+def load(path, addr):
+    """Returns (accel_range, gyro_range, temp, offsets) or None when the file
+    is missing, corrupt or belongs to another address."""
+    try:
+        with open(path, "rb") as f:
+            data = f.read()
+    except OSError:
+        return None
+    if len(data) != struct.calcsize(_FMT):
+        return None
+    fields = struct.unpack(_FMT, data)
+    if fields[0] != _MAGIC or fields[1] != addr:
+        return None
+    return fields[2], fields[3], fields[4], fields[5:]
@@ -3,14 +3,24 @@
 # Original repo https://github.com/nickcoutsos/MPU-6050-Python
 # and https://github.com/CoreElectronics/CE-PiicoDev-MPU6050-MicroPython-Module
 
+from array import array
 from math import sqrt, atan2
-from machine import Pin, SoftI2C
+from machine import Pin
 from time import sleep_ms
+import micropython
 import uasyncio as asyncio
+from i2c_bus import get_bus, CircuitBreaker
+from logger import get_logger
 
+from .fifo import FifoStream
+from .fusion import Orientation
+from .features import WindowFeatures
+from . import calibration
 
-error_msg = "\nError \n"
-i2c_err_str = "ESP32 could not communicate with module at address 0x{:02X}, check wiring"
+
+i2c_err_str = "ESP32 could not communicate with module at address 0x%02X, check wiring"
+
+_log = get_logger("mpu6050")
 
 # Global Variables
 _GRAVITIY_MS2 = 9.80665
@@ -46,10 +56,34 @@ _TEMP_OUT0 = 0x41
 
 _GYRO_XOUT0 = 0x43
 
+# ACCEL_XOUT_H .. GYRO_ZOUT_L: accel (6) + temp (2) + gyro (6)
+_BURST_LEN = 14
+
 _ACCEL_CONFIG = 0x1C
 _GYRO_CONFIG = 0x1B
 
+_SMPLRT_DIV = 0x19
+_CONFIG = 0x1A
+_MOT_THR = 0x1F
+_MOT_DUR = 0x20
+_INT_PIN_CFG = 0x37
+_INT_ENABLE = 0x38
+_INT_STATUS = 0x3A
+
+# ACCEL_CONFIG: full-scale bits; the low bits hold the motion high-pass filter
+_ACC_RNG_MASK = 0x18
+_ACC_HPF_0_63HZ = 0x04
+
+# INT_ENABLE / INT_STATUS bits
+_INT_DATA_RDY = 0x01
+_INT_MOTION = 0x40
+
+# watch_state interrupt modes
+INT_DATA_READY = "data_ready"
+INT_MOTION = "motion"
+
 _maxFails = 3
+_retryDelayMs = 2
 
 # Address
 _MPU6050_ADDRESS = 0x68
@@ -61,6 +95,37 @@ def signedIntFromBytes(x, endian="big"):
     else:
         return y
 
+# Signed big-endian int16 at buf[i], without slicing buf
+def _s16(buf, i):
+    y = (buf[i] << 8) | buf[i + 1]
+    if y >= 0x8000:
+        return y - 0x10000
+    return y
+
+def _accel_scaler(accel_range):
+    if accel_range == _ACC_RNG_2G:
+        return _ACC_SCLR_2G
+    elif accel_range == _ACC_RNG_4G:
+        return _ACC_SCLR_4G
+    elif accel_range == _ACC_RNG_8G:
+        return _ACC_SCLR_8G
+    elif accel_range == _ACC_RNG_16G:
+        return _ACC_SCLR_16G
+    _log.warning("unknown range - scaler set to _ACC_SCLR_2G")
+    return _ACC_SCLR_2G
+
+def _gyro_scaler(gyro_range):
+    if gyro_range == _GYR_RNG_250DEG:
+        return _GYR_SCLR_250DEG
+    elif gyro_range == _GYR_RNG_500DEG:
+        return _GYR_SCLR_500DEG
+    elif gyro_range == _GYR_RNG_1000DEG:
+        return _GYR_SCLR_1000DEG
+    elif gyro_range == _GYR_RNG_2000DEG:
+        return _GYR_SCLR_2000DEG
+    _log.warning("unknown range - scaler set to _GYR_SCLR_250DEG")
+    return _GYR_SCLR_250DEG
+
 # --- add at the very top of the file (or reuse the one you already have) ----
 class MethodWrapper:
     """Allows obj['method'][args] syntax."""
@@ -77,28 +142,53 @@ class MPU6050(object):
         # Checks any erorr would happen with I2C communication protocol.
         self._failCount = 0
         self._terminatingFailCount = 0
+        self._breaker = CircuitBreaker()
         self._on_state_change = None
         self._last_accel = None
         self._last_gyro = None
         self._last_angle = None
         self._monitoring = False
+        self._monitor_task = None       # the live monitor loop; older ones exit
+        self._int_pin = None
+        self._int_flag = None
+        self._int_count = 0
+        self._int_saved = []            # (register, value) overwritten by _configure_int
+        self._features = None
+        self._feature_sample = array('f', [0.0] * 3)
         self._accel_threshold = 0.5     # m/s²
         self._gyro_threshold = 2.0      # deg/s
         self._angle_threshold = 0.05    # radians (~2.8°)
+        self._stream = None
+        self._fusion = None
+        self._fusion_task = None
+        self._fusion_rate_hz = 0
+        self._fusion_sample = array('f', [0.0] * 7)
+
+        # Preallocated buffers for the read_*_into() path
+        self._buf = bytearray(_BURST_LEN)
+        self._buf6 = memoryview(self._buf)[:6]
+
+        # Calibration offsets in raw counts at the current ranges:
+        # accel x, y, z, gyro x, y, z. Subtracted in every decode path.
+        self._offsets = array('h', [0] * 6)
+        self._cal_temp = None
 
 
         
-        # Initializing the I2C method for ESP32
-        # Pin assignment:
+        # Initializing the I2C method
+        # bus: an existing I2C/SharedBus object, or the hardware I2C id to use.
+        # Otherwise the shared hardware bus for the scl/sda pair is used,
+        # at 400 kHz unless freq asks for less.
+        # Default pin assignment for ESP32:
         # SCL -> GPIO 22
         # SDA -> GPIO 21
-        self.i2c = SoftI2C(scl=Pin(22), sda=Pin(21), freq=100000)
-        
-        # Initializing the I2C method for ESP8266
-        # Pin assignment:
-        # SCL -> GPIO 5
-        # SDA -> GPIO 4
-        # self.i2c = I2C(scl=Pin(5), sda=Pin(4))
+        # (ESP8266: scl=5, sda=4)
+        if bus is not None and not isinstance(bus, int):
+            self.i2c = bus
+        else:
+            self.i2c = get_bus(scl=22 if scl is None else scl,
+                               sda=21 if sda is None else sda,
+                               freq=freq or 400000, id=bus)
         
         self.addr = addr
         try:
@@ -106,11 +196,14 @@ class MPU6050(object):
             self.i2c.writeto_mem(self.addr, _PWR_MGMT_1, bytes([0x00]))
             sleep_ms(5)
         except Exception as e:
-            print(i2c_err_str.format(self.addr))
-            print(error_msg)
+            _log.error(i2c_err_str, self.addr)
             raise e
         self._accel_range = self.get_accel_range(True)
         self._gyro_range = self.get_gyro_range(True)
+        # scale factors are cached here and in set_*_range, not per read
+        self._accel_scaler = _accel_scaler(self._accel_range)
+        self._accel_scaler_ms2 = self._accel_scaler / _GRAVITIY_MS2
+        self._gyro_scaler = _gyro_scaler(self._gyro_range)
 
     # >>> ADD THIS ONE METHOD ANYWHERE INSIDE THE CLASS <<< ------------------
     def __getitem__(self, key):
@@ -122,34 +215,157 @@ class MPU6050(object):
         return MethodWrapper(getattr(self, key))
     # -----------------------------------------------------------------------
     
+    # Allocating variant of _readInto(); returns a bytearray or None on failure.
+    def _readBlock(self, register, length):
+        data = bytearray(length)
+        if self._readInto(register, data):
+            return data
+        return None
+
     def _readData(self, register):
+        data = self._readBlock(register, 6)
+        if data is None:
+            return {"x": float("NaN"), "y": float("NaN"), "z": float("NaN")}
+        o = 3 if register == _GYRO_XOUT0 else 0
+        off = self._offsets
+        x = signedIntFromBytes(data[0:2]) - off[o]
+        y = signedIntFromBytes(data[2:4]) - off[o + 1]
+        z = signedIntFromBytes(data[4:6]) - off[o + 2]
+        return {"x": x, "y": y, "z": z}
+
+    # Reads accel, temperature and gyro in a single 14-byte burst starting at
+    # ACCEL_XOUT_H, so all three come from the same sampling instant.
+    # Returns {"accel": {x,y,z}, "temp": raw, "gyro": {x,y,z}} in raw counts,
+    # with the calibration offsets removed.
+    def read_all_raw(self):
+        data = self._readBlock(_ACCEL_XOUT0, _BURST_LEN)
+        if data is None:
+            nan = float("NaN")
+            return {"accel": {"x": nan, "y": nan, "z": nan},
+                    "temp": nan,
+                    "gyro": {"x": nan, "y": nan, "z": nan}}
+        off = self._offsets
+        return {
+            "accel": {"x": signedIntFromBytes(data[0:2]) - off[0],
+                      "y": signedIntFromBytes(data[2:4]) - off[1],
+                      "z": signedIntFromBytes(data[4:6]) - off[2]},
+            "temp": signedIntFromBytes(data[6:8]),
+            "gyro": {"x": signedIntFromBytes(data[8:10]) - off[3],
+                     "y": signedIntFromBytes(data[10:12]) - off[4],
+                     "z": signedIntFromBytes(data[12:14]) - off[5]},
+        }
+
+    # Scaled version of read_all_raw().
+    # sample: a dict returned by read_all_raw(); a new burst is read when None.
+    # Returns {"accel": {x,y,z}, "temp": degC, "gyro": {x,y,z}, "angle": {x,y}}
+    # with accel in g or m/s^2 (g=False).
+    def read_all(self, g = False, sample = None):
+        if sample is None:
+            sample = self.read_all_raw()
+        return {
+            "accel": self.read_accel_data(g, sample),
+            "temp": (sample["temp"] / 340) + 36.53,
+            "gyro": self.read_gyro_data(sample),
+            "angle": self.read_angle(sample),
+        }
+
+    # ---------- low-allocation path ---------- #
+    # The read_*_into() methods read into a per-instance buffer and write the
+    # scaled values into a caller-supplied array('f'), so a sample creates no
+    # bytes objects, slices or dicts. They return False (and write NaN) when
+    # the bus read fails.
+
+    # Reads into buf with up to _maxFails attempts. The first attempt is
+    # immediate; retries back off exponentially from _retryDelayMs. When all
+    # attempts fail the circuit breaker is told, and once it opens the bus is
+    # recovered and further reads are skipped until its cool-down has passed.
+    def _readInto(self, register, buf):
+        breaker = self._breaker
+        if not breaker.allow():
+            return False
         failCount = 0
-        while failCount < _maxFails:
+        delay = _retryDelayMs
+        while True:
             try:
-                sleep_ms(10)
-                data = self.i2c.readfrom_mem(self.addr, register, 6)
-                break
-            except:
+                self.i2c.readfrom_mem_into(self.addr, register, buf)
+                breaker.success()
+                return True
+            except OSError:
                 failCount = failCount + 1
                 self._failCount = self._failCount + 1
                 if failCount >= _maxFails:
-                    self._terminatingFailCount = self._terminatingFailCount + 1
-                    print(i2c_err_str.format(self.addr))
-                    return {"x": float("NaN"), "y": float("NaN"), "z": float("NaN")} 
-        x = signedIntFromBytes(data[0:2])
-        y = signedIntFromBytes(data[2:4])
-        z = signedIntFromBytes(data[4:6])
-        return {"x": x, "y": y, "z": z}
+                    break
+                sleep_ms(delay)
+                delay = delay * 2
+        self._terminatingFailCount = self._terminatingFailCount + 1
+        if breaker.failure():
+            # report once per trip rather than on every failed read
+            _log.error(i2c_err_str, self.addr)
+            if hasattr(self.i2c, "recover"):
+                self.i2c.recover()
+        return False
+
+    # I2C health: the fail counters plus the circuit breaker state
+    # ("closed", "open" or "half_open").
+    def health(self):
+        status = self._breaker.status()
+        status["fail_count"] = self._failCount
+        status["terminating_fail_count"] = self._terminatingFailCount
+        return status
+
+    # out[0:3] = accel x, y, z in g or m/s^2 (g=False)
+    def read_accel_into(self, out, g = False):
+        buf = self._buf
+        if not self._readInto(_ACCEL_XOUT0, self._buf6):
+            out[0] = out[1] = out[2] = float("NaN")
+            return False
+        off = self._offsets
+        scaler = self._accel_scaler if g else self._accel_scaler_ms2
+        out[0] = (_s16(buf, 0) - off[0]) / scaler
+        out[1] = (_s16(buf, 2) - off[1]) / scaler
+        out[2] = (_s16(buf, 4) - off[2]) / scaler
+        return True
+
+    # out[0:3] = gyro x, y, z in deg/s
+    def read_gyro_into(self, out):
+        buf = self._buf
+        if not self._readInto(_GYRO_XOUT0, self._buf6):
+            out[0] = out[1] = out[2] = float("NaN")
+            return False
+        off = self._offsets
+        scaler = self._gyro_scaler
+        out[0] = (_s16(buf, 0) - off[3]) / scaler
+        out[1] = (_s16(buf, 2) - off[4]) / scaler
+        out[2] = (_s16(buf, 4) - off[5]) / scaler
+        return True
+
+    # One burst: out[0:3] = accel (g or m/s^2), out[3] = temp degC,
+    # out[4:7] = gyro deg/s
+    def read_all_into(self, out, g = False):
+        buf = self._buf
+        if not self._readInto(_ACCEL_XOUT0, buf):
+            for i in range(7):
+                out[i] = float("NaN")
+            return False
+        off = self._offsets
+        scaler = self._accel_scaler if g else self._accel_scaler_ms2
+        out[0] = (_s16(buf, 0) - off[0]) / scaler
+        out[1] = (_s16(buf, 2) - off[1]) / scaler
+        out[2] = (_s16(buf, 4) - off[2]) / scaler
+        out[3] = _s16(buf, 6) / 340 + 36.53
+        scaler = self._gyro_scaler
+        out[4] = (_s16(buf, 8) - off[3]) / scaler
+        out[5] = (_s16(buf, 10) - off[4]) / scaler
+        out[6] = (_s16(buf, 12) - off[5]) / scaler
+        return True
 
     # Reads the temperature from the onboard temperature sensor of the MPU-6050.
     # Returns the temperature [degC].
     def read_temperature(self):
-        try:
-            rawData = self.i2c.readfrom_mem(self.addr, _TEMP_OUT0, 2)
-            raw_temp = (signedIntFromBytes(rawData, "big"))
-        except:
-            print(i2c_err_str.format(self.addr))
+        rawData = self._readBlock(_TEMP_OUT0, 2)
+        if rawData is None:
             return float("NaN")
+        raw_temp = (signedIntFromBytes(rawData, "big"))
         actual_temp = (raw_temp / 340) + 36.53
         return actual_temp
 
@@ -158,6 +374,10 @@ class MPU6050(object):
     def set_accel_range(self, accel_range):
         self.i2c.writeto_mem(self.addr, _ACCEL_CONFIG, bytes([accel_range]))
         self._accel_range = accel_range
+        scaler = _accel_scaler(accel_range)
+        self._rescale_offsets(0, self._accel_scaler, scaler)
+        self._accel_scaler = scaler
+        self._accel_scaler_ms2 = self._accel_scaler / _GRAVITIY_MS2
 
     # Gets the range the accelerometer is set to.
     # raw=True: Returns raw value from the ACCEL_CONFIG register
@@ -165,38 +385,32 @@ class MPU6050(object):
     def get_accel_range(self, raw = False):
         # Get the raw value
         raw_data = self.i2c.readfrom_mem(self.addr, _ACCEL_CONFIG, 2)
-        
+        # strip the high-pass filter bits set by motion interrupts
+        accel_range = raw_data[0] & _ACC_RNG_MASK
+
         if raw is True:
-            return raw_data[0]
+            return accel_range
         elif raw is False:
-            if raw_data[0] == _ACC_RNG_2G:
+            if accel_range == _ACC_RNG_2G:
                 return 2
-            elif raw_data[0] == _ACC_RNG_4G:
+            elif accel_range == _ACC_RNG_4G:
                 return 4
-            elif raw_data[0] == _ACC_RNG_8G:
+            elif accel_range == _ACC_RNG_8G:
                 return 8
-            elif raw_data[0] == _ACC_RNG_16G:
+            elif accel_range == _ACC_RNG_16G:
                 return 16
             else:
                 return -1
 
     # Reads and returns the AcX, AcY and AcZ values from the accelerometer.
     # Returns dictionary data in g or m/s^2 (g=False)
-    def read_accel_data(self, g = False):         
-        accel_data = self._readData(_ACCEL_XOUT0)
-        accel_range = self._accel_range
-        scaler = None
-        if accel_range == _ACC_RNG_2G:
-            scaler = _ACC_SCLR_2G
-        elif accel_range == _ACC_RNG_4G:
-            scaler = _ACC_SCLR_4G
-        elif accel_range == _ACC_RNG_8G:
-            scaler = _ACC_SCLR_8G
-        elif accel_range == _ACC_RNG_16G:
-            scaler = _ACC_SCLR_16G
+    # sample: optional read_all_raw() result to decode instead of reading the bus.
+    def read_accel_data(self, g = False, sample = None):
+        if sample is None:
+            accel_data = self._readData(_ACCEL_XOUT0)
         else:
-            print("Unkown range - scaler set to _ACC_SCLR_2G")
-            scaler = _ACC_SCLR_2G
+            accel_data = sample["accel"]
+        scaler = self._accel_scaler
 
         x = accel_data["x"] / scaler
         y = accel_data["y"] / scaler
@@ -217,6 +431,9 @@ class MPU6050(object):
     def set_gyro_range(self, gyro_range):
         self.i2c.writeto_mem(self.addr, _GYRO_CONFIG, bytes([gyro_range]))
         self._gyro_range = gyro_range
+        scaler = _gyro_scaler(gyro_range)
+        self._rescale_offsets(3, self._gyro_scaler, scaler)
+        self._gyro_scaler = scaler
 
     # Gets the range the gyroscope is set to.
     # raw=True: return raw value from GYRO_CONFIG register
@@ -241,21 +458,13 @@ class MPU6050(object):
 
     # Gets and returns the GyX, GyY and GyZ values from the gyroscope.
     # Returns the read values in a dictionary.
-    def read_gyro_data(self):
-        gyro_data = self._readData(_GYRO_XOUT0)
-        gyro_range = self._gyro_range
-        scaler = None
-        if gyro_range == _GYR_RNG_250DEG:
-            scaler = _GYR_SCLR_250DEG
-        elif gyro_range == _GYR_RNG_500DEG:
-            scaler = _GYR_SCLR_500DEG
-        elif gyro_range == _GYR_RNG_1000DEG:
-            scaler = _GYR_SCLR_1000DEG
-        elif gyro_range == _GYR_RNG_2000DEG:
-            scaler = _GYR_SCLR_2000DEG
+    # sample: optional read_all_raw() result to decode instead of reading the bus.
+    def read_gyro_data(self, sample = None):
+        if sample is None:
+            gyro_data = self._readData(_GYRO_XOUT0)
         else:
-            print("Unkown range - scaler set to _GYR_SCLR_250DEG")
-            scaler = _GYR_SCLR_250DEG
+            gyro_data = sample["gyro"]
+        scaler = self._gyro_scaler
 
         x = gyro_data["x"] / scaler
         y = gyro_data["y"] / scaler
@@ -263,18 +472,288 @@ class MPU6050(object):
 
         return {"x": x, "y": y, "z": z}
 
-    def read_angle(self): # returns radians. orientation matches silkscreen
-        a=self.read_accel_data()
+    def read_angle(self, sample = None): # returns radians. orientation matches silkscreen
+        if self._fusion is not None:
+            # fused estimate, kept current by update_orientation()
+            e = self._fusion
+            return {"x": e.roll, "y": e.pitch}
+        a=self.read_accel_data(sample=sample)
         x=atan2(a["y"],a["z"])
         y=atan2(-a["x"],a["z"])
         return {"x": x, "y": y}
 
-    def watch_state(self, callback):
-        """Register a unified callback for any change."""
+    # ---------- calibration ---------- #
+    # Offsets are applied in the decode path rather than written to the chip's
+    # offset registers, so they work the same for every read API and survive
+    # a chip reset. They are kept in raw counts and rescaled on range changes.
+
+    def _rescale_offsets(self, first, old_scaler, new_scaler):
+        off = self._offsets
+        for i in range(first, first + 3):
+            off[i] = int(off[i] * new_scaler / old_scaler)
+
+    # Averages `samples` bursts with the board still and Z axis up, and sets
+    # accel offsets so the reading is (0, 0, 1 g) and gyro offsets to the bias.
+    # Raises ValueError if any gyro axis moved more than max_gyro_std deg/s.
+    # save=True writes the result to the cache file for this address.
+    def calibrate(self, samples=200, interval_ms=2, max_gyro_std=1.0,
+                  save=True, path=None):
+        stats = calibration.Welford(7)
+        raw = array('f', [0.0] * 7)
+        buf = self._buf
+        for _ in range(samples):
+            if self._readInto(_ACCEL_XOUT0, buf):
+                for i in range(7):
+                    raw[i] = _s16(buf, 2 * i)
+                stats.update(raw)
+            sleep_ms(interval_ms)
+        if stats.n < samples // 2:
+            raise OSError("calibration failed: too many bus errors")
+        for i in range(4, 7):
+            if stats.std(i) / self._gyro_scaler > max_gyro_std:
+                raise ValueError("calibration failed: sensor moved")
+        mean = stats.mean
+        off = self._offsets
+        off[0] = int(mean[0])
+        off[1] = int(mean[1])
+        off[2] = int(mean[2] - self._accel_scaler)
+        off[3] = int(mean[4])
+        off[4] = int(mean[5])
+        off[5] = int(mean[6])
+        self._cal_temp = mean[3] / 340 + 36.53
+        if save:
+            self.save_calibration(path)
+        return self.get_calibration()
+
+    def save_calibration(self, path=None):
+        calibration.save(path or calibration.default_path(self.addr),
+                         self.addr, self._accel_range, self._gyro_range,
+                         self._cal_temp or 0.0, self._offsets)
+
+    # Loads cached offsets for this address. Returns False when there is no
+    # valid cache, or when the die temperature moved more than
+    # max_temp_drift degC since calibration (offsets are then left unchanged).
+    def load_calibration(self, max_temp_drift=5.0, path=None):
+        cached = calibration.load(path or calibration.default_path(self.addr),
+                                  self.addr)
+        if cached is None:
+            return False
+        accel_range, gyro_range, temp, offsets = cached
+        if max_temp_drift is not None:
+            now = self.read_temperature()
+            if not abs(now - temp) <= max_temp_drift:
+                return False
+        off = self._offsets
+        for i in range(6):
+            off[i] = offsets[i]
+        self._rescale_offsets(0, _accel_scaler(accel_range), self._accel_scaler)
+        self._rescale_offsets(3, _gyro_scaler(gyro_range), self._gyro_scaler)
+        self._cal_temp = temp
+        return True
+
+    # Boot-time helper: load the cache, recalibrating only when it is missing
+    # or stale.
+    def ensure_calibrated(self, max_temp_drift=5.0, samples=200, path=None):
+        if not self.load_calibration(max_temp_drift, path):
+            self.calibrate(samples, path=path)
+        return self.get_calibration()
+
+    def get_calibration(self):
+        return {"offsets": list(self._offsets), "temp": self._cal_temp}
+
+    def clear_calibration(self):
+        for i in range(6):
+            self._offsets[i] = 0
+        self._cal_temp = None
+
+    # ---------- orientation fusion ---------- #
+    # Replaces the accel-only read_angle() with a gyro + accel estimate.
+    # mode: "complementary" (alpha), "mahony" (kp, ki) or "madgwick" (beta).
+    # rate_hz: background update rate; 0 means call update_orientation() yourself.
+    def enable_fusion(self, mode="complementary", rate_hz=100, **params):
+        self._fusion = Orientation(mode, **params)
+        # a new rate replaces the running loop; rate_hz=0 only stops it
+        if rate_hz != self._fusion_rate_hz or self._fusion_task is None:
+            self._fusion_task = None
+            if rate_hz:
+                self._fusion_task = asyncio.create_task(self._fusion_loop(1000 // rate_hz))
+        self._fusion_rate_hz = rate_hz
+        return self._fusion
+
+    def disable_fusion(self):
+        self._fusion_task = None
+        self._fusion_rate_hz = 0
+        self._fusion = None
+
+    # Reads one burst and feeds it to the orientation filter.
+    def update_orientation(self):
+        f = self._fusion
+        if f is None:
+            return False
+        s = self._fusion_sample
+        if not self.read_all_into(s, True):
+            return False
+        f.update(s[0], s[1], s[2], s[4], s[5], s[6])
+        return True
+
+    # Returns {"x": roll, "y": pitch, "z": yaw} in radians without touching
+    # the bus. Yaw is gyro-integrated only and drifts.
+    def get_orientation(self):
+        if self._fusion is None:
+            return None
+        return self._fusion.angle()
+
+    async def _fusion_loop(self, interval_ms):
+        # a loop left over from before disable_fusion() exits even when
+        # fusion was enabled again before it woke up
+        me = self._fusion_task
+        while self._fusion_task is me:
+            self.update_orientation()
+            await asyncio.sleep_ms(interval_ms)
+
+    # Starts FIFO streaming of accel + gyro at 1 kHz / (1 + rate_div).
+    # capacity: frames kept in the RAM ring, block: frames per async block.
+    # Returns the FifoStream; see fifo.py for the generator / async API.
+    def start_stream(self, rate_div=4, capacity=256, block=32, dlpf=1):
+        # checked before the running stream is stopped
+        if block > capacity:
+            raise ValueError("block must not exceed capacity")
+        if self._int_pin is not None:
+            # the stream owns INT_ENABLE, SMPLRT_DIV and CONFIG
+            raise RuntimeError("interrupt watch active, call deinit_watch() first")
+        if self._stream is not None:
+            self._stream.stop()
+        self._stream = FifoStream(self.i2c, self.addr, rate_div=rate_div,
+                                  dlpf=dlpf, capacity=capacity, block=block,
+                                  offsets=self._offsets)
+        self._stream.start()
+        return self._stream
+
+    def stop_stream(self):
+        if self._stream is not None:
+            self._stream.stop()
+            self._stream = None
+
+    def stream_stats(self):
+        if self._stream is None:
+            return None
+        return self._stream.stats()
+
+    def watch_state(self, callback, int_pin=None, mode=INT_MOTION,
+                    motion_threshold=20, motion_duration=1, rate_div=99,
+                    fallback_ms=5000, features=None, feature_hop=None,
+                    feature_rate_hz=100):
+        """Register a unified callback for any change.
+
+        features=N replaces the raw accel/gyro/angle events with one
+        {"features": {...}} event per window of N accel samples (m/s^2),
+        see features.WindowFeatures. Samples come from the FIFO stream when
+        one is running, otherwise the sensor is read at feature_rate_hz.
+
+        Without int_pin the sensor is polled once per second. With int_pin
+        (the GPIO wired to the MPU6050 INT output) the chip raises an
+        interrupt and the sensor is read only when it fires:
+            mode="motion"      motion above motion_threshold (2 mg/LSB) for
+                               motion_duration ms
+            mode="data_ready"  every sample, at 1 kHz / (1 + rate_div)
+        If no interrupt arrives for fallback_ms the sensor is polled anyway.
+        The registers changed for the interrupt are restored by
+        deinit_watch(). int_pin cannot be combined with start_stream().
+        """
         self._on_state_change = callback
-        if not self._monitoring:
-            self._monitoring = True
-            asyncio.create_task(self._monitor_values())
+        if self._monitoring:
+            return
+        if int_pin is not None and self._stream is not None:
+            raise RuntimeError("FIFO stream active, call stop_stream() first")
+        self._monitoring = True
+        if features:
+            self._features = WindowFeatures(features, feature_hop)
+            self._monitor_task = asyncio.create_task(
+                self._monitor_features(1000 // feature_rate_hz))
+            return
+        if int_pin is None:
+            self._monitor_task = asyncio.create_task(self._monitor_values())
+            return
+        self._configure_int(mode, motion_threshold, motion_duration, rate_div)
+        self._int_pin = int_pin if isinstance(int_pin, Pin) else Pin(int_pin, Pin.IN)
+        if hasattr(asyncio, "ThreadSafeFlag"):
+            self._int_flag = asyncio.ThreadSafeFlag()
+            self._int_pin.irq(trigger=Pin.IRQ_RISING, handler=self._int_irq)
+        else:
+            # older uasyncio: hop through the scheduler to set an Event
+            self._int_flag = asyncio.Event()
+            self._int_set_ref = self._int_set
+            self._int_pin.irq(trigger=Pin.IRQ_RISING, handler=self._int_irq_scheduled)
+        self._monitor_task = asyncio.create_task(self._monitor_int(fallback_ms))
+
+    def deinit_watch(self):
+        """Stop monitoring and disable the chip interrupt."""
+        self._monitoring = False
+        self._monitor_task = None
+        if self._int_pin is not None:
+            self._int_pin.irq(handler=None)
+            self._int_pin = None
+            self.i2c.writeto_mem(self.addr, _INT_ENABLE, bytes([0x00]))
+            # undo the high-pass filter / sample rate set for the interrupt
+            for register, value in self._int_saved:
+                if register == _ACCEL_CONFIG:
+                    # keep a range set with set_accel_range() meanwhile
+                    value = (value & ~_ACC_RNG_MASK) | self._accel_range
+                self.i2c.writeto_mem(self.addr, register, bytes([value]))
+            self._int_saved = []
+            if self._int_flag is not None:
+                # wake the monitor task so it can exit
+                self._int_flag.set()
+
+    def _configure_int(self, mode, motion_threshold, motion_duration, rate_div):
+        write = self.i2c.writeto_mem
+        read = self.i2c.readfrom_mem
+        if mode == INT_MOTION:
+            enable = _INT_MOTION
+            self._int_saved = [(_ACCEL_CONFIG, read(self.addr, _ACCEL_CONFIG, 1)[0])]
+            write(self.addr, _ACCEL_CONFIG, bytes([self._accel_range | _ACC_HPF_0_63HZ]))
+            write(self.addr, _MOT_THR, bytes([motion_threshold]))
+            write(self.addr, _MOT_DUR, bytes([motion_duration]))
+        elif mode == INT_DATA_READY:
+            enable = _INT_DATA_RDY
+            self._int_saved = [(_CONFIG, read(self.addr, _CONFIG, 1)[0]),
+                               (_SMPLRT_DIV, read(self.addr, _SMPLRT_DIV, 1)[0])]
+            write(self.addr, _CONFIG, bytes([0x01]))        # DLPF on, 1 kHz base rate
+            write(self.addr, _SMPLRT_DIV, bytes([rate_div]))
+        else:
+            raise ValueError("unknown interrupt mode: {}".format(mode))
+        # active high, push-pull, 50 us pulse per event
+        write(self.addr, _INT_PIN_CFG, bytes([0x00]))
+        write(self.addr, _INT_ENABLE, bytes([enable]))
+
+    def _int_irq(self, pin):
+        self._int_flag.set()
+
+    def _int_irq_scheduled(self, pin):
+        try:
+            micropython.schedule(self._int_set_ref, 0)
+        except RuntimeError:
+            pass  # queue full; the pending wake-up already covers this edge
+
+    def _int_set(self, _):
+        self._int_flag.set()
+
+    async def _monitor_int(self, fallback_ms):
+        flag = self._int_flag
+        me = self._monitor_task
+        while self._monitor_task is me:
+            try:
+                await asyncio.wait_for(flag.wait(), fallback_ms / 1000)
+            except asyncio.TimeoutError:
+                pass
+            if self._monitor_task is not me:
+                break
+            if hasattr(flag, "clear"):
+                flag.clear()
+            # reading INT_STATUS acknowledges the interrupt
+            self._readBlock(_INT_STATUS, 1)
+            self._int_count += 1
+            self._process_sample(self.read_all_raw())
 
     def _trigger_on_change(self, key, value):
         if self._on_state_change:
@@ -292,23 +771,45 @@ class MPU6050(object):
 
     
     async def _monitor_values(self):
-        while True:
+        # compare the task, not _monitoring: deinit_watch() + watch_state()
+        # within one period must not leave the old loop running
+        me = self._monitor_task
+        while self._monitor_task is me:
             await asyncio.sleep_ms(1000)
-
-            accel = self.read_accel_data()
-            if self._is_significant_change(accel, self._last_accel, self._accel_threshold):
-                self._last_accel = accel
-                self._trigger_on_change('accel', accel)
-
-            gyro = self.read_gyro_data()
-            if self._is_significant_change(gyro, self._last_gyro, self._gyro_threshold):
-                self._last_gyro = gyro
-                self._trigger_on_change('gyro', gyro)
-
-            angle = self.read_angle()
-            if self._is_significant_change(angle, self._last_angle, self._angle_threshold):
-                self._last_angle = angle
-                self._trigger_on_change('angle', angle)
-
-
-
+            if self._monitor_task is not me:
+                break
+            # one burst per tick; accel, gyro and angle share the same sample
+            self._process_sample(self.read_all_raw())
+
+    async def _monitor_features(self, interval_ms):
+        fx = self._features
+        out = self._feature_sample
+        me = self._monitor_task
+        while self._monitor_task is me:
+            stream = self._stream
+            if stream is not None:
+                # drain everything the FIFO collected since the last tick
+                scaler = self._accel_scaler_ms2
+                for f in stream.samples():
+                    if fx.add(f[0] / scaler, f[1] / scaler, f[2] / scaler):
+                        self._trigger_on_change('features', fx.features())
+            elif self.read_accel_into(out):
+                if fx.add(out[0], out[1], out[2]):
+                    self._trigger_on_change('features', fx.features())
+            await asyncio.sleep_ms(interval_ms)
+
+    def _process_sample(self, sample):
+        accel = self.read_accel_data(sample=sample)
+        if self._is_significant_change(accel, self._last_accel, self._accel_threshold):
+            self._last_accel = accel
+            self._trigger_on_change('accel', accel)
+
+        gyro = self.read_gyro_data(sample)
+        if self._is_significant_change(gyro, self._last_gyro, self._gyro_threshold):
+            self._last_gyro = gyro
+            self._trigger_on_change('gyro', gyro)
+
+        angle = self.read_angle(sample)
+        if self._is_significant_change(angle, self._last_angle, self._angle_threshold):
+            self._last_angle = angle
+            self._trigger_on_change('angle', angle)
@@ -0,0 +1,159 @@
+# features.py
+# Sliding-window vibration features for accelerometer samples.
+#
+# Four channels are tracked: x, y, z and the vector magnitude. Each sample
+# updates running sums and sums of squares, and a monotonic deque per channel
+# that keeps the window peak (max |value|) available in O(1). Everything is
+# held in arrays allocated up front; add() allocates nothing.
+
+from array import array
+from math import sqrt
+
+CHANNELS = ("x", "y", "z", "mag")
+_N = 4
+
+
+class WindowFeatures:
+    """
+    size: samples per window.
+    hop:  samples between emitted windows (default size, i.e. no overlap).
+
+        fx = WindowFeatures(128)
+        if fx.add(ax, ay, az):
+            send(fx.features())
+    """
+
+    def __init__(self, size=64, hop=None):
+        self.size = size
+        self.hop = hop or size
+        self._values = array('f', [0.0] * (_N * size))   # ring, per channel
+        self._sum = array('f', [0.0] * _N)
+        self._sq = array('f', [0.0] * _N)
+        # monotonic deque of ring positions, decreasing |value|, per channel
+        self._dq = array('H', [0] * (_N * size))
+        self._dq_head = array('H', [0] * _N)
+        self._dq_len = array('H', [0] * _N)
+        self._pos = 0           # ring position the next sample goes to
+        self._filled = 0
+        self._since_emit = 0
+        self._since_exact = 0
+        self.windows = 0
+
+    def reset(self):
+        for i in range(_N):
+            self._sum[i] = 0.0
+            self._sq[i] = 0.0
+            self._dq_len[i] = 0
+            self._dq_head[i] = 0
+        self._pos = 0
+        self._filled = 0
+        self._since_emit = 0
+        self._since_exact = 0
+
+    def add(self, x, y, z):
+        """Push one sample. Returns True when a window is ready."""
+        m = sqrt(x * x + y * y + z * z)
+        self._push(0, x)
+        self._push(1, y)
+        self._push(2, z)
+        self._push(3, m)
+        pos = self._pos + 1
+        self._pos = 0 if pos == self.size else pos
+        if self._filled < self.size:
+            self._filled += 1
+        # float running sums drift; rebuild them exactly once per window
+        self._since_exact += 1
+        if self._since_exact == self.size:
+            self._since_exact = 0
+            self._resum()
+        if self._filled < self.size:
+            return False
+        self._since_emit += 1
+        if self._since_emit >= self.hop:
+            self._since_emit = 0
+            self.windows += 1
+            return True
+        return False
+
+    def _push(self, c, v):
+        size = self.size
+        base = c * size
+        pos = self._pos
+        i = base + pos
+        if self._filled == size:
+            old = self._values[i]
+            self._sum[c] += v - old
+            self._sq[c] += v * v - old * old
+        else:
+            self._sum[c] += v
+            self._sq[c] += v * v
+        self._values[i] = v
+
+        dq = self._dq
+        head = self._dq_head[c]
+        n = self._dq_len[c]
+        # the sample being overwritten leaves the window
+        if n and dq[base + head] == pos:
+            head += 1
+            if head == size:
+                head = 0
+            n -= 1
+        # drop smaller peaks from the back, they can never be the maximum
+        a = v if v >= 0 else -v
+        while n:
+            back = head + n - 1
+            if back >= size:
+                back -= size
+            b = self._values[base + dq[base + back]]
+            if (b if b >= 0 else -b) > a:
+                break
+            n -= 1
+        back = head + n
+        if back >= size:
+            back -= size
+        dq[base + back] = pos
+        self._dq_head[c] = head
+        self._dq_len[c] = n + 1
+
+    def _resum(self):
+        values = self._values
+        for c in range(_N):
+            base = c * self.size
+            s = 0.0
+            q = 0.0
+            for i in range(base, base + self._filled):
+                v = values[i]
+                s += v
+                q += v * v
+            self._sum[c] = s
+            self._sq[c] = q
+
+    def peak(self, c):
+        if not self._dq_len[c]:
+            return 0.0
+        v = self._values[c * self.size + self._dq[c * self.size + self._dq_head[c]]]
+        return v if v >= 0 else -v
+
+    def features(self):
+        """Per-channel mean, rms, peak, crest factor and variance of the
+        current window, keyed by "x", "y", "z" and "mag"."""
+        n = self._filled
+        out = {"n": n}
+        if not n:
+            return out
+        for c in range(_N):
+            mean = self._sum[c] / n
+            ms = self._sq[c] / n
+            var = ms - mean * mean
+            if var < 0:
+                var = 0.0
+            rms = sqrt(ms)
+            peak = self.peak(c)
+            out[CHANNELS[c]] = {
+                "mean": mean,
+                "rms": rms,
+                "peak": peak,
+                "crest": peak / rms if rms else 0.0,
+                "var": var,
+            }
+        return out
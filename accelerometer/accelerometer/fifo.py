@@ -0,0 +1,232 @@
+# fifo.py
+# High-rate streaming from the MPU6050 on-chip FIFO.
+#
+# The chip pushes one 12-byte frame (accel XYZ + gyro XYZ, big-endian int16)
+# into its 1024-byte FIFO per sample. FifoStream drains it in bulk reads and
+# decodes the frames into a preallocated array('h') ring of raw counts, six
+# words per frame: ax, ay, az, gx, gy, gz.
+
+from array import array
+import uasyncio as asyncio
+
+# MPU-6050 Registers
+_SMPLRT_DIV = 0x19
+_CONFIG = 0x1A
+_FIFO_EN = 0x23
+_INT_ENABLE = 0x38
+_INT_STATUS = 0x3A
+_FIFO_COUNTH = 0x72
+_FIFO_R_W = 0x74
+_USER_CTRL = 0x6A
+
+# Register bits
+_FIFO_ACCEL = 0x08
+_FIFO_GYRO = 0x70              # XG | YG | ZG
+_USER_FIFO_EN = 0x40
+_USER_FIFO_RESET = 0x04
+_FIFO_OFLOW_INT = 0x10
+
+_FIFO_SIZE = 1024
+_FRAME_BYTES = 12
+_FRAME_WORDS = 6
+
+
+class FifoStream:
+    """
+    Streams accel + gyro frames out of the MPU6050 FIFO.
+
+    Sample rate is 1 kHz / (1 + rate_div) with the DLPF enabled (dlpf 1..6).
+        stream = mpu.start_stream(rate_div=1)     # 500 Hz
+        for frame in stream.samples(): ...        # drain what is available
+        async for block in stream: ...            # block of `block` frames
+
+    Frames are raw counts; the arrays yielded by samples() and the async
+    iterator are reused between iterations, copy them if you keep them.
+    """
+
+    def __init__(self, i2c, addr, *, rate_div=4, dlpf=1, capacity=256,
+                 block=32, chunk=16, offsets=None):
+        if block > capacity:
+            # the ring could never hold a whole block for `async for`
+            raise ValueError("block must not exceed capacity")
+        self.i2c = i2c
+        self.addr = addr
+        self.rate_div = rate_div
+        self.dlpf = dlpf
+        self.rate_hz = 1000 // (1 + rate_div)
+        self.active = False
+        # raw calibration offsets subtracted from every frame
+        self._offsets = offsets if offsets is not None else array('h', [0] * _FRAME_WORDS)
+
+        # ring of decoded frames, capacity frames x 6 words
+        self._ring = array('h', [0] * (_FRAME_WORDS * capacity))
+        self._capacity = capacity
+        self._head = 0
+        self._count = 0
+
+        # bus buffers, with one memoryview per possible chunk length so a
+        # drain never allocates
+        self._reg = bytearray(2)
+        self._reg1 = memoryview(self._reg)[:1]
+        self._raw = bytearray(_FRAME_BYTES * chunk)
+        raw = memoryview(self._raw)
+        self._views = [raw[:_FRAME_BYTES * n] for n in range(chunk + 1)]
+        self._chunk = chunk
+
+        self._frame = array('h', [0] * _FRAME_WORDS)
+        self._block = array('h', [0] * (_FRAME_WORDS * block))
+        self._block_frames = block
+        # wait roughly one block, but never long enough to overflow the FIFO
+        frames = min(block, _FIFO_SIZE // _FRAME_BYTES // 2)
+        self._poll_ms = max(1, frames * 1000 // self.rate_hz)
+
+        # statistics
+        self.frames = 0        # frames read from the chip
+        self.overflows = 0     # chip FIFO overflows (samples lost on-chip)
+        self.dropped = 0       # frames overwritten in the ring before read
+
+    # ───────── chip control ─────────
+    def _write(self, register, value):
+        self._reg[0] = value
+        self.i2c.writeto_mem(self.addr, register, self._reg1)
+
+    def start(self):
+        """Configure the sample rate and enable the FIFO."""
+        self._write(_CONFIG, self.dlpf)
+        self._write(_SMPLRT_DIV, self.rate_div)
+        self._write(_INT_ENABLE, 0x00)
+        self._write(_FIFO_EN, 0x00)
+        self.reset()
+        self._write(_FIFO_EN, _FIFO_ACCEL | _FIFO_GYRO)
+        self.active = True
+
+    def stop(self):
+        """Disable the FIFO; buffered frames stay readable."""
+        self._write(_FIFO_EN, 0x00)
+        self._write(_USER_CTRL, 0x00)
+        self.active = False
+
+    def reset(self):
+        """Flush the chip FIFO and re-enable it."""
+        self._write(_USER_CTRL, _USER_FIFO_RESET)
+        self._write(_USER_CTRL, _USER_FIFO_EN)
+
+    # ───────── draining ─────────
+    def poll(self):
+        """Move every complete frame from the chip into the ring.
+        Returns the number of frames read."""
+        if not self.active:
+            return 0
+        i2c = self.i2c
+        reg = self._reg
+
+        i2c.readfrom_mem_into(self.addr, _INT_STATUS, self._reg1)
+        if reg[0] & _FIFO_OFLOW_INT:
+            # frame alignment is lost after an overflow, start over
+            self.overflows += 1
+            self.reset()
+            return 0
+
+        i2c.readfrom_mem_into(self.addr, _FIFO_COUNTH, reg)
+        pending = ((reg[0] << 8) | reg[1]) // _FRAME_BYTES
+
+        total = 0
+        while pending:
+            n = pending if pending < self._chunk else self._chunk
+            i2c.readfrom_mem_into(self.addr, _FIFO_R_W, self._views[n])
+            self._store(n)
+            pending -= n
+            total += n
+        self.frames += total
+        return total
+
+    def _store(self, n):
+        raw = self._raw
+        ring = self._ring
+        off = self._offsets
+        capacity = self._capacity
+        head = self._head
+        i = 0
+        for _ in range(n):
+            o = head * _FRAME_WORDS
+            for k in range(_FRAME_WORDS):
+                v = (raw[i] << 8) | raw[i + 1]
+                if v >= 0x8000:
+                    v -= 0x10000
+                v -= off[k]
+                # a large offset can push a near-full-scale reading past int16
+                if v > 32767:
+                    v = 32767
+                elif v < -32768:
+                    v = -32768
+                ring[o + k] = v
+                i += 2
+            head += 1
+            if head == capacity:
+                head = 0
+            if self._count == capacity:
+                self.dropped += 1
+            else:
+                self._count += 1
+        self._head = head
+
+    def available(self):
+        """Number of frames buffered in the ring."""
+        return self._count
+
+    def read_into(self, buf):
+        """Copy up to len(buf) // 6 of the oldest frames into buf (array('h')).
+        Returns the number of frames copied."""
+        n = len(buf) // _FRAME_WORDS
+        if n > self._count:
+            n = self._count
+        ring = self._ring
+        capacity = self._capacity
+        tail = self._head - self._count
+        if tail < 0:
+            tail += capacity
+        o = 0
+        for _ in range(n):
+            r = tail * _FRAME_WORDS
+            for k in range(_FRAME_WORDS):
+                buf[o + k] = ring[r + k]
+            o += _FRAME_WORDS
+            tail += 1
+            if tail == capacity:
+                tail = 0
+        self._count -= n
+        return n
+
+    def stats(self):
+        return {
+            "rate_hz": self.rate_hz,
+            "frames": self.frames,
+            "buffered": self._count,
+            "overflows": self.overflows,
+            "dropped": self.dropped,
+        }
+
+    # ───────── iteration ─────────
+    def samples(self):
+        """Generator over every frame available right now, oldest first.
+        Yields the same array('h', 6) each time."""
+        frame = self._frame
+        while True:
+            if not self._count and not self.poll():
+                return
+            self.read_into(frame)
+            yield frame
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        """Wait for a full block and return it as array('h', block * 6)."""
+        while self._count < self._block_frames:
+            if not self.active:
+                raise StopAsyncIteration
+            self.poll()
+            if self._count < self._block_frames:
+                await asyncio.sleep_ms(self._poll_ms)
+        self.read_into(self._block)
+        return self._block
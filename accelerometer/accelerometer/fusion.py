@@ -0,0 +1,217 @@
+# fusion.py
+# Incremental gyro + accel orientation estimators for the MPU6050.
+#
+# Each update() costs a fixed number of float operations and keeps its state
+# in preallocated arrays, so it can run at a few hundred Hz. Angles are in
+# radians and use the same axes as MPU6050.read_angle():
+#     roll  (x) = rotation about X, atan2(ay, az) at rest
+#     pitch (y) = rotation about Y, atan2(-ax, az) at rest
+#     yaw   (z) = integrated gyro Z only; there is no magnetometer, so it drifts
+
+from array import array
+from math import atan2, asin, sqrt, sin, cos, radians
+from time import ticks_us, ticks_diff
+
+COMPLEMENTARY = "complementary"
+MAHONY = "mahony"
+MADGWICK = "madgwick"
+
+# dt above this (s) is treated as a stall and the gyro step is skipped
+_MAX_DT = 0.5
+
+
+class Orientation:
+    """
+    mode="complementary": alpha weights the gyro path (0.98 typical).
+    mode="mahony":        kp/ki are the proportional/integral feedback gains.
+    mode="madgwick":      beta is the gradient-descent step (0.03 – 0.2).
+
+    update() takes accel in any unit (only the direction is used) and gyro
+    in deg/s, optionally with a ticks_us() timestamp of the sample.
+    """
+
+    def __init__(self, mode=COMPLEMENTARY, *, alpha=0.98, kp=1.0, ki=0.0,
+                 beta=0.1):
+        if mode not in (COMPLEMENTARY, MAHONY, MADGWICK):
+            raise ValueError("unknown fusion mode: {}".format(mode))
+        self.mode = mode
+        self.alpha = alpha
+        self.kp = kp
+        self.ki = ki
+        self.beta = beta
+        # roll, pitch, yaw
+        self._euler = array('f', [0.0, 0.0, 0.0])
+        # quaternion w, x, y, z and Mahony integral error x, y, z
+        self._q = array('f', [1.0, 0.0, 0.0, 0.0])
+        self._e = array('f', [0.0, 0.0, 0.0])
+        self._last_us = None
+        self.updates = 0
+
+    def reset(self):
+        self._euler[0] = self._euler[1] = self._euler[2] = 0.0
+        self._q[0] = 1.0
+        self._q[1] = self._q[2] = self._q[3] = 0.0
+        self._e[0] = self._e[1] = self._e[2] = 0.0
+        self._last_us = None
+        self.updates = 0
+
+    # ───────── public state ─────────
+    @property
+    def roll(self):
+        return self._euler[0]
+
+    @property
+    def pitch(self):
+        return self._euler[1]
+
+    @property
+    def yaw(self):
+        return self._euler[2]
+
+    def angle(self):
+        """Latest estimate as {"x": roll, "y": pitch, "z": yaw} (radians)."""
+        e = self._euler
+        return {"x": e[0], "y": e[1], "z": e[2]}
+
+    # ───────── update ─────────
+    def update(self, ax, ay, az, gx, gy, gz, t_us=None):
+        if t_us is None:
+            t_us = ticks_us()
+        if self._last_us is None:
+            self._last_us = t_us
+            self._seed(ax, ay, az)
+            return
+        dt = ticks_diff(t_us, self._last_us) / 1000000
+        self._last_us = t_us
+        if dt <= 0 or dt > _MAX_DT:
+            self._seed(ax, ay, az)
+            return
+
+        gx = radians(gx)
+        gy = radians(gy)
+        gz = radians(gz)
+        if self.mode == COMPLEMENTARY:
+            self._complementary(ax, ay, az, gx, gy, gz, dt)
+        elif self.mode == MAHONY:
+            self._mahony(ax, ay, az, gx, gy, gz, dt)
+            self._q_to_euler()
+        else:
+            self._madgwick(ax, ay, az, gx, gy, gz, dt)
+            self._q_to_euler()
+        self.updates += 1
+
+    def _seed(self, ax, ay, az):
+        """Initialise roll/pitch from gravity, keeping the current yaw."""
+        if ax == 0 and ay == 0 and az == 0:
+            return
+        e = self._euler
+        e[0] = atan2(ay, az)
+        e[1] = atan2(-ax, az)
+        cr, sr = cos(e[0] / 2), sin(e[0] / 2)
+        cp, sp = cos(e[1] / 2), sin(e[1] / 2)
+        cy, sy = cos(e[2] / 2), sin(e[2] / 2)
+        q = self._q
+        q[0] = cr * cp * cy + sr * sp * sy
+        q[1] = sr * cp * cy - cr * sp * sy
+        q[2] = cr * sp * cy + sr * cp * sy
+        q[3] = cr * cp * sy - sr * sp * cy
+
+    def _complementary(self, ax, ay, az, gx, gy, gz, dt):
+        e = self._euler
+        a = self.alpha
+        roll = e[0] + gx * dt
+        pitch = e[1] + gy * dt
+        if ax or ay or az:
+            roll = a * roll + (1 - a) * atan2(ay, az)
+            pitch = a * pitch + (1 - a) * atan2(-ax, az)
+        e[0] = roll
+        e[1] = pitch
+        e[2] = e[2] + gz * dt
+
+    def _mahony(self, ax, ay, az, gx, gy, gz, dt):
+        q = self._q
+        q0, q1, q2, q3 = q[0], q[1], q[2], q[3]
+        norm = sqrt(ax * ax + ay * ay + az * az)
+        if norm:
+            ax /= norm
+            ay /= norm
+            az /= norm
+            # estimated gravity direction
+            vx = 2 * (q1 * q3 - q0 * q2)
+            vy = 2 * (q0 * q1 + q2 * q3)
+            vz = q0 * q0 - q1 * q1 - q2 * q2 + q3 * q3
+            # error is the cross product of measured and estimated gravity
+            ex = ay * vz - az * vy
+            ey = az * vx - ax * vz
+            ez = ax * vy - ay * vx
+            if self.ki:
+                e = self._e
+                e[0] += self.ki * ex * dt
+                e[1] += self.ki * ey * dt
+                e[2] += self.ki * ez * dt
+                gx += e[0]
+                gy += e[1]
+                gz += e[2]
+            gx += self.kp * ex
+            gy += self.kp * ey
+            gz += self.kp * ez
+        h = 0.5 * dt
+        self._integrate(q0, q1, q2, q3,
+                        (-q1 * gx - q2 * gy - q3 * gz) * h,
+                        (q0 * gx + q2 * gz - q3 * gy) * h,
+                        (q0 * gy - q1 * gz + q3 * gx) * h,
+                        (q0 * gz + q1 * gy - q2 * gx) * h)
+
+    def _madgwick(self, ax, ay, az, gx, gy, gz, dt):
+        q = self._q
+        q0, q1, q2, q3 = q[0], q[1], q[2], q[3]
+        # rate of change of quaternion from gyroscope
+        d0 = 0.5 * (-q1 * gx - q2 * gy - q3 * gz)
+        d1 = 0.5 * (q0 * gx + q2 * gz - q3 * gy)
+        d2 = 0.5 * (q0 * gy - q1 * gz + q3 * gx)
+        d3 = 0.5 * (q0 * gz + q1 * gy - q2 * gx)
+        norm = sqrt(ax * ax + ay * ay + az * az)
+        if norm:
+            ax /= norm
+            ay /= norm
+            az /= norm
+            # gradient of the gravity objective function
+            _2q0, _2q1, _2q2, _2q3 = 2 * q0, 2 * q1, 2 * q2, 2 * q3
+            _4q0, _4q1, _4q2 = 4 * q0, 4 * q1, 4 * q2
+            _8q1, _8q2 = 8 * q1, 8 * q2
+            q0q0, q1q1, q2q2, q3q3 = q0 * q0, q1 * q1, q2 * q2, q3 * q3
+            s0 = _4q0 * q2q2 + _2q2 * ax + _4q0 * q1q1 - _2q1 * ay
+            s1 = (_4q1 * q3q3 - _2q3 * ax + 4 * q0q0 * q1 - _2q0 * ay - _4q1
+                  + _8q1 * q1q1 + _8q1 * q2q2 + _4q1 * az)
+            s2 = (4 * q0q0 * q2 + _2q0 * ax + _4q2 * q3q3 - _2q3 * ay - _4q2
+                  + _8q2 * q1q1 + _8q2 * q2q2 + _4q2 * az)
+            s3 = 4 * q1q1 * q3 - _2q1 * ax + 4 * q2q2 * q3 - _2q2 * ay
+            norm = sqrt(s0 * s0 + s1 * s1 + s2 * s2 + s3 * s3)
+            if norm:
+                b = self.beta / norm
+                d0 -= b * s0
+                d1 -= b * s1
+                d2 -= b * s2
+                d3 -= b * s3
+        self._integrate(q0, q1, q2, q3, d0 * dt, d1 * dt, d2 * dt, d3 * dt)
+
+    def _integrate(self, q0, q1, q2, q3, d0, d1, d2, d3):
+        q0 += d0
+        q1 += d1
+        q2 += d2
+        q3 += d3
+        norm = sqrt(q0 * q0 + q1 * q1 + q2 * q2 + q3 * q3)
+        q = self._q
+        q[0] = q0 / norm
+        q[1] = q1 / norm
+        q[2] = q2 / norm
+        q[3] = q3 / norm
+
+    def _q_to_euler(self):
+        q = self._q
+        q0, q1, q2, q3 = q[0], q[1], q[2], q[3]
+        e = self._euler
+        e[0] = atan2(2 * (q0 * q1 + q2 * q3), 1 - 2 * (q1 * q1 + q2 * q2))
+        s = 2 * (q0 * q2 - q3 * q1)
+        e[1] = asin(1.0 if s > 1 else -1.0 if s < -1 else s)
+        e[2] = atan2(2 * (q0 * q3 + q1 * q2), 1 - 2 * (q2 * q2 + q3 * q3))
@@ -1,4 +1,7 @@
 import random
+from logger import get_logger
+
+_log = get_logger("mpu6050_sim")
 
 class MethodWrapper:
     def __init__(self, func):
@@ -11,49 +14,126 @@ class MethodWrapper:
             return self.func(args)
 
 
+# synthetic model used by trace="synthetic": at rest, flat, 1 g on z,
+# with sensor noise, slow drift and occasional bumps
+_SYNTH_BASE = (0.0, 0.0, 1.0, 0.0, 0.0, 0.0)
+_SYNTH = {
+    "noise": (0.01, 0.01, 0.01, 0.3, 0.3, 0.3),
+    "drift": (0.002, 0.002, 0.002, 0.05, 0.05, 0.05),
+    "event_rate": 0.05,
+    "event_amp": (0.6, 0.6, 0.4, 40.0, 40.0, 40.0),
+    "event_ms": 300,
+}
+
 
 class MPU6050:
-    def __init__(self, i2c=None, addr=0x68, simulate=True):
+    """
+    simulate=True without a trace returns random values (logged at DEBUG).
+
+    Replay mode (trace=...) streams frames of ax, ay, az [g], gx, gy, gz
+    [deg/s] from trace_replay instead:
+        trace="synthetic"        generated noise + drift + events, seeded
+                                 per device (default seed: the address)
+        trace="/t/run1.trc"      binary or .csv trace file
+        trace=<source/Replay>    any trace_replay source
+    One frame is one sample: read_accel() and read_all() load the next
+    frame, read_gyro() returns the gyro half of the frame read_accel()
+    loaded (it loads one itself only if that gyro was already returned).
+    time_scale=None advances one frame per sample; a number paces the
+    replay against the clock (see trace_replay.Replay). Replay mode does not
+    log reads unless verbose=True.
+    """
+
+    def __init__(self, i2c=None, addr=0x68, simulate=True, *, trace=None,
+                 seed=None, rate_hz=100, time_scale=None, loop=True,
+                 verbose=None):
         self.simulate = simulate
         self.addr = addr
         self._accel = (0.0, 0.0, 0.0)
         self._gyro = (0.0, 0.0, 0.0)
+        self._replay = None
+        self.verbose = (trace is None) if verbose is None else verbose
 
-        if not self.simulate:
+        if trace is not None:
+            self._replay = _open_replay(trace, addr if seed is None else seed,
+                                        rate_hz, time_scale, loop)
+            self._frame = [0.0] * 6
+            self._gyro_unread = False  # current frame's gyro not returned yet
+            self.simulate = True
+        elif not self.simulate:
             try:
                 import mpu6050
                 self._sensor = mpu6050.MPU6050(i2c, address=self.addr)
                 self._sensor.wake()  # Make sure it's active
-                print(f"[INIT] MPU6050 at 0x{addr:X} (real)")
+                _log.info("MPU6050 at 0x%X (real)", addr)
             except Exception as e:
-                print("[ERROR] Failed to init real MPU6050:", e)
+                _log.error("failed to init real MPU6050: %s", e)
                 self.simulate = True
-                
-        def __getitem__(self, key):
-                method = getattr(self, key)
-                return MethodWrapper(method)
-        
-        if self.simulate:
-            print(f"[INIT] Simulated MPU6050 (addr=0x{addr:X})")
+
+        if self.simulate and self.verbose:
+            _log.info("simulated MPU6050 (addr=0x%X)", addr)
+
+    def __getitem__(self, key):
+        method = getattr(self, key)
+        return MethodWrapper(method)
+
+    def _next_frame(self):
+        f = self._frame
+        self._replay.read_into(f)
+        self._accel = (f[0], f[1], f[2])
+        self._gyro = (f[3], f[4], f[5])
+        self._gyro_unread = True
 
     def read_accel(self):
-        if self.simulate:
+        if self._replay:
+            self._next_frame()
+        elif self.simulate:
             self._accel = tuple(round(random.uniform(-2.0, 2.0), 2) for _ in range(3))
         else:
             self._accel = self._sensor.get_accel()
-        print(f"[ACCEL] {self._accel}")
+        if self.verbose:
+            _log.debug("accel %s", self._accel)
         return self._accel
 
     def read_gyro(self):
-        if self.simulate:
+        if self._replay:
+            # paired with the read_accel() before it, not a sample of its own
+            if not self._gyro_unread:
+                self._next_frame()
+            self._gyro_unread = False
+        elif self.simulate:
             self._gyro = tuple(round(random.uniform(-250.0, 250.0), 1) for _ in range(3))
         else:
             self._gyro = self._sensor.get_gyro()
-        print(f"[GYRO] {self._gyro}")
+        if self.verbose:
+            _log.debug("gyro %s", self._gyro)
         return self._gyro
 
     def read_all(self):
+        if self._replay:
+            # one frame for both, so accel and gyro belong together
+            self._next_frame()
+            self._gyro_unread = False
+            return {"accel": self._accel, "gyro": self._gyro}
         return {
             "accel": self.read_accel(),
             "gyro": self.read_gyro()
         }
+
+    def read_block(self, buf, frames):
+        """Replay mode only: fill array('f') buf with up to `frames` frames
+        of 6 values in one call; returns the number of frames."""
+        return self._replay.read_block(buf, frames)
+
+
+def _open_replay(trace, seed, rate_hz, time_scale, loop):
+    from trace_replay import Replay, SyntheticSource, open_trace
+    if isinstance(trace, Replay):
+        return trace
+    if trace == "synthetic":
+        source = SyntheticSource(_SYNTH_BASE, rate_hz=rate_hz, seed=seed, **_SYNTH)
+    elif isinstance(trace, str):
+        source = open_trace(trace)
+    else:
+        source = trace
+    return Replay(source, time_scale=time_scale, loop=loop)
@@ -0,0 +1,60 @@
+# accelerometer_alloc.py
+# Counts heap bytes allocated per MPU6050 sample, using gc.mem_alloc() deltas.
+# Run on the board with the sensor attached:
+#     mpremote mip install github:mohammad0faqusa/mip-packages/accelerometer
+#     mpremote run benchmarks/accelerometer_alloc.py
+# A path that allocates more than its budget is reported as FAIL.
+
+import gc
+from array import array
+from accelerometer import MPU6050
+
+SAMPLES = 200
+
+# bytes per sample; the *_into paths still box their float results on ports
+# without immediate floats, the dict paths allocate several objects
+BUDGET = {
+    "read_accel_data": None,
+    "read_all": None,
+    "read_accel_into": 64,
+    "read_gyro_into": 64,
+    "read_all_into": 128,
+}
+
+
+def bytes_per_sample(fn):
+    fn()                      # warm up (first call may intern names)
+    gc.collect()
+    gc.disable()
+    before = gc.mem_alloc()
+    for _ in range(SAMPLES):
+        fn()
+    after = gc.mem_alloc()
+    gc.enable()
+    return (after - before) / SAMPLES
+
+
+def main():
+    mpu = MPU6050()
+    out = array('f', [0] * 7)
+    cases = (
+        ("read_accel_data", lambda: mpu.read_accel_data()),
+        ("read_all", lambda: mpu.read_all()),
+        ("read_accel_into", lambda: mpu.read_accel_into(out)),
+        ("read_gyro_into", lambda: mpu.read_gyro_into(out)),
+        ("read_all_into", lambda: mpu.read_all_into(out)),
+    )
+    failed = 0
+    for name, fn in cases:
+        per = bytes_per_sample(fn)
+        budget = BUDGET[name]
+        status = ""
+        if budget is not None:
+            status = "ok" if per <= budget else "FAIL"
+            failed += status == "FAIL"
+        print("{:<16} {:8.1f} B/sample {}".format(name, per, status))
+    if failed:
+        raise SystemExit("{} path(s) over allocation budget".format(failed))
+
+
+main()
@@ -0,0 +1,395 @@
+# host_bench.py
+# Per-call cost of the driver methods, measured on a host against the fake
+# peripherals in host_emu. Run from the repository root:
+#     python3 benchmarks/host_bench.py                  # compare to baseline
+#     python3 benchmarks/host_bench.py --json out.json  # also write results
+#     python3 benchmarks/host_bench.py --update         # rewrite the baseline
+#
+# For every case it reports, per call:
+#   wall_us    host wall time (best of several runs)
+#   device_us  time charged by the host_emu timing model (bus transfers,
+#              sleeps, IRQ latency); deterministic
+#   i2c_*, gpio_*, irqs, pwm_writes, dht_reads   bus traffic
+#   alloc_bytes  peak heap allocated during one call (tracemalloc)
+#
+# CPython allocations are only a proxy for the MicroPython heap; the
+# on-device numbers come from accelerometer_alloc.py. Exits with status 1
+# when any case regresses against benchmarks/baseline.json.
+
+import argparse
+import contextlib
+import io
+import json
+import os
+import sys
+import time
+import tracemalloc
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+ROOT = os.path.dirname(HERE)
+BASELINE = os.path.join(HERE, "baseline.json")
+
+sys.path.insert(0, os.path.join(ROOT, "host_emu"))
+import host_emu  # noqa: E402
+
+_perf_ns = time.perf_counter_ns
+
+COUNTERS = ("i2c_transactions", "i2c_bytes", "gpio_reads", "gpio_writes",
+            "irqs", "pwm_writes", "dht_reads")
+
+# deterministic metrics must not grow at all (tiny slack for float averages);
+# allocations get some headroom for interpreter differences
+_EXACT_SLACK = 0.01
+_ALLOC_RATIO = 1.25
+_ALLOC_SLACK = 64
+# sub-microsecond cases jitter by more than 2x on a busy host
+_WALL_SLACK_US = 1.0
+
+
+def _board():
+    return host_emu.reset(realtime=False)
+
+
+# ───────── cases ─────────
+# Each group builds its own board and returns [(name, fn, calls)].
+
+def accelerometer_cases():
+    from array import array
+    from accelerometer import MPU6050
+    board = _board()
+    fake = board.attach_i2c(host_emu.FakeMPU6050())
+    fake.accel = (0.1, -0.2, 0.97)
+    fake.gyro = (1.0, -2.0, 0.5)
+    mpu = MPU6050()
+    out = array('f', [0] * 7)
+    # separate instance, read_angle() returns the fused angle once enabled
+    fused = MPU6050()
+    fused.enable_fusion("complementary", rate_hz=0)
+    stream = mpu.start_stream(rate_div=0, capacity=256, block=32)
+
+    def drain():
+        # 10 ms of 1 kHz frames per call
+        board.clock.advance(10000)
+        for _ in stream.samples():
+            pass
+
+    return [
+        ("MPU6050.read_accel_data", mpu.read_accel_data, 500),
+        ("MPU6050.read_gyro_data", mpu.read_gyro_data, 500),
+        ("MPU6050.read_all", mpu.read_all, 500),
+        ("MPU6050.read_angle", mpu.read_angle, 500),
+        ("MPU6050.read_temperature", mpu.read_temperature, 500),
+        ("MPU6050.read_accel_into", lambda: mpu.read_accel_into(out), 500),
+        ("MPU6050.read_all_into", lambda: mpu.read_all_into(out), 500),
+        ("MPU6050.update_orientation", fused.update_orientation, 500),
+        ("MPU6050.get_orientation", fused.get_orientation, 500),
+        ("FifoStream.samples[10ms]", drain, 100),
+    ]
+
+
+def oled_cases():
+    from oled import OLED
+    board = _board()
+    board.attach_i2c(host_emu.FakeSSD1306())
+    oled = OLED()
+    return [
+        ("OLED.show", oled.show, 100),
+        ("OLED.fill", lambda: oled.fill(0), 100),
+        ("OLED.text", lambda: oled.text("Temp 21.5C", 0, 8), 100),
+        ("OLED.write_line[tiny]",
+         lambda: oled.write_line("temp,21.5,hum,45.0", 1), 20),
+        ("OLED.write_line[normal]",
+         lambda: oled.write_line("temp 21.5", 2, tiny=False), 20),
+        ("OLED.write", lambda: oled.write("temp,21.5"), 20),
+        ("OLED.clear", oled.clear, 20),
+    ]
+
+
+def dht_cases():
+    import machine
+    from dht_sensor import DHTSensor
+    board = _board()
+    board.attach_dht(host_emu.FakeDHT22(15, min_interval_ms=0))
+    cached = DHTSensor(machine.Pin(15))
+    cached.measure()
+    forced = DHTSensor(machine.Pin(15), min_interval_ms=0)
+    return [
+        ("DHTSensor.measure[cached]", cached.measure, 1000),
+        ("DHTSensor.measure[read]", forced.measure, 200),
+        ("DHTSensor.temperature", cached.temperature, 1000),
+    ]
+
+
+def encoder_cases():
+    from encoder import Encoder
+    board = _board()
+    quad = host_emu.FakeQuadrature(32, 33, step_us=0)
+    enc = Encoder(32, 33, min_pos=-(1 << 30), max_pos=1 << 30, backend="irq")
+    enc.watch_state(lambda name, update: None)
+    pquad = host_emu.FakeQuadrature(25, 26, step_us=0)
+    pcnt = Encoder(25, 26, min_pos=-(1 << 30), max_pos=1 << 30, backend="pcnt")
+    pcnt.watch_state(lambda name, update: None)
+    return [
+        ("Encoder._irq[step]", lambda: quad.step(1), 1000),
+        ("Encoder.get_position", enc.get_position, 1000),
+        ("Encoder.get_velocity", enc.get_velocity, 1000),
+        ("Encoder.get_acceleration", enc.get_acceleration, 1000),
+        ("Encoder.pcnt[step]", lambda: pquad.step(1), 1000),
+        ("Encoder.get_position[pcnt]", pcnt.get_position, 1000),
+    ]
+
+
+def servo_cases():
+    from servo_motor import Servo
+    from servo_motor.motion import Trajectory
+    _board()
+    servo = Servo(13)
+    angles = iter(range(1 << 30))
+    # a move long enough never to finish while measured
+    traj = Trajectory(servo, 0, 180, 1 << 29, "trapezoid")
+    return [
+        ("Servo.angle", lambda: servo.angle(next(angles) % 181), 1000),
+        ("Servo.write_us", lambda: servo.write_us(1500), 1000),
+        ("Servo.get_angle", servo.get_angle, 1000),
+        ("Servo.move[tick]", lambda: traj.step(time.ticks_ms()), 1000),
+    ]
+
+
+def ultrasonic_cases():
+    from ultrasonic_sensor import UltrasonicSensor
+    _board()
+    host_emu.FakeHCSR04(5, 18, distance_cm=50)
+    sensor = UltrasonicSensor(5, 18, min_interval_ms=0)
+    return [("UltrasonicSensor.get_distance", sensor.get_distance, 20)]
+
+
+def gas_cases():
+    import machine
+    from gas_sensor import AnalogGasSensor
+    board = _board()
+    quiet = AnalogGasSensor(36, oversample=4, ppm_per_count=1.0, warmup_s=0,
+                            hold_ms=500)
+    machine.Pin(36).analog = 20000
+    quiet.update()                     # seeds the baseline
+    # 100 ms per call, the level hopping across on_ppm/off_ppm: crossings
+    # rejected by the hold, and one confirmed on and off per cycle
+    noisy = AnalogGasSensor(39, oversample=4, ppm_per_count=1.0, warmup_s=0,
+                            hold_ms=200)
+    pin = machine.Pin(39)
+    pin.analog = 20000
+    noisy.update()
+    levels = tuple(20000 + ppm for ppm in
+                   (260, 180, 260, 260, 260, 180, 100, 180, 100, 100, 100))
+    step = [0]
+
+    def chatter():
+        board.clock.advance(100000)
+        pin.analog = levels[step[0] % len(levels)]
+        step[0] += 1
+        noisy.update()
+
+    return [
+        ("AnalogGasSensor.update", quiet.update, 1000),
+        ("AnalogGasSensor.update[chatter]", chatter, 1000),
+    ]
+
+
+def pir_cases():
+    import machine
+    from motion_sensor import PIRSensor
+    board = _board()
+    sink = lambda name, update: None  # noqa: E731
+    # the occupancy task is only created, the cases drive update() directly
+    pir = PIRSensor(35, hold_s=2, history_min=60, report_min=5,
+                    watch_state=sink)
+    pin = machine.Pin(35)
+    step = [0]
+
+    def tick():
+        # 1 s per call, motion in the first 3 s of every 10: the hold runs
+        # out each cycle and a minute closes every 60 calls
+        board.clock.advance(1000000)
+        phase = step[0] % 10
+        step[0] += 1
+        if phase == 0:
+            pin.drive(1)
+        elif phase == 3:
+            pin.drive(0)
+        pir.update()
+
+    return [
+        ("PIRSensor.occupancy[edge]", _toggler(pin), 1000),
+        ("PIRSensor.update", tick, 1000),
+        ("PIRSensor.duty_cycle", pir.duty_cycle, 1000),
+    ]
+
+
+def _toggler(pin):
+    level = [pin.value()]
+
+    def toggle():
+        level[0] ^= 1
+        pin.drive(level[0])
+    return toggle
+
+
+def edge_cases():
+    import machine
+    from push_button import PushButton
+    from gas_sensor import GasSensor
+    from motion_sensor import PIRSensor
+    _board()
+    sink = lambda name, update: None  # noqa: E731
+    PushButton(0, debounce_ms=0, watch_state=sink)
+    gas = GasSensor(34, debounce_ms=0)
+    gas.watch_state(sink)
+    PIRSensor(35, watch_state=sink)
+    return [
+        ("PushButton.edge", _toggler(machine.Pin(0)), 1000),
+        ("GasSensor.edge", _toggler(machine.Pin(34)), 1000),
+        ("PIRSensor.edge", _toggler(machine.Pin(35)), 1000),
+    ]
+
+
+def output_cases():
+    from led import LED
+    from relay import Relay
+    from slide_switch import SlideSwitch
+    _board()
+    led = LED(2)
+    relay = Relay(4)
+    switch = SlideSwitch(16, simulate=False)
+    return [
+        ("LED.toggle", led.toggle, 1000),
+        ("Relay.toggle", relay.toggle, 1000),
+        ("SlideSwitch.read", switch.read, 1000),
+    ]
+
+
+GROUPS = (accelerometer_cases, oled_cases, dht_cases, encoder_cases,
+          servo_cases, ultrasonic_cases, gas_cases, pir_cases, edge_cases,
+          output_cases)
+
+
+# ───────── measurement ─────────
+
+def measure(fn, calls, repeats=3):
+    board = host_emu.board()
+    fn()                                    # warm up caches and interning
+
+    stats0 = dict(board.stats)
+    dev0 = board.clock.charged_us
+    best = None
+    for r in range(repeats):
+        t0 = _perf_ns()
+        for _ in range(calls):
+            fn()
+        dt = _perf_ns() - t0
+        best = dt if best is None or dt < best else best
+        if r == 0:
+            stats1 = dict(board.stats)
+            dev1 = board.clock.charged_us
+
+    res = {"calls": calls, "wall_us": round(best / calls / 1000, 3),
+           "device_us": round((dev1 - dev0) / calls, 2)}
+    for k in COUNTERS:
+        res[k] = round((stats1[k] - stats0[k]) / calls, 2)
+
+    n = min(calls, 20)
+    total = 0
+    tracemalloc.start()
+    for _ in range(n):
+        tracemalloc.reset_peak()
+        before = tracemalloc.get_traced_memory()[0]
+        fn()
+        total += max(0, tracemalloc.get_traced_memory()[1] - before)
+    tracemalloc.stop()
+    res["alloc_bytes"] = round(total / n)
+    return res
+
+
+def run(only=None):
+    results = {}
+    # drivers print on some paths; keep that out of the report and timings
+    with contextlib.redirect_stdout(io.StringIO()):
+        host_emu.install(realtime=False)
+        for group in GROUPS:
+            for name, fn, calls in group():
+                if only and only not in name:
+                    continue
+                results[name] = measure(fn, calls)
+    return results
+
+
+def compare(results, baseline, wall_tolerance):
+    """Returns a list of (case, metric, baseline, now) regressions."""
+    bad = []
+    for name, now in results.items():
+        base = baseline.get(name)
+        if base is None:
+            continue
+        for k in ("device_us",) + COUNTERS:
+            if now[k] > base.get(k, 0) * (1 + _EXACT_SLACK) + _EXACT_SLACK:
+                bad.append((name, k, base.get(k), now[k]))
+        if now["alloc_bytes"] > base["alloc_bytes"] * _ALLOC_RATIO + _ALLOC_SLACK:
+            bad.append((name, "alloc_bytes", base["alloc_bytes"], now["alloc_bytes"]))
+        if wall_tolerance is not None and \
+                now["wall_us"] > base["wall_us"] * (1 + wall_tolerance) + _WALL_SLACK_US:
+            bad.append((name, "wall_us", base["wall_us"], now["wall_us"]))
+    return bad
+
+
+def report(results, baseline):
+    print("{:<32} {:>10} {:>10} {:>7} {:>8} {:>7} {:>7} {:>8}".format(
+        "case", "wall_us", "device_us", "i2c_tx", "i2c_B", "gpio_r", "gpio_w", "alloc_B"))
+    for name, r in results.items():
+        mark = "" if name in baseline else "  (new)"
+        print("{:<32} {:>10.2f} {:>10.1f} {:>7g} {:>8g} {:>7g} {:>7g} {:>8}{}".format(
+            name, r["wall_us"], r["device_us"], r["i2c_transactions"],
+            r["i2c_bytes"], r["gpio_reads"], r["gpio_writes"],
+            r["alloc_bytes"], mark))
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Host-side driver benchmarks")
+    ap.add_argument("--json", help="write results to this file")
+    ap.add_argument("--baseline", default=BASELINE)
+    ap.add_argument("--update", action="store_true",
+                    help="store these results as the new baseline")
+    ap.add_argument("--wall-tolerance", type=float, default=1.0,
+                    help="allowed wall-time slowdown, 1.0 = 2x (default)")
+    ap.add_argument("--no-wall", action="store_true",
+                    help="ignore wall time (baseline from another machine)")
+    ap.add_argument("-k", dest="only", help="only cases containing this text")
+    args = ap.parse_args(argv)
+
+    results = run(args.only)
+    baseline = {}
+    if os.path.exists(args.baseline):
+        with open(args.baseline) as f:
+            baseline = json.load(f)["results"]
+    report(results, baseline)
+
+    doc = {"python": sys.version.split()[0], "results": results}
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(doc, f, indent=1, sort_keys=True)
+    if args.update:
+        with open(args.baseline, "w") as f:
+            json.dump(doc, f, indent=1, sort_keys=True)
+            f.write("\n")
+        print("baseline written to", args.baseline)
+        return 0
+
+    for name in baseline:
+        if name not in results and not args.only:
+            print("missing case:", name)
+    bad = compare(results, baseline,
+                  None if args.no_wall else args.wall_tolerance)
+    for name, metric, base, now in bad:
+        print("REGRESSION {} {}: {} -> {}".format(name, metric, base, now))
+    return 1 if bad else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,5 +1,8 @@
 import sys
 import machine
+from time import ticks_ms, ticks_diff
+import uasyncio as asyncio
+from logger import get_logger
 
 if hasattr(machine, "dht_readinto"):
     from machine import dht_readinto
@@ -12,6 +15,8 @@ else:
 
 del machine
 
+_log = get_logger("dht")
+
 class MethodWrapper:
     def __init__(self, func):
         self.func = func
@@ -24,29 +29,122 @@ class MethodWrapper:
 
 
 class DHTBase:
-    def __init__(self, pin):
+    """
+    The sensor needs ~2 s between reads (DHT22; 1 s for DHT11). measure()
+    keeps the last good reading in `buf` and only talks to the sensor when
+    that reading is older than min_interval_ms, so several callers can read
+    freely without stalling on the bit-banged transfer or getting checksum
+    errors from reading too early.
+    """
+
+    def __init__(self, pin, min_interval_ms=2000):
         self.pin = pin
         self.buf = bytearray(5)
+        self.min_interval_ms = min_interval_ms
+        self._scratch = bytearray(5)
+        self._last_read_ms = None       # last good reading
+        self._last_attempt_ms = None    # last physical read, good or not
+        self._lock = None
+        self.reads = 0
+        self.cache_hits = 0
+        self.checksum_errors = 0
     
     def __getitem__(self, key):
         method = getattr(self, key)
         return MethodWrapper(method)
 
-    def measure(self):
-        buf = self.buf
+    def measure(self, force=False):
+        """Refresh `buf` unless the cached reading is still fresh.
+
+        Within min_interval_ms of the last physical read, good or failed,
+        the sensor is not touched again: the last good reading stays in
+        `buf`, or, if there is none or force is set, an exception is
+        raised. measure_async() waits out that time instead."""
+        if not force and self._is_fresh():
+            self.cache_hits += 1
+            return
+        if self._resting():
+            if force or self._last_read_ms is None:
+                raise Exception("sensor resting after a failed read")
+            self.cache_hits += 1
+            return
+        self._read()
+
+    async def measure_async(self, force=False):
+        """Like measure(), but concurrent callers share one physical read,
+        and a retry after a failed read waits out the sensor's rest time."""
+        if self._lock is None:
+            self._lock = asyncio.Lock()
+        async with self._lock:
+            if not force and self._is_fresh():
+                self.cache_hits += 1
+                return
+            if self._last_attempt_ms is not None:
+                wait = self.min_interval_ms - ticks_diff(ticks_ms(), self._last_attempt_ms)
+                if wait > 0:
+                    await asyncio.sleep_ms(wait)
+            self._read()
+
+    def _read(self):
+        # read into a scratch buffer so a bad transfer keeps the last good value
+        buf = self._scratch
+        self._last_attempt_ms = ticks_ms()
+        self.reads += 1
         dht_readinto(self.pin, buf)
         if (buf[0] + buf[1] + buf[2] + buf[3]) & 0xFF != buf[4]:
+            self.checksum_errors += 1
             raise Exception("checksum error")
-
-import uasyncio as asyncio
+        self.buf[:] = buf
+        self._last_read_ms = self._last_attempt_ms
+
+    def _resting(self):
+        return (self._last_attempt_ms is not None and
+                ticks_diff(ticks_ms(), self._last_attempt_ms) < self.min_interval_ms)
+
+    def _is_fresh(self):
+        age = self.age_ms()
+        return age is not None and age < self.min_interval_ms
+
+    def age_ms(self):
+        """Milliseconds since the cached reading was taken, None if never."""
+        if self._last_read_ms is None:
+            return None
+        return ticks_diff(ticks_ms(), self._last_read_ms)
+
+    def is_stale(self, max_age_ms=None):
+        """True if there is no reading or it is older than max_age_ms
+        (default: min_interval_ms)."""
+        age = self.age_ms()
+        if max_age_ms is None:
+            max_age_ms = self.min_interval_ms
+        return age is None or age >= max_age_ms
+
+    def stats(self):
+        return {
+            "reads": self.reads,
+            "cache_hits": self.cache_hits,
+            "checksum_errors": self.checksum_errors,
+            "age_ms": self.age_ms(),
+        }
 
 class DHTSensor(DHTBase):
-    def __init__(self, pin):
-        super().__init__(pin)
+    def __init__(self, pin, min_interval_ms=2000):
+        super().__init__(pin, min_interval_ms)
         self._last_values = {"temperature": None, "humidity": None}
         self._on_state_change = None
         self._watching = False
         self._watch_task = None
+        # coalesced watch mode, see watch_state()
+        self._coalesce = False
+        self._temp_deadband = 0.0
+        self._hum_deadband = 0.0
+        self._rel_deadband = 0.0
+        self._max_report_ms = None
+        self._reported_t = None
+        self._reported_h = None
+        self._last_report_ms = 0
+        self.events = 0
+        self.suppressed = 0
 
     def humidity(self):
         return (self.buf[0] << 8 | self.buf[1]) * 0.1
@@ -63,9 +161,54 @@ class DHTSensor(DHTBase):
             if self._on_state_change:
                 self._on_state_change("dht_sensor", {key: value})
 
-    def watch_state(self, callback, interval=5):
-        """Set the callback and start the watch loop."""
+    def _outside(self, value, reported, deadband):
+        if reported is None:
+            return True
+        band = self._rel_deadband * abs(reported)
+        if deadband > band:
+            band = deadband
+        return abs(value - reported) > band
+
+    def _report(self, t, h):
+        now = ticks_ms()
+        due = (self._max_report_ms is not None and
+               ticks_diff(now, self._last_report_ms) >= self._max_report_ms)
+        if not (due or self._outside(t, self._reported_t, self._temp_deadband)
+                or self._outside(h, self._reported_h, self._hum_deadband)):
+            self.suppressed += 1
+            return
+        self._reported_t = t
+        self._reported_h = h
+        self._last_report_ms = now
+        self.events += 1
+        if self._on_state_change:
+            self._on_state_change("dht_sensor", {"temperature": t, "humidity": h})
+
+    def watch_state(self, callback, interval=5, *, coalesce=False,
+                    temp_deadband=0.0, hum_deadband=0.0, rel_deadband=0.0,
+                    max_report_s=None):
+        """Set the callback and start the watch loop.
+
+        coalesce=True sends one {"temperature": t, "humidity": h} event per
+        measurement instead of one event per changed value, and only when a
+        value has moved past its deadband since the last report:
+            temp_deadband  absolute band, degC
+            hum_deadband   absolute band, %RH
+            rel_deadband   band as a fraction of the last reported value
+        The larger of the absolute and relative band applies. Bands are
+        measured from the last *reported* value, so jitter inside a band never
+        reports and a slow drift reports once per band width (hysteresis).
+        max_report_s sends the current values anyway when nothing was
+        reported for that long, as a heartbeat.
+        """
         self._on_state_change = callback
+        self._coalesce = coalesce
+        self._temp_deadband = temp_deadband
+        self._hum_deadband = hum_deadband
+        self._rel_deadband = rel_deadband
+        self._max_report_ms = None if max_report_s is None else int(max_report_s * 1000)
+        self._reported_t = None
+        self._reported_h = None
         self.init_watch(interval)
 
     def init_watch(self, interval=5):
@@ -82,11 +225,14 @@ class DHTSensor(DHTBase):
     async def _watch_loop(self, interval):
         while self._watching:
             try:
-                self.measure()
-                self._trigger_on_change("temperature", self.temperature())
-                self._trigger_on_change("humidity", self.humidity())
+                await self.measure_async()
+                if self._coalesce:
+                    self._report(self.temperature(), self.humidity())
+                else:
+                    self._trigger_on_change("temperature", self.temperature())
+                    self._trigger_on_change("humidity", self.humidity())
             except Exception as e:
-                print("DHT read error:", e)
+                _log.error("read error: %s", e)
             await asyncio.sleep(interval)
 
 __version__ = '0.1.0'
@@ -1,4 +1,7 @@
 import random
+from logger import get_logger
+
+_log = get_logger("dht_sim")
 
 class MethodWrapper:
     def __init__(self, func):
@@ -11,40 +14,112 @@ class MethodWrapper:
             return self.func(args)
 
 
+# synthetic model used by trace="synthetic": indoor room, slow drift and a
+# few disturbances per hour (window opened, shower, ...)
+_SYNTH_BASE = (24.0, 50.0)
+_SYNTH = {
+    "noise": (0.05, 0.2),
+    "drift": (0.02, 0.08),
+    "drift_tau_s": 3600,
+    "event_rate": 1 / 1200,
+    "event_amp": (-2.5, 12.0),
+    "event_ms": 600000,
+}
+
 
 class DHTSensor:
-    def __init__(self, pin, sensor_type="DHT22", simulate=True):
+    """
+    simulate=True without a trace returns random values (logged at DEBUG).
+
+    Replay mode (trace=...) streams (temperature, humidity) frames from
+    trace_replay instead:
+        trace="synthetic"        generated noise + drift + events, seeded
+                                 per device (default seed: the pin)
+        trace="/t/room.csv"      binary or .csv trace file
+        trace=<source/Replay>    any trace_replay source
+    rate_hz is the synthetic sample rate (default one sample per 2 s).
+    Replay mode does not log reads unless verbose=True.
+    """
+
+    def __init__(self, pin, sensor_type="DHT22", simulate=True, *, trace=None,
+                 seed=None, rate_hz=0.5, time_scale=None, loop=True,
+                 verbose=None):
         self.pin = pin
         self.sensor_type = sensor_type
         self.simulate = simulate
         self._temp = 0.0
         self._humidity = 0.0
+        self._replay = None
+        self.verbose = (trace is None) if verbose is None else verbose
 
-        if not self.simulate:
+        if trace is not None:
+            self._replay = _open_replay(trace, _pin_seed(pin) if seed is None else seed,
+                                        rate_hz, time_scale, loop)
+            self._frame = [0.0, 0.0]
+            self.simulate = True
+        elif not self.simulate:
             import dht
             from machine import Pin
             sensor_class = dht.DHT22 if self.sensor_type == "DHT22" else dht.DHT11
             self._sensor = sensor_class(Pin(self.pin))
 
-        print(f"[INIT] {sensor_type} on pin {pin} (simulate={simulate})")
+        if self.verbose:
+            _log.info("%s on pin %s (simulate=%s)", sensor_type, pin, simulate)
 
     def __getitem__(self, key):
         method = getattr(self, key)
         return MethodWrapper(method)
-    
+
     def measure(self):
-        if self.simulate:
+        if self._replay:
+            f = self._frame
+            self._replay.read_into(f)
+            # DHT22 resolution
+            self._temp = round(f[0], 1)
+            self._humidity = round(min(100.0, max(0.0, f[1])), 1)
+            if self.verbose:
+                _log.debug("replay: %s C, %s %%", self._temp, self._humidity)
+        elif self.simulate:
             self._temp = round(random.uniform(20.0, 30.0), 1)       # Simulated temp
             self._humidity = round(random.uniform(40.0, 60.0), 1)   # Simulated humidity
-            print(f"[MEASURE] Simulated: {self._temp}°C, {self._humidity}%")
+            _log.debug("simulated: %s C, %s %%", self._temp, self._humidity)
         else:
             self._sensor.measure()
             self._temp = self._sensor.temperature()
             self._humidity = self._sensor.humidity()
-            print(f"[MEASURE] Real: {self._temp}°C, {self._humidity}%")
+            _log.debug("real: %s C, %s %%", self._temp, self._humidity)
 
     def temperature(self):
         return self._temp
 
     def humidity(self):
         return self._humidity
+
+    def read_block(self, buf, frames):
+        """Replay mode only: fill array('f') buf with up to `frames`
+        (temperature, humidity) frames in one call; returns the count."""
+        return self._replay.read_block(buf, frames)
+
+
+def _pin_seed(pin):
+    if isinstance(pin, int):
+        return pin
+    # Pin objects: derive a stable seed from "Pin(4)" (hash() of a str is
+    # randomised per process on CPython)
+    seed = 0
+    for ch in str(pin):
+        seed = (seed * 31 + ord(ch)) & 0xFFFFFFFF
+    return seed
+
+
+def _open_replay(trace, seed, rate_hz, time_scale, loop):
+    from trace_replay import Replay, SyntheticSource, open_trace
+    if isinstance(trace, Replay):
+        return trace
+    if trace == "synthetic":
+        source = SyntheticSource(_SYNTH_BASE, rate_hz=rate_hz, seed=seed, **_SYNTH)
+    elif isinstance(trace, str):
+        source = open_trace(trace)
+    else:
+        source = trace
+    return Replay(source, time_scale=time_scale, loop=loop)
@@ -13,9 +13,41 @@ class MethodWrapper:
 
 
 from machine import Pin
+import machine
 import micropython
+import time
+from array import array
+import uasyncio as asyncio
+from logger import get_logger
+
+_log = get_logger("encoder")
 
 class Encoder:
+    """
+    Quadrature encoder. Counting and reporting are separate:
+
+    backend="pcnt"  the ESP32 pulse counter (machine.Encoder) counts every
+                    edge in hardware; nothing runs per edge
+    backend="irq"   a hard IRQ on A and B decodes the Gray code and only
+                    adds +-1 to a raw count (no allocation, no callback)
+    backend="auto"  pcnt where the port has it, else irq; a hub= always
+                    uses the hub's dispatcher
+
+    get_position() reads the count lazily and clamps the net movement
+    since the previous read to min_pos..max_pos; None leaves that side
+    unbounded, and count() is the raw count. watch_state and events()
+    are fed by an asyncio task that reports at most every report_ms and
+    only the latest position, so a fast shaft costs one report per period.
+
+    get_velocity() / get_acceleration() (counts/s, counts/s^2) come from a
+    ring of (ticks_us, count) per transition, written by the decoder. They
+    use the last edge interval at low speed and average over more edges as
+    speed rises, up to window_ms or the ring size. With the PCNT backend
+    there are no edge times: the ring is filled with the counter value each
+    time an estimate is asked for, so call them at your control rate; the
+    count is quantised per sample, so a wider window_ms gives a smoother
+    acceleration there.
+    """
     _DELTA = (
          0, +1, -1,  0,
         -1,  0,  0, +1,
@@ -31,62 +63,255 @@ class Encoder:
                  max_pos=180,
                  pull=Pin.PULL_UP,
                  watch_state=None,
+                 hub=None,
+                 backend="auto",
+                 pcnt_id=0,
+                 report_ms=20,
+                 ring_size=16,
+                 window_ms=20,
+                 timeout_ms=500,
                  ):
+        if ring_size < 4 or ring_size & (ring_size - 1):
+            raise ValueError("ring_size must be a power of two >= 4")
 
         self._min = min_pos
         self._max = max_pos
-        self._pos = min_pos
+        self._pos = 0 if min_pos is None else min_pos
         self._watch_state = watch_state
         self._saved_watch_state = watch_state
-       
+        self._streams = []
+        self._report_ms = report_ms
+        self._reported = self._pos
+        self._task = None
 
         self._pa = pin_a if isinstance(pin_a, Pin) else Pin(pin_a, Pin.IN, pull)
         self._pb = pin_b if isinstance(pin_b, Pin) else Pin(pin_b, Pin.IN, pull)
 
         self._state = (self._pa.value() << 1) | self._pb.value()
+        self._count = 0                # raw count for the irq/hub decoders
+        self._seen = 0                 # count folded into _pos so far
+        self._flag = asyncio.ThreadSafeFlag()
+        self._hw = None
+
+        # transition ring for the speed estimates
+        self._ring_t = array('L', [0] * ring_size)
+        self._ring_c = array('l', [0] * ring_size)
+        self._rmask = ring_size - 1
+        self._ti = 0                   # next slot
+        self._fill = 0                 # valid entries, up to ring_size
+        self._window_us = window_ms * 1000
+        self._timeout_us = timeout_ms * 1000
+
+        if hub is not None:
+            # the hub reports only the level of the pin that moved; the
+            # other half of the state comes from the last known state
+            hub.register(self._pa, self._hub_a)
+            hub.register(self._pb, self._hub_b)
+            self.backend = "hub"
+        elif backend in ("auto", "pcnt"):
+            self._hw = _open_pcnt(pcnt_id, self._pa, self._pb)
+            if self._hw is None and backend == "pcnt":
+                raise ValueError("no PCNT encoder on this port")
+        elif backend != "irq":
+            raise ValueError("backend must be 'auto', 'pcnt' or 'irq'")
 
-        micropython.alloc_emergency_exception_buf(100)
-        trig = Pin.IRQ_RISING | Pin.IRQ_FALLING
-        self._pa.irq(trigger=trig, handler=self._irq)
-        self._pb.irq(trigger=trig, handler=self._irq)
+        if self._hw is not None:
+            self.backend = "pcnt"
+        elif hub is None:
+            self.backend = "irq"
+            micropython.alloc_emergency_exception_buf(100)
+            trig = Pin.IRQ_RISING | Pin.IRQ_FALLING
+            self._pa.irq(trigger=trig, handler=self._irq, hard=True)
+            self._pb.irq(trigger=trig, handler=self._irq, hard=True)
+
+        if watch_state is not None:
+            self._start()
 
     def __getitem__(self, key):
         method = getattr(self, key)
         return MethodWrapper(method)
 
+    def count(self) -> int:
+        """Raw quadrature count, not clamped."""
+        if self._hw is not None:
+            return self._hw.value()
+        return self._count
+
     def get_position(self) -> int:
+        c = self.count()
+        d = c - self._seen
+        if d:
+            self._seen = c
+            pos = self._pos + d
+            if self._max is not None and pos > self._max:
+                pos = self._max
+            if self._min is not None and pos < self._min:
+                pos = self._min
+            self._pos = pos
         return self._pos
 
     def watch_state(self, func):
         self._watch_state = func
+        self._saved_watch_state = func
+        self._start()
+
+    def events(self, size=8, policy="coalesce"):
+        """
+        Async iterator of (position, ticks_us), fed by the same reporting
+        task as watch_state. close() the stream when done.
+        """
+        from gpio_hub import EventStream
+        s = EventStream(size, policy, self._streams.remove)
+        self._streams.append(s)
+        self._start()
+        return s
 
+    # ───────── decoding (irq / hub) ─────────
     def _irq(self, pin):
-        ab = (self._pa.value() << 1) | self._pb.value()
-        idx = (self._state << 2) | ab
+        self._step((self._pa.value() << 1) | self._pb.value(), time.ticks_us())
+
+    def _hub_a(self, level, t):
+        self._step((level << 1) | (self._state & 1), t)
+
+    def _hub_b(self, level, t):
+        self._step((self._state & 2) | level, t)
+
+    def _step(self, ab, t):
+        # hard IRQ context: int arithmetic and array stores only
+        delta = self._DELTA[(self._state << 2) | ab]
         self._state = ab
+        if delta:
+            c = self._count + delta
+            self._count = c
+            self._record(t, c)
+            self._flag.set()
 
-        delta = self._DELTA[idx]
-        if not delta:
-            return
+    def _record(self, t, c):
+        i = self._ti
+        self._ring_t[i] = t
+        self._ring_c[i] = c
+        self._ti = (i + 1) & self._rmask
+        if self._fill <= self._rmask:
+            self._fill += 1
+
+    # ───────── speed ─────────
+    def _sample(self):
+        # PCNT: no edge times, record the counter when it moved
+        c = self._hw.value()
+        if not self._fill or c != self._ring_c[(self._ti - 1) & self._rmask]:
+            self._record(time.ticks_us(), c)
+
+    def _span(self, last, most):
+        # edges to average over: the most that fit in the window, so a
+        # slow shaft uses its last interval and a fast one many edges
+        k = most
+        t_last = self._ring_t[last]
+        while k > 1 and time.ticks_diff(
+                t_last, self._ring_t[(last - k) & self._rmask]) > self._window_us:
+            k >>= 1
+        return k
+
+    def _rate(self, end, k):
+        # (counts/s, span in us) between ring entries end-k and end
+        start = (end - k) & self._rmask
+        dt = time.ticks_diff(self._ring_t[end], self._ring_t[start])
+        if dt <= 0:
+            return 0.0, 0
+        return (self._ring_c[end] - self._ring_c[start]) * 1000000 / dt, dt
+
+    def _bounded(self, v, dt, k, quiet):
+        # no edge for longer than the average interval: the shaft is at
+        # most as fast as one count per quiet time
+        if quiet * k > dt:
+            cap = 1000000 / quiet
+            if v > cap:
+                return cap
+            if v < -cap:
+                return -cap
+        return v
+
+    def get_velocity(self):
+        """counts/s, signed; 0.0 after timeout_ms without a transition."""
+        if self._hw is not None:
+            self._sample()
+        n = self._fill
+        if n < 2:
+            return 0.0
+        last = (self._ti - 1) & self._rmask
+        quiet = time.ticks_diff(time.ticks_us(), self._ring_t[last])
+        if quiet > self._timeout_us:
+            return 0.0
+        k = self._span(last, n - 1)
+        v, dt = self._rate(last, k)
+        return self._bounded(v, dt, k, quiet)
 
-        new_pos = self._pos + delta
-        new_pos = max(self._min, min(self._max, new_pos))
+    def get_acceleration(self):
+        """counts/s^2 from two consecutive velocity spans."""
+        if self._hw is not None:
+            self._sample()
+        n = self._fill
+        if n < 3:
+            return 0.0
+        last = (self._ti - 1) & self._rmask
+        quiet = time.ticks_diff(time.ticks_us(), self._ring_t[last])
+        if quiet > self._timeout_us:
+            return 0.0
+        k = self._span(last, (n - 1) >> 1)
+        v1, dt1 = self._rate(last, k)
+        v0, dt0 = self._rate((last - k) & self._rmask, k)
+        if not dt1 or not dt0:
+            return 0.0
+        v1 = self._bounded(v1, dt1, k, quiet)
+        # the two rates belong to the middles of their spans
+        return (v1 - v0) * 2000000 / (dt1 + dt0)
 
-        if new_pos != self._pos:
-            self._pos = new_pos
-            update = {"angle": self._pos}
+    # ───────── reporting ─────────
+    def _start(self):
+        if self._task is None:
+            self._task = asyncio.create_task(self._report_loop())
+
+    def _report(self):
+        pos = self.get_position()
+        if pos == self._reported:
+            return
+        self._reported = pos
+        t = time.ticks_us()
+        for s in self._streams:
+            s.push(pos, t)
+        if self._watch_state:
             try:
-                if self._watch_state:
-                    self._watch_state("encoder", update)
-              
+                self._watch_state("encoder", {"angle": pos})
             except Exception as exc:
-                print("Encoder state change error:", exc)
+                _log.error("state change error: %s", exc)
+
+    async def _report_loop(self):
+        me = self._task
+        while self._task is me:
+            if self._hw is None:
+                # sleeps until the decoder counts something
+                await self._flag.wait()
+            self._report()
+            await asyncio.sleep_ms(self._report_ms)
 
     def init_watch(self):
         """Reactivate watch/triggers after deinit_watch."""
         self._watch_state = self._saved_watch_state
+        self._start()
 
     def deinit_watch(self):
         """Disable watch/triggers without removing the encoder logic."""
         self._saved_watch_state = self._watch_state
         self._watch_state = None
+
+
+def _open_pcnt(pcnt_id, pa, pb):
+    # machine.Encoder is the PCNT-backed quadrature counter on ESP32 ports
+    # that ship it; anything else falls back to the IRQ decoder
+    enc = getattr(machine, "Encoder", None)
+    if enc is None:
+        return None
+    try:
+        return enc(pcnt_id, pa, pb, phases=4)
+    except Exception as exc:
+        _log.warning("PCNT encoder unavailable: %s", exc)
+        return None
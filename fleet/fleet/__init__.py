@@ -0,0 +1,25 @@
+# fleet
+# Host-side load generator: N virtual boards built from the simulated
+# drivers, feeding an ingestion callable, with throughput and latency
+# percentiles. Not a device package.
+#
+#     PYTHONPATH=fleet python3 -m fleet --devices 500 --duration 10
+#     PYTHONPATH=fleet python3 -m fleet --ramp --sink myapp.ingest:handle
+#
+#     from fleet import run
+#     print(run(200, duration=5, sink=handle))
+
+import os
+import sys
+
+_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.join(_ROOT, "host_emu"))
+from host_emu import driver_paths  # noqa: E402
+
+for _p in driver_paths(_ROOT):
+    if _p not in sys.path:
+        sys.path.append(_p)
+
+from .device import VirtualDevice, DEFAULT_RATES  # noqa: E402
+from .stats import LatencyHistogram  # noqa: E402
+from .runner import run, run_fleet, ramp, saturated, load_sink  # noqa: E402
@@ -0,0 +1,64 @@
+# python3 -m fleet --help
+
+import argparse
+import json
+
+from . import DEFAULT_RATES, ramp, run
+
+
+def _rates(args):
+    rates = dict(DEFAULT_RATES)
+    for item in args.rate or ():
+        name, _, value = item.partition("=")
+        if name not in rates:
+            raise SystemExit("unknown peripheral: " + name)
+        rates[name] = float(value)
+    return rates
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(prog="fleet", description="Virtual device fleet load test")
+    ap.add_argument("--devices", type=int, default=100)
+    ap.add_argument("--duration", type=float, default=10.0, help="seconds per run")
+    ap.add_argument("--rate", action="append", metavar="PERIPHERAL=HZ",
+                    help="events/s per device, e.g. accelerometer=50 (0 disables)")
+    ap.add_argument("--sink", default="fleet.sinks:to_json", help="module:function")
+    ap.add_argument("--workers", type=int, default=8, help="concurrent sink calls per process")
+    ap.add_argument("--queue", type=int, default=10000, help="queue size per process")
+    ap.add_argument("--service-ms", type=float, default=0.0,
+                    help="extra async delay per event (models a network round trip)")
+    ap.add_argument("--processes", type=int, default=1)
+    ap.add_argument("--seed", type=int, default=0)
+    ap.add_argument("--ramp", action="store_true", help="grow the fleet until saturation")
+    ap.add_argument("--ramp-stop", type=int, default=10000)
+    ap.add_argument("--ramp-factor", type=float, default=2.0)
+    ap.add_argument("--p99-ms", type=float, default=250.0, help="saturation latency limit")
+    ap.add_argument("--json", action="store_true", help="print JSON only")
+    args = ap.parse_args(argv)
+
+    kw = dict(duration=args.duration, rates=_rates(args), sink=args.sink,
+              workers=args.workers, queue_size=args.queue, seed=args.seed,
+              service_ms=args.service_ms, processes=args.processes)
+
+    def show(s):
+        if not args.json:
+            print("{devices:>6} dev  offered {offered_eps:>9.1f}/s  got {throughput_eps:>9.1f}/s  "
+                  "p50 {p50_ms:>8.3f}  p95 {p95_ms:>8.3f}  p99 {p99_ms:>8.3f} ms  "
+                  "dropped {dropped}".format(**s) +
+                  ("  SATURATED" if s.get("saturated") else ""))
+
+    if args.ramp:
+        steps, limit = ramp(args.devices, args.ramp_stop, args.ramp_factor,
+                            p99_ms=args.p99_ms, report=show, **kw)
+        result = {"steps": steps, "saturation_devices": limit}
+        if not args.json:
+            print("saturates at", limit, "devices" if limit else "(not reached)")
+    else:
+        result = run(args.devices, **kw)
+        show(result)
+    if args.json:
+        print(json.dumps(result, indent=1))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,94 @@
+# device.py
+# One virtual board: a set of simulated peripherals sampled at fixed rates,
+# each reading turned into a watch_state-style event.
+
+import asyncio
+import random
+
+from accelerometer_simulated import MPU6050
+from dht_sensor_simulated import DHTSensor
+from led import LED
+from relay import Relay
+from slide_switch import SlideSwitch
+
+# events per second per peripheral; 0 leaves the peripheral out
+DEFAULT_RATES = {
+    "accelerometer": 10.0,
+    "dht": 0.5,
+    "switch": 0.05,
+    "led": 0.1,
+    "relay": 0.05,
+}
+
+
+class VirtualDevice:
+    """
+    Peripherals are the repo's simulated drivers in their quiet modes
+    (trace="synthetic" replay, verbose=False), seeded from the device id so
+    a fleet run is repeatable.
+
+    emit(device_id, peripheral, update, due) is called for every event; `due`
+    is the loop time the event was scheduled for, so latency includes any
+    time the event loop fell behind.
+    """
+
+    def __init__(self, device_id, emit, rates=None, seed=0):
+        self.id = device_id
+        self.emit = emit
+        self.rates = dict(DEFAULT_RATES if rates is None else rates)
+        s = seed * 1000003 + device_id
+        self._rng = random.Random(s)
+        r = self.rates
+        self.accel = MPU6050(trace="synthetic", seed=s) if r.get("accelerometer") else None
+        self.dht = DHTSensor(4, trace="synthetic", seed=s) if r.get("dht") else None
+        self.switch = SlideSwitch(5, simulate=True, verbose=False) if r.get("switch") else None
+        self.led = LED(2, simulate=True, verbose=False) if r.get("led") else None
+        self.relay = Relay(16, simulate=True, verbose=False) if r.get("relay") else None
+        for out in (self.led, self.relay):
+            if out is not None:
+                out.watch_state(self._on_output)
+        # the replay buffers fill on first use; do it now, outside the
+        # measured run, instead of every device doing it in the first period
+        if self.accel:
+            self.accel.read_all()
+        if self.dht:
+            self.dht.measure()
+        self._now = 0.0
+
+    def _on_output(self, name, change):
+        self.emit(self.id, name, {change[0]: change[1]}, self._now)
+
+    def _sample(self, name):
+        if name == "accelerometer":
+            data = self.accel.read_all()
+            self.emit(self.id, name, {"accel": data["accel"], "gyro": data["gyro"]}, self._now)
+        elif name == "dht":
+            self.dht.measure()
+            self.emit(self.id, name, {"temperature": self.dht.temperature(),
+                                      "humidity": self.dht.humidity()}, self._now)
+        elif name == "switch":
+            self.switch.set_simulated_state(not self.switch.read())
+            self.emit(self.id, name, {"state": self.switch.read()}, self._now)
+        elif name == "led":
+            self.led.toggle()           # emits through watch_state
+        elif name == "relay":
+            self.relay.toggle()
+
+    async def run(self, until):
+        """Sample every peripheral on its own period until loop time `until`.
+        Start phases are randomised so a fleet does not fire in lockstep."""
+        loop = asyncio.get_running_loop()
+        periods = {k: 1.0 / v for k, v in self.rates.items() if v}
+        start = loop.time()
+        due = {k: start + self._rng.random() * p for k, p in periods.items()}
+        while True:
+            name = min(due, key=due.get)
+            t = due[name]
+            if t >= until:
+                return
+            delay = t - loop.time()
+            # always yield, a device that is behind must not starve the rest
+            await asyncio.sleep(delay if delay > 0 else 0)
+            self._now = t
+            self._sample(name)
+            due[name] = t + periods[name]
@@ -0,0 +1,182 @@
+# runner.py
+# Runs N virtual devices against an ingestion callable and measures it.
+#
+# Devices push events into one bounded queue; `workers` tasks take them out
+# and call the sink. Latency is measured from the time an event was due to
+# the time the sink returned, so both a slow sink and an overloaded event
+# loop show up. A full queue drops the event (counted), like a board whose
+# uplink buffer overflows.
+
+import asyncio
+import importlib
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from .device import VirtualDevice
+from .stats import LatencyHistogram
+
+
+def load_sink(spec):
+    """"module:function" -> callable. The function may be async."""
+    mod, _, name = spec.partition(":")
+    return getattr(importlib.import_module(mod), name)
+
+
+def _expected(devices, rates):
+    return devices * sum(r for r in rates.values() if r)
+
+
+async def run_fleet(devices, *, duration=10.0, rates=None, sink=None,
+                    workers=8, queue_size=10000, seed=0, first_id=0,
+                    service_ms=0.0):
+    """
+    Run `devices` virtual devices for `duration` seconds on the current
+    event loop. sink(event) receives {"device", "peripheral", "update", "t"}
+    dicts; it may be a coroutine function. service_ms adds a fixed
+    asynchronous delay per event, a stand-in for the network round trip of
+    a real ingestion endpoint.
+    Returns a result dict (see summarize()).
+    """
+    loop = asyncio.get_running_loop()
+    queue = asyncio.Queue(queue_size)
+    hist = LatencyHistogram()
+    counts = {"emitted": 0, "delivered": 0, "dropped": 0, "errors": 0}
+    is_async = sink is not None and asyncio.iscoroutinefunction(sink)
+
+    def emit(device_id, peripheral, update, due):
+        counts["emitted"] += 1
+        try:
+            queue.put_nowait({"device": device_id, "peripheral": peripheral,
+                              "update": update, "t": due})
+        except asyncio.QueueFull:
+            counts["dropped"] += 1
+
+    async def worker():
+        while True:
+            ev = await queue.get()
+            try:
+                if service_ms:
+                    await asyncio.sleep(service_ms / 1000)
+                if is_async:
+                    await sink(ev)
+                elif sink is not None:
+                    sink(ev)
+                counts["delivered"] += 1
+                hist.add((loop.time() - ev["t"]) * 1e6)
+            except Exception:
+                counts["errors"] += 1
+            finally:
+                queue.task_done()
+
+    fleet = [VirtualDevice(first_id + i, emit, rates, seed)
+             for i in range(devices)]
+    rates = fleet[0].rates if fleet else {}
+    pool = [asyncio.create_task(worker()) for _ in range(workers)]
+    t0 = time.perf_counter()
+    until = loop.time() + duration
+    await asyncio.gather(*(d.run(until) for d in fleet))
+    # let the sink drain what is queued, but do not wait forever
+    try:
+        await asyncio.wait_for(queue.join(), timeout=max(1.0, duration))
+    except asyncio.TimeoutError:
+        pass
+    elapsed = time.perf_counter() - t0
+    for w in pool:
+        w.cancel()
+    await asyncio.gather(*pool, return_exceptions=True)
+    counts["backlog"] = queue.qsize()
+    return {"devices": devices, "duration_s": duration, "elapsed_s": elapsed,
+            "offered_eps": _expected(devices, rates), "counts": counts,
+            "hist": hist}
+
+
+def summarize(result):
+    c = result["counts"]
+    out = {
+        "devices": result["devices"],
+        "offered_eps": round(result["offered_eps"], 1),
+        "throughput_eps": round(c["delivered"] / result["elapsed_s"], 1),
+        "emitted": c["emitted"],
+        "delivered": c["delivered"],
+        "dropped": c["dropped"],
+        "errors": c["errors"],
+        "backlog": c.get("backlog", 0),
+        "elapsed_s": round(result["elapsed_s"], 3),
+    }
+    out.update(result["hist"].summary())
+    return out
+
+
+def merge(results):
+    """Combine the per-process results of one run."""
+    hist = LatencyHistogram()
+    counts = {"emitted": 0, "delivered": 0, "dropped": 0, "errors": 0, "backlog": 0}
+    for r in results:
+        hist.merge(r["hist"])
+        for k in counts:
+            counts[k] += r["counts"].get(k, 0)
+    return {"devices": sum(r["devices"] for r in results),
+            "duration_s": results[0]["duration_s"],
+            "elapsed_s": max(r["elapsed_s"] for r in results),
+            "offered_eps": sum(r["offered_eps"] for r in results),
+            "counts": counts, "hist": hist}
+
+
+def _process_main(devices, first_id, kwargs, sink_spec):
+    sink = load_sink(sink_spec) if sink_spec else None
+    return asyncio.run(run_fleet(devices, first_id=first_id, sink=sink, **kwargs))
+
+
+def run(devices, *, processes=1, sink=None, **kwargs):
+    """
+    Blocking entry point. processes=1 runs everything on one event loop;
+    processes>1 splits the devices over a process pool, one loop each, and
+    merges the results. With processes>1 the sink must be a "module:function"
+    spec so the workers can import it.
+    Returns summarize()'d results.
+    """
+    if processes <= 1:
+        if isinstance(sink, str):
+            sink = load_sink(sink)
+        return summarize(asyncio.run(run_fleet(devices, sink=sink, **kwargs)))
+    if sink is not None and not isinstance(sink, str):
+        raise ValueError("with processes > 1 the sink must be a 'module:function' spec")
+    share, extra = divmod(devices, processes)
+    jobs = []
+    first = 0
+    with ProcessPoolExecutor(processes) as ex:
+        for i in range(processes):
+            n = share + (1 if i < extra else 0)
+            if n:
+                jobs.append(ex.submit(_process_main, n, first, kwargs, sink))
+            first += n
+        return summarize(merge([j.result() for j in jobs]))
+
+
+def saturated(summary, *, p99_ms=250.0, min_ratio=0.95):
+    """Ingestion counts as saturated when it drops events, falls below
+    min_ratio of the offered rate, or p99 latency exceeds p99_ms."""
+    return (summary["dropped"] > 0 or summary["errors"] > 0 or
+            summary["throughput_eps"] < summary["offered_eps"] * min_ratio or
+            summary["p99_ms"] > p99_ms)
+
+
+def ramp(start=10, stop=10000, factor=2.0, *, p99_ms=250.0, min_ratio=0.95,
+         report=None, **kwargs):
+    """
+    Run growing fleets (start, start*factor, ... up to stop) until the
+    ingestion path saturates. Returns (steps, first saturated device count
+    or None). report(summary) is called after each step.
+    """
+    steps = []
+    n = start
+    while n <= stop:
+        s = run(int(n), **kwargs)
+        s["saturated"] = saturated(s, p99_ms=p99_ms, min_ratio=min_ratio)
+        steps.append(s)
+        if report:
+            report(s)
+        if s["saturated"]:
+            return steps, int(n)
+        n = max(n + 1, n * factor)
+    return steps, None
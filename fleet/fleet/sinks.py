@@ -0,0 +1,17 @@
+# sinks.py
+# Reference sinks for trying the runner without a backend.
+
+import json
+
+
+def null(event):
+    """Accepts and discards the event."""
+
+
+def to_json(event):
+    """Serialises the event, roughly the cost of handing it to a transport."""
+    json.dumps(event)
+
+
+async def async_null(event):
+    pass
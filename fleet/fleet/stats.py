@@ -0,0 +1,61 @@
+# stats.py
+# Latency histogram with log-spaced buckets: constant memory per worker,
+# cheap to record and mergeable across processes.
+
+import math
+
+_PER_DECADE = 20
+_MIN_US = 1.0
+_DECADES = 8                     # 1 us .. 100 s
+_N = _PER_DECADE * _DECADES + 2
+
+
+class LatencyHistogram:
+    def __init__(self):
+        self.counts = [0] * _N
+        self.n = 0
+        self.total_us = 0.0
+        self.max_us = 0.0
+
+    def add(self, us):
+        self.n += 1
+        self.total_us += us
+        if us > self.max_us:
+            self.max_us = us
+        if us < _MIN_US:
+            i = 0
+        else:
+            i = min(_N - 1, 1 + int(math.log10(us / _MIN_US) * _PER_DECADE))
+        self.counts[i] += 1
+
+    def merge(self, other):
+        for i, c in enumerate(other.counts):
+            self.counts[i] += c
+        self.n += other.n
+        self.total_us += other.total_us
+        self.max_us = max(self.max_us, other.max_us)
+        return self
+
+    def percentile(self, p):
+        """Upper edge of the bucket holding the p-th percentile, in us."""
+        if not self.n:
+            return 0.0
+        rank = p / 100.0 * self.n
+        seen = 0
+        for i, c in enumerate(self.counts):
+            seen += c
+            if seen >= rank and c:
+                if i == 0:
+                    return _MIN_US
+                return min(self.max_us, _MIN_US * 10 ** (i / _PER_DECADE))
+        return self.max_us
+
+    def summary(self):
+        return {
+            "n": self.n,
+            "mean_ms": round(self.total_us / self.n / 1000, 3) if self.n else 0.0,
+            "p50_ms": round(self.percentile(50) / 1000, 3),
+            "p95_ms": round(self.percentile(95) / 1000, 3),
+            "p99_ms": round(self.percentile(99) / 1000, 3),
+            "max_ms": round(self.max_us / 1000, 3),
+        }
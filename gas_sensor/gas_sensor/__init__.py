@@ -1 +1,2 @@
 from .driver import GasSensor
+from .analog import AnalogGasSensor
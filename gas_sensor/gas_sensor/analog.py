@@ -0,0 +1,186 @@
+# analog.py
+# MQ-style gas sensor read through its analog output (AO) instead of the
+# on-board comparator (DO).
+#
+# Each sample averages `oversample` ADC reads. An EWMA baseline follows the
+# clean-air level, so heater warm-up and slow drift do not count as gas.
+# The level above the baseline is scaled to ppm. Events fire only when that
+# level crosses on_ppm (rising) or off_ppm (falling) and stays there for
+# hold_ms, so noise around one threshold cannot produce an event storm.
+
+import machine
+from time import ticks_ms, ticks_us, ticks_diff
+import uasyncio as asyncio
+from logger import get_logger
+
+_log = get_logger("gas")
+
+
+class AnalogGasSensor:
+    """
+    watch_state(callback) starts a sampling loop at rate_hz and calls
+        callback("gas", {"detected": bool, "ppm": float})
+    on every confirmed transition. A callback passed to the constructor
+    waits for init_watch(), which needs a running event loop.
+
+    ppm_per_count converts read_u16 counts above the baseline to ppm and has
+    to be calibrated for the sensor and gas; the default only gives a
+    proportional reading.
+
+    During the first warmup_s the baseline follows the signal quickly and
+    no events fire. Afterwards it adapts with a time constant of
+    baseline_tau_s, and only while the reading is below off_ppm, so an
+    exposure is not learned as the new clean-air level.
+    """
+
+    def __init__(self, pin_num, *, rate_hz=10, oversample=16,
+                 on_ppm=200.0, off_ppm=150.0, hold_ms=2000,
+                 ppm_per_count=0.01, baseline_tau_s=600, warmup_s=60,
+                 watch_state=None):
+        if off_ppm > on_ppm:
+            raise ValueError("off_ppm must not exceed on_ppm")
+        self._adc = machine.ADC(machine.Pin(pin_num))
+        if hasattr(self._adc, "atten"):
+            self._adc.atten(machine.ADC.ATTN_11DB)     # full 0..3.3 V range
+        self._period_ms = max(1, 1000 // rate_hz)
+        self._oversample = max(1, oversample)
+        self._on = on_ppm
+        self._off = off_ppm
+        self._hold_ms = hold_ms
+        self._scale = ppm_per_count
+        # EWMA weight per sample for a time constant of baseline_tau_s
+        self._alpha = min(1.0, self._period_ms / (baseline_tau_s * 1000))
+        self._warmup_ms = int(warmup_s * 1000)
+        self._start_ms = ticks_ms()
+
+        self._baseline = None
+        self._raw = 0
+        self._ppm = 0.0
+        self._detected = False
+        self._cross_ms = None          # when the reading first crossed, unconfirmed
+
+        self._watch_state = watch_state
+        self._saved_watch_state = watch_state
+        self._watch_task = None
+        self._streams = []
+
+        self.samples = 0
+        self.transitions = 0
+        self.rejected = 0              # crossings that did not last hold_ms
+
+    # ───────── readings ─────────
+    def read_raw(self):
+        """Average of `oversample` ADC reads, 0..65535."""
+        read = self._adc.read_u16
+        total = 0
+        for _ in range(self._oversample):
+            total += read()
+        return total // self._oversample
+
+    def raw(self):
+        return self._raw
+
+    def baseline(self):
+        return self._baseline
+
+    def ppm(self):
+        return self._ppm
+
+    def detected(self):
+        return self._detected
+
+    def warming_up(self):
+        return ticks_diff(ticks_ms(), self._start_ms) < self._warmup_ms
+
+    def update(self):
+        """Take one sample and run the threshold logic; returns ppm."""
+        raw = self.read_raw()
+        now = ticks_ms()
+        self._raw = raw
+        self.samples += 1
+        base = self._baseline
+        if base is None:
+            base = raw
+        elif self.warming_up():
+            base += (raw - base) * 0.25
+        elif not self._detected and self._ppm < self._off:
+            base += (raw - base) * self._alpha
+        self._baseline = base
+        ppm = raw - base
+        ppm = ppm * self._scale if ppm > 0 else 0.0
+        self._ppm = ppm
+
+        if self.warming_up():
+            return ppm
+        # hysteresis: on above on_ppm, back off only below off_ppm
+        want = ppm > self._off if self._detected else ppm >= self._on
+        if want == self._detected:
+            if self._cross_ms is not None:
+                self.rejected += 1
+                self._cross_ms = None
+        elif self._cross_ms is None:
+            self._cross_ms = now
+        elif ticks_diff(now, self._cross_ms) >= self._hold_ms:
+            self._cross_ms = None
+            self._set(want)
+        return ppm
+
+    def _set(self, detected):
+        self._detected = detected
+        self.transitions += 1
+        t = ticks_us()
+        for s in self._streams:
+            s.push(int(detected), t)
+        if self._watch_state:
+            try:
+                self._watch_state("gas", {"detected": detected,
+                                          "ppm": round(self._ppm, 1)})
+            except Exception as exc:
+                _log.error("watch_state error: %s", exc)
+
+    def stats(self):
+        return {
+            "samples": self.samples,
+            "transitions": self.transitions,
+            "rejected": self.rejected,
+            "raw": self._raw,
+            "baseline": self._baseline,
+            "ppm": self._ppm,
+        }
+
+    # ───────── watching ─────────
+    def watch_state(self, fn):
+        """Set the callback and start the sampling loop."""
+        if not callable(fn):
+            raise TypeError("watch_state must be callable")
+        self._watch_state = fn
+        self._saved_watch_state = fn
+        self.init_watch()
+
+    def init_watch(self):
+        """Start (or resume) the sampling loop."""
+        self._watch_state = self._saved_watch_state
+        if self._watch_task is None:
+            self._watch_task = asyncio.create_task(self._watch_loop())
+
+    def deinit_watch(self):
+        """Stop the sampling loop."""
+        self._watch_task = None
+
+    def events(self, size=8, policy="coalesce"):
+        """gpio_hub.EventStream of (detected, ticks_us) transitions. Does
+        not start sampling by itself; call init_watch() or update()."""
+        from gpio_hub import EventStream
+        s = EventStream(size, policy, self._streams.remove)
+        self._streams.append(s)
+        return s
+
+    async def _watch_loop(self):
+        me = self._watch_task
+        # a loop left over from before deinit_watch()/init_watch() exits
+        while self._watch_task is me:
+            try:
+                self.update()
+            except Exception as exc:
+                _log.error("sample error: %s", exc)
+            await asyncio.sleep_ms(self._period_ms)
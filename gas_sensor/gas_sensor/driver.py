@@ -1,32 +1,67 @@
-import time
-
 from .edge_detector import EdgeDetector
 import machine
+from time import ticks_us
+import uasyncio as asyncio
+from logger import get_logger
+
+_log = get_logger("gas")
 
 class GasSensor(EdgeDetector):
     """
-    Basic push-button (normally open, pulled HIGH).
-    Adds debounce and inverts logic so True = pressed.
+    Gas module read through its comparator output (DO).
+    Calls watch_state("gas", {"detected": True/False}) on every change.
+    MQ boards pull DO low when the threshold pot is exceeded, hence
+    active_low=True; use AnalogGasSensor on the AO pin for concentration.
+
+    Debounce reports the first edge of a burst. A comparator chattering
+    around its threshold may settle on an edge that debounce dropped, so
+    after such a drop the pin is read again once debounce_ms has passed
+    and the state re-reported if it differs (needs a running event loop).
     """
-    PRESSED   = True
-    RELEASED  = False
+    DETECTED = True
+    CLEAR    = False
+    # earlier names, kept for existing callers
+    PRESSED  = DETECTED
+    RELEASED = CLEAR
 
     def __init__(self, pin_num, *,
                  pull=machine.Pin.PULL_UP,
                  debounce_ms=20,
+                 active_low=True,
+                 hub=None,
                  ):
-        self._debounce_ms = debounce_ms
-        self._last_evt_ms = 0
-        super().__init__(pin_num, pull=pull)          # rising + falling IRQ
-    
-    def _dispatch(self, level):
-        now = time.ticks_ms()
-        if time.ticks_diff(now, self._last_evt_ms) < self._debounce_ms:
-            return  # Ignore bouncing
-        self._last_evt_ms = now
+        self._active = 0 if active_low else 1
+        self._settle_task = None
+        # rising + falling IRQ, debounced on the edge timestamps
+        super().__init__(pin_num, pull=pull, debounce_ms=debounce_ms, hub=hub)
 
+    def detected(self):
+        return self.pin.value() == self._active
+
+    def _edge(self, level, t):
+        dropped = self.debounced
+        EdgeDetector._edge(self, level, t)
+        if self.debounced != dropped and self._settle_task is None:
+            self._settle_task = asyncio.create_task(self._settle())
+
+    async def _settle(self):
+        await asyncio.sleep_ms(self._debounce_ms)
+        self._settle_task = None
+        level = self.pin.value()
+        if (level == self._active) == self._last_level:
+            return
+        t = ticks_us()
+        for s in self._streams:
+            s.push(level, t)
+        self._dispatch(level)
+
+    def _dispatch(self, level):
+        detected = level == self._active
+        if detected == self._last_level:
+            return
+        self._last_level = detected
         if self._watch_state:
             try:
-                self._watch_state("gas", {"detected": True})
+                self._watch_state("gas", {"detected": detected})
             except Exception as exc:
-                print("PushButton watch_state error:", exc)
\ No newline at end of file
+                _log.error("watch_state error: %s", exc)
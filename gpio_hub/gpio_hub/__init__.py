@@ -0,0 +1,2 @@
+from .hub import GPIOHub, get_hub
+from .stream import EventStream, DROP_OLDEST, COALESCE
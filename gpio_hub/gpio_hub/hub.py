@@ -0,0 +1,203 @@
+# hub.py
+# One IRQ path and one scheduled dispatcher for many GPIO inputs.
+#
+# Every registered pin gets a tiny hard IRQ handler that writes
+# (ticks_us, slot, level) into a ring shared by all pins. The first edge
+# after a drain schedules the dispatcher; later edges only append. So a
+# board with a dozen buttons, sensors and encoders holds at most one entry
+# in the MicroPython schedule queue instead of one per driver.
+#
+#     hub = get_hub()
+#     hub.register(14, on_edge)          # on_edge(level, t_us)
+#     btn = PushButton(27, hub=hub)      # drivers take hub= too
+#     print(hub.stats())
+
+import machine
+import micropython
+import time
+from array import array
+from logger import get_logger
+
+_log = get_logger("gpio_hub")
+
+_MAX_SLOTS = 255                      # slot ids are stored in a bytearray
+
+
+class GPIOHub:
+    """
+    ring_size (a power of two) is shared by all pins; size it for the
+    longest burst expected between two dispatcher runs. hard=False installs
+    soft IRQ handlers, for ports without hard IRQ support.
+    """
+
+    def __init__(self, ring_size=128, *, hard=True):
+        if ring_size & (ring_size - 1):
+            raise ValueError("ring_size must be a power of two")
+        self._hard = hard
+        self._ring_t = array('L', [0] * ring_size)
+        self._ring_s = bytearray(ring_size)
+        self._ring_l = bytearray(ring_size)
+        self._mask = ring_size - 1
+        self._head = 0
+        self._tail = 0
+        self._pending = False
+        self._dispatch_ref = self._dispatch  # allocated once, not per IRQ
+
+        # per slot; grown only in register(), never from the IRQ
+        self._pins = []
+        self._subs = []
+        self._counts = array('L')
+        self._drops = array('L')
+        self._seen = array('L')        # counts at the previous stats() call
+        self._stats_ms = time.ticks_ms()
+
+        self.events = 0                # events fanned out by the dispatcher
+        self.overflows = 0             # events lost to a full ring
+        self.sched_fails = 0           # schedule queue full, retried on next edge
+        self.errors = 0                # subscriber exceptions
+
+        micropython.alloc_emergency_exception_buf(100)
+
+    # ───────── registration ─────────
+    def register(self, pin, callback, *, pull=None,
+                 trigger=machine.Pin.IRQ_RISING | machine.Pin.IRQ_FALLING):
+        """
+        Subscribe callback(level, t_us) to edges on `pin` (a Pin or a pin
+        number). A pin registered twice keeps a single IRQ and fans out to
+        both subscribers. Returns the Pin.
+        """
+        if not callable(callback):
+            raise TypeError("callback must be callable")
+        if not isinstance(pin, machine.Pin):
+            pin = machine.Pin(pin, machine.Pin.IN, pull)
+        slot = self._slot(pin)
+        if slot is None:
+            slot = len(self._pins)
+            if slot >= _MAX_SLOTS:
+                raise ValueError("too many pins on one hub")
+            self._pins.append(pin)
+            self._subs.append([])
+            self._counts.append(0)
+            self._drops.append(0)
+            self._seen.append(0)
+            pin.irq(trigger=trigger, handler=self._make_handler(slot),
+                    hard=self._hard)
+        self._subs[slot].append(callback)
+        return pin
+
+    def unregister(self, pin, callback=None):
+        """Drop one subscriber (or all of them). The IRQ is released when a
+        pin has none left; its slot and counters are kept."""
+        if not isinstance(pin, machine.Pin):
+            pin = machine.Pin(pin)
+        slot = self._slot(pin)
+        if slot is None:
+            return
+        subs = self._subs[slot]
+        if callback is None:
+            subs.clear()
+        elif callback in subs:
+            subs.remove(callback)
+        if not subs:
+            self._pins[slot].irq(handler=None)
+
+    def _slot(self, pin):
+        # Pin(n) hands back the same object for the same GPIO
+        for i, p in enumerate(self._pins):
+            if p is pin:
+                return i
+        return None
+
+    def _make_handler(self, slot):
+        # the closure is built here, once per pin; the IRQ only calls it
+        def handler(pin):
+            self._push(slot, pin)
+        return handler
+
+    # ───────── IRQ side ─────────
+    def _push(self, slot, pin):
+        # hard IRQ: no allocation, only array/int stores
+        h = self._head
+        nxt = (h + 1) & self._mask
+        if nxt == self._tail:
+            self.overflows += 1
+            self._drops[slot] += 1
+        else:
+            self._ring_t[h] = time.ticks_us()
+            self._ring_s[h] = slot
+            self._ring_l[h] = pin.value()
+            self._head = nxt
+        if not self._pending:
+            self._pending = True
+            try:
+                micropython.schedule(self._dispatch_ref, 0)
+            except RuntimeError:
+                # the event stays in the ring; the next edge or poll() gets it
+                self._pending = False
+                self.sched_fails += 1
+
+    # ───────── dispatcher ─────────
+    def _dispatch(self, _):
+        # cleared first: an edge arriving while subscribers run schedules again
+        self._pending = False
+        tail = self._tail
+        while tail != self._head:
+            t = self._ring_t[tail]
+            slot = self._ring_s[tail]
+            level = self._ring_l[tail]
+            tail = (tail + 1) & self._mask
+            self._tail = tail
+            self.events += 1
+            self._counts[slot] += 1
+            for cb in self._subs[slot]:
+                try:
+                    cb(level, t)
+                except Exception as exc:
+                    self.errors += 1
+                    _log.error("subscriber error on %s: %s", self._pins[slot], exc)
+
+    def poll(self):
+        """Run the dispatcher now (e.g. from a main loop after sched_fails)."""
+        self._dispatch(0)
+
+    def pending(self):
+        return (self._head - self._tail) & self._mask
+
+    # ───────── stats ─────────
+    def stats(self):
+        """
+        Totals plus one entry per pin: events, drops and rate_hz, the event
+        rate since the previous stats() call.
+        """
+        now = time.ticks_ms()
+        dt = time.ticks_diff(now, self._stats_ms)
+        self._stats_ms = now
+        pins = {}
+        for i, p in enumerate(self._pins):
+            n = self._counts[i]
+            pins[str(p)] = {
+                "events": n,
+                "drops": self._drops[i],
+                "rate_hz": (n - self._seen[i]) * 1000 / dt if dt > 0 else 0.0,
+                "subscribers": len(self._subs[i]),
+            }
+            self._seen[i] = n
+        return {
+            "events": self.events,
+            "pending": self.pending(),
+            "overflows": self.overflows,
+            "sched_fails": self.sched_fails,
+            "errors": self.errors,
+            "pins": pins,
+        }
+
+
+_hub = None
+
+
+def get_hub(ring_size=128):
+    """The board-wide hub, created on first use."""
+    global _hub
+    if _hub is None:
+        _hub = GPIOHub(ring_size)
+    return _hub
@@ -0,0 +1,109 @@
+# stream.py
+# Bounded event buffer that an asyncio task can `async for` over.
+#
+# Drivers push (value, ticks_us) from their dispatch context (a scheduled
+# callback, never a hard IRQ) and set a ThreadSafeFlag; the consumer sleeps
+# on the flag, so waiting costs nothing and no task is created per event:
+#
+#     async for value, t_us in button.events():
+#         ...
+
+import uasyncio as asyncio
+from array import array
+
+DROP_OLDEST = "drop_oldest"
+COALESCE = "coalesce"
+
+
+class EventStream:
+    """
+    size events are buffered. When the consumer falls behind:
+        policy="drop_oldest"  discard the oldest event (counted in `dropped`)
+        policy="coalesce"     overwrite the newest event, so the consumer
+                              always sees the latest value (counted in
+                              `coalesced`); right for state-like inputs
+    Values must be ints (levels, positions). One consumer per stream; call
+    events() again for a second one.
+    """
+
+    def __init__(self, size=16, policy=DROP_OLDEST, on_close=None):
+        if policy not in (DROP_OLDEST, COALESCE):
+            raise ValueError("policy must be 'drop_oldest' or 'coalesce'")
+        if size < 1:
+            raise ValueError("size must be at least 1")
+        self._coalesce = policy == COALESCE
+        self._val = array('l', [0] * size)
+        self._t = array('L', [0] * size)
+        self._size = size
+        self._head = 0                 # next slot to write
+        self._count = 0
+        self._flag = asyncio.ThreadSafeFlag()
+        self._on_close = on_close
+        self.closed = False
+
+        self.pushed = 0
+        self.dropped = 0
+        self.coalesced = 0
+
+    def __len__(self):
+        return self._count
+
+    def push(self, value, t_us):
+        if self.closed:
+            return
+        self.pushed += 1
+        size = self._size
+        if self._count == size:
+            if self._coalesce:
+                last = (self._head - 1) % size
+                self._val[last] = value
+                self._t[last] = t_us
+                self.coalesced += 1
+                self._flag.set()
+                return
+            self.dropped += 1          # oldest slot is the one overwritten
+            self._count -= 1
+        h = self._head
+        self._val[h] = value
+        self._t[h] = t_us
+        self._head = (h + 1) % size
+        self._count += 1
+        self._flag.set()
+
+    def get_nowait(self):
+        """(value, ticks_us) of the oldest event, or None when empty."""
+        if not self._count:
+            return None
+        i = (self._head - self._count) % self._size
+        self._count -= 1
+        return self._val[i], self._t[i]
+
+    async def get(self):
+        """Wait for the next event; None once the stream is closed and empty."""
+        while not self._count:
+            if self.closed:
+                return None
+            await self._flag.wait()
+        return self.get_nowait()
+
+    def close(self):
+        """End the iteration; the producer stops pushing into this stream."""
+        if self.closed:
+            return
+        self.closed = True
+        if self._on_close:
+            self._on_close(self)
+        self._flag.set()
+
+    def stats(self):
+        return {"buffered": self._count, "pushed": self.pushed,
+                "dropped": self.dropped, "coalesced": self.coalesced}
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        ev = await self.get()
+        if ev is None:
+            raise StopAsyncIteration
+        return ev
@@ -0,0 +1,113 @@
+# host_emu
+# Runs the drivers in this repository on a normal (CPython) host.
+#
+# install() registers stand-ins for the MicroPython modules the drivers
+# import (machine, micropython, uasyncio, framebuf, esp), points the time
+# module's ticks_*/sleep_* at the board clock and puts every driver package
+# of the repository on sys.path:
+#
+#     import host_emu
+#     board = host_emu.install()
+#     mpu = board.attach_i2c(host_emu.FakeMPU6050())
+#
+#     from accelerometer import MPU6050
+#     print(MPU6050().read_accel_data(), board.stats)
+#
+# Hardware costs come from a TimingModel: I2C transfers take time scaled by
+# bytes and bus clock, IRQs add latency, DHT reads take ~5 ms. These are
+# charged to the board clock rather than slept, so ticks_us() deltas show
+# the modeled on-device time while the host runs at full speed.
+#
+# Not a device package: no package.json, not installed with mip.
+
+import builtins
+import os
+import sys
+import time
+
+from . import state
+from .board import Board, Clock, TimingModel, TICKS_PERIOD
+from .devices import (I2CDevice, FakeMPU6050, FakeSSD1306, FakeDHT22,
+                      FakeHCSR04, FakeQuadrature)
+
+_MODULES = ("machine", "micropython", "uasyncio", "framebuf", "esp")
+
+_TICKS_MASK = TICKS_PERIOD - 1
+_TICKS_HALF = TICKS_PERIOD // 2
+
+
+def ticks_us():
+    return state.board.clock.now_us() & _TICKS_MASK
+
+
+def ticks_ms():
+    return (state.board.clock.now_us() // 1000) & _TICKS_MASK
+
+
+def ticks_cpu():
+    return ticks_us()
+
+
+def ticks_add(ticks, delta):
+    return (ticks + delta) & _TICKS_MASK
+
+
+def ticks_diff(a, b):
+    return ((a - b + _TICKS_HALF) & _TICKS_MASK) - _TICKS_HALF
+
+
+def sleep_ms(ms):
+    state.board.clock.charge(ms * 1000)
+
+
+def sleep_us(us):
+    state.board.clock.charge(us)
+
+
+def repo_root():
+    return os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+def driver_paths(root=None):
+    """Directories holding a driver package (<dir>/<dir>/__init__.py)."""
+    root = root or repo_root()
+    out = []
+    for name in sorted(os.listdir(root)):
+        if os.path.isfile(os.path.join(root, name, name, "__init__.py")):
+            out.append(os.path.join(root, name))
+    return out
+
+
+def install(*, timing=None, realtime=True, schedule_depth=8,
+            auto_schedule=True, paths=True):
+    """Install the stand-in modules on a fresh board and return the board.
+    Call before importing any driver."""
+    from . import machine, micropython, uasyncio, framebuf, esp
+
+    reset(timing=timing, realtime=realtime, schedule_depth=schedule_depth,
+          auto_schedule=auto_schedule)
+    mods = {"machine": machine, "micropython": micropython,
+            "uasyncio": uasyncio, "framebuf": framebuf, "esp": esp}
+    sys.modules.update(mods)
+    sys.modules["utime"] = time
+    for name in ("ticks_us", "ticks_ms", "ticks_cpu", "ticks_add",
+                 "ticks_diff", "sleep_ms", "sleep_us"):
+        setattr(time, name, globals()[name])
+    builtins.const = micropython.const
+    if paths:
+        for p in driver_paths():
+            if p not in sys.path:
+                sys.path.append(p)
+    return state.board
+
+
+def reset(**kwargs):
+    """Replace the board: no pins, devices or counters survive."""
+    from .uasyncio import drop_deferred
+    drop_deferred()
+    state.board = Board(**kwargs)
+    return state.board
+
+
+def board():
+    return state.board
@@ -0,0 +1,131 @@
+# board.py
+# Shared state of the emulated board: clock, timing model, pin registry,
+# attached fake devices, the micropython.schedule queue and the counters the
+# benchmarks read.
+
+import time as _time
+
+_perf_ns = _time.perf_counter_ns
+
+TICKS_PERIOD = 1 << 30
+_TICKS_MAX = TICKS_PERIOD - 1
+_TICKS_HALF = TICKS_PERIOD // 2
+
+
+class Clock:
+    """
+    Microsecond clock behind time.ticks_*().
+
+    realtime=True:  wall time plus every modeled cost charged so far.
+    realtime=False: only modeled costs; time stands still otherwise, which
+                    makes runs fully deterministic.
+    Modeled costs (bus transfers, sleep_ms/sleep_us) never really sleep.
+    """
+
+    def __init__(self, realtime=True):
+        self.realtime = realtime
+        self._t0 = _perf_ns()
+        self.offset_us = 0
+        self.charged_us = 0
+
+    def now_us(self):
+        t = self.offset_us
+        if self.realtime:
+            t += (_perf_ns() - self._t0) // 1000
+        return t
+
+    def advance(self, us):
+        self.offset_us += int(us)
+
+    def charge(self, us):
+        us = int(us)
+        self.offset_us += us
+        self.charged_us += us
+
+
+class TimingModel:
+    """Modeled cost of hardware operations, in microseconds."""
+
+    def __init__(self, *, i2c_overhead_us=15, irq_latency_us=10,
+                 gpio_us=1, pwm_write_us=1, dht_read_us=4800):
+        self.i2c_overhead_us = i2c_overhead_us
+        self.irq_latency_us = irq_latency_us
+        self.gpio_us = gpio_us
+        self.pwm_write_us = pwm_write_us
+        self.dht_read_us = dht_read_us
+
+    def i2c_us(self, nbytes, freq):
+        # address byte + payload, 9 clocks per byte (8 data + ACK)
+        return self.i2c_overhead_us + (nbytes + 1) * 9 * 1000000 // freq
+
+
+class Board:
+    def __init__(self, *, timing=None, realtime=True, schedule_depth=8,
+                 auto_schedule=True):
+        self.clock = Clock(realtime)
+        self.timing = timing or TimingModel()
+        self.pins = {}
+        self.i2c_buses = {}        # (scl, sda) -> {addr: device}
+        self.dht = {}              # pin id -> FakeDHT22
+        self.schedule_depth = schedule_depth
+        self.auto_schedule = auto_schedule
+        self._queue = []
+        self.stats = {}
+        self.reset_stats()
+
+    # ───────── counters ─────────
+    def reset_stats(self):
+        self.stats = {
+            "i2c_transactions": 0,
+            "i2c_bytes": 0,
+            "i2c_errors": 0,
+            "gpio_reads": 0,
+            "gpio_writes": 0,
+            "irqs": 0,
+            "pwm_writes": 0,
+            "dht_reads": 0,
+            "scheduled": 0,
+            "schedule_overflows": 0,
+        }
+
+    def count(self, key, n=1):
+        self.stats[key] += n
+
+    # ───────── devices ─────────
+    def attach_i2c(self, device, scl=22, sda=21):
+        self.i2c_buses.setdefault((scl, sda), {})[device.addr] = device
+        device.board = self
+        return device
+
+    def i2c_devices(self, scl, sda):
+        return self.i2c_buses.setdefault((scl, sda), {})
+
+    def attach_dht(self, device):
+        self.dht[device.pin] = device
+        device.board = self
+        return device
+
+    def pin(self, id):
+        """The emulated Pin for id (created as an input if unused)."""
+        from .machine import Pin
+        return self.pins[id] if id in self.pins else Pin(id, Pin.IN)
+
+    # ───────── micropython.schedule ─────────
+    def schedule(self, func, arg):
+        if len(self._queue) >= self.schedule_depth:
+            self.stats["schedule_overflows"] += 1
+            raise RuntimeError("schedule queue full")
+        self._queue.append((func, arg))
+        self.stats["scheduled"] += 1
+
+    def run_scheduled(self):
+        """Run pending scheduled callbacks, as the VM does between opcodes."""
+        n = 0
+        while self._queue:
+            func, arg = self._queue.pop(0)
+            func(arg)
+            n += 1
+        return n
+
+    def pending(self):
+        return len(self._queue)
@@ -0,0 +1,392 @@
+# devices.py
+# Scriptable fake peripherals for the emulated board.
+#
+# I2C devices implement read(reg, n) / write(reg, data) for register access
+# and read_raw(n) / write_raw(data) for plain transfers. Values can be set
+# directly or produced by a `script` callable of the board time in us.
+
+import struct
+
+from . import state
+
+
+class I2CDevice:
+    def __init__(self, addr):
+        self.addr = addr
+        self.present = True
+        self.fail_next = 0          # next N transfers raise OSError(EIO)
+        self.board = None
+
+    def _now_us(self):
+        return (self.board or state.board).clock.now_us()
+
+    def read(self, reg, n):
+        return bytes(n)
+
+    def write(self, reg, data):
+        pass
+
+    def read_raw(self, n):
+        return bytes(n)
+
+    def write_raw(self, data):
+        if data:
+            self.write(data[0], data[1:])
+
+
+# ───────── MPU6050 ─────────
+
+_SMPLRT_DIV = 0x19
+_CONFIG = 0x1A
+_GYRO_CONFIG = 0x1B
+_ACCEL_CONFIG = 0x1C
+_FIFO_EN = 0x23
+_INT_ENABLE = 0x38
+_INT_STATUS = 0x3A
+_ACCEL_XOUT_H = 0x3B
+_USER_CTRL = 0x6A
+_PWR_MGMT_1 = 0x6B
+_FIFO_COUNTH = 0x72
+_FIFO_R_W = 0x74
+_WHO_AM_I = 0x75
+
+_FIFO_SIZE = 1024
+
+
+def _clamp16(v):
+    v = int(round(v))
+    return -32768 if v < -32768 else 32767 if v > 32767 else v
+
+
+class FakeMPU6050(I2CDevice):
+    """
+    Register-level MPU6050: live data registers, sample-rate driven FIFO with
+    overflow, and the data-ready / motion interrupt line.
+
+        mpu = board.attach_i2c(FakeMPU6050())
+        mpu.accel = (0.0, 0.0, 1.0)     # g
+        mpu.gyro = (1.5, 0.0, 0.0)      # deg/s
+        mpu.script = lambda t_us: (ax, ay, az, gx, gy, gz)
+    """
+
+    def __init__(self, addr=0x68, int_pin=None):
+        super().__init__(addr)
+        self.regs = bytearray(128)
+        self.regs[_WHO_AM_I] = 0x68
+        self.regs[_PWR_MGMT_1] = 0x40           # asleep after power-up
+        self.accel = (0.0, 0.0, 1.0)
+        self.gyro = (0.0, 0.0, 0.0)
+        self.temperature = 25.0
+        self.noise = None                        # callable() -> raw offset
+        self.script = None
+        self.fifo = bytearray()
+        self._fifo_t = None
+        self.int_pin = int_pin
+
+    def sample(self):
+        """Current (ax, ay, az, gx, gy, gz) in g and deg/s."""
+        if self.script is not None:
+            return tuple(self.script(self._now_us()))
+        return tuple(self.accel) + tuple(self.gyro)
+
+    def _raw(self):
+        ax, ay, az, gx, gy, gz = self.sample()
+        a_lsb = 16384.0 / (1 << ((self.regs[_ACCEL_CONFIG] >> 3) & 3))
+        g_lsb = 131.0 / (1 << ((self.regs[_GYRO_CONFIG] >> 3) & 3))
+        n = self.noise
+        words = [ax * a_lsb, ay * a_lsb, az * a_lsb,
+                 gx * g_lsb, gy * g_lsb, gz * g_lsb]
+        if n is not None:
+            words = [w + n() for w in words]
+        return [_clamp16(w) for w in words]
+
+    def _refresh(self):
+        ax, ay, az, gx, gy, gz = self._raw()
+        t = _clamp16((self.temperature - 36.53) * 340)
+        struct.pack_into(">7h", self.regs, _ACCEL_XOUT_H, ax, ay, az, t, gx, gy, gz)
+
+    # ───── FIFO ─────
+    def rate_hz(self):
+        base = 8000 if self.regs[_CONFIG] & 7 in (0, 7) else 1000
+        return base / (1 + self.regs[_SMPLRT_DIV])
+
+    def _fifo_on(self):
+        return self.regs[_USER_CTRL] & 0x40 and self.regs[_FIFO_EN]
+
+    def _frame(self):
+        en = self.regs[_FIFO_EN]
+        ax, ay, az, gx, gy, gz = self._raw()
+        words = []
+        if en & 0x08:
+            words += (ax, ay, az)
+        if en & 0x80:
+            words.append(_clamp16((self.temperature - 36.53) * 340))
+        if en & 0x40:
+            words.append(gx)
+        if en & 0x20:
+            words.append(gy)
+        if en & 0x10:
+            words.append(gz)
+        return struct.pack(">%dh" % len(words), *words)
+
+    def _update_fifo(self):
+        if not self._fifo_on():
+            self._fifo_t = None
+            return
+        now = self._now_us()
+        if self._fifo_t is None:
+            self._fifo_t = now
+            return
+        period = 1000000 / self.rate_hz()
+        n = int((now - self._fifo_t) / period)
+        if n <= 0:
+            return
+        self._fifo_t += n * period
+        frame = self._frame()
+        # anything beyond one FIFO's worth would be overwritten anyway
+        n = min(n, _FIFO_SIZE // len(frame) + 1)
+        self.fifo += frame * n
+        if len(self.fifo) > _FIFO_SIZE:
+            del self.fifo[:len(self.fifo) - _FIFO_SIZE]
+            self.regs[_INT_STATUS] |= 0x10
+            self._interrupt(0x10)
+
+    # ───── register access ─────
+    def read(self, reg, n):
+        self._update_fifo()
+        if reg == _FIFO_R_W:
+            out = bytes(self.fifo[:n])
+            del self.fifo[:n]
+            return out + bytes(n - len(out))
+        if reg == _FIFO_COUNTH:
+            self.regs[_FIFO_COUNTH] = len(self.fifo) >> 8
+            self.regs[_FIFO_COUNTH + 1] = len(self.fifo) & 0xFF
+        if reg <= 0x48 and reg + n > _ACCEL_XOUT_H:
+            self._refresh()
+        out = bytes(self.regs[reg:reg + n])
+        if reg <= _INT_STATUS < reg + n:
+            self.regs[_INT_STATUS] = 0          # cleared on read
+        return out
+
+    def write(self, reg, data):
+        self._update_fifo()
+        for i, b in enumerate(data):
+            r = reg + i
+            if r == _USER_CTRL and b & 0x04:
+                self.fifo = bytearray()
+                self._fifo_t = None
+                b &= ~0x04
+            if r == _PWR_MGMT_1 and b & 0x80:
+                self.__init__(self.addr, self.int_pin)
+                return
+            self.regs[r] = b
+        self._update_fifo()
+
+    # ───── interrupt line ─────
+    def _interrupt(self, bit):
+        if self.int_pin is None or not self.regs[_INT_ENABLE] & bit:
+            return
+        from .machine import Pin
+        self.regs[_INT_STATUS] |= bit
+        Pin(self.int_pin).pulse()
+
+    def data_ready(self):
+        """Latch a new sample and raise DATA_RDY if enabled."""
+        self._interrupt(0x01)
+
+    def motion(self):
+        """Raise the motion-detect interrupt if enabled."""
+        self._interrupt(0x40)
+
+
+# ───────── SSD1306 ─────────
+
+# commands followed by this many argument bytes
+_SSD1306_ARGS = {0x20: 1, 0x21: 2, 0x22: 2, 0x81: 1, 0x8D: 1, 0xA8: 1,
+                 0xD3: 1, 0xD5: 1, 0xD9: 1, 0xDA: 1, 0xDB: 1}
+
+
+class FakeSSD1306(I2CDevice):
+    """
+    SSD1306 in horizontal addressing mode: decodes the command stream and
+    writes data bytes into GDDRAM through the column/page window.
+    """
+
+    def __init__(self, addr=0x3C, width=128, height=64):
+        super().__init__(addr)
+        self.width = width
+        self.pages = height // 8
+        self.ram = bytearray(width * self.pages)
+        self.on = False
+        self.contrast = 0x7F
+        self.inverted = False
+        self.commands = 0
+        self.frames = 0
+        self._cmd = None
+        self._args = []
+        self._col = (0, width - 1)
+        self._page = (0, self.pages - 1)
+        self._x = 0
+        self._p = 0
+
+    def write_raw(self, data):
+        ctrl = data[0]
+        if ctrl & 0x40:
+            self._data(data[1:])
+        else:
+            for b in data[1:]:
+                self._command(b)
+
+    def _command(self, b):
+        self.commands += 1
+        if self._cmd is not None:
+            self._args.append(b)
+            if len(self._args) < _SSD1306_ARGS[self._cmd]:
+                return
+            cmd, args = self._cmd, self._args
+            self._cmd = None
+            self._args = []
+            if cmd == 0x21:
+                self._col = (args[0], args[1])
+                self._x = args[0]
+            elif cmd == 0x22:
+                self._page = (args[0], args[1])
+                self._p = args[0]
+            elif cmd == 0x81:
+                self.contrast = args[0]
+            return
+        if b in _SSD1306_ARGS:
+            self._cmd = b
+        elif b & 0xFE == 0xAE:
+            self.on = bool(b & 1)
+        elif b & 0xFE == 0xA6:
+            self.inverted = bool(b & 1)
+
+    def _data(self, data):
+        c0, c1 = self._col
+        p0, p1 = self._page
+        for b in data:
+            if self._x < self.width and self._p < self.pages:
+                self.ram[self._p * self.width + self._x] = b
+            self._x += 1
+            if self._x > c1:
+                self._x = c0
+                self._p += 1
+                if self._p > p1:
+                    self._p = p0
+        self.frames += 1
+
+    def pixel(self, x, y):
+        return (self.ram[(y >> 3) * self.width + x] >> (y & 7)) & 1
+
+    def lit(self):
+        """Number of pixels switched on."""
+        return sum(bin(b).count("1") for b in self.ram)
+
+
+# ───────── DHT22 ─────────
+
+class FakeDHT22:
+    """
+    DHT22 on a GPIO pin. Reads closer together than min_interval_ms return
+    a corrupted frame (bad checksum), like the real sensor.
+    """
+
+    def __init__(self, pin, temperature=21.5, humidity=45.0,
+                 min_interval_ms=2000):
+        self.pin = pin
+        self.temperature = temperature
+        self.humidity = humidity
+        self.min_interval_ms = min_interval_ms
+        self.script = None          # callable(t_us) -> (temperature, humidity)
+        self.corrupt_next = 0
+        self.fail_next = 0
+        self.reads = 0
+        self._last_us = None
+        self.board = None
+
+    def readinto(self, buf):
+        from .machine import ETIMEDOUT
+        now = (self.board or state.board).clock.now_us()
+        self.reads += 1
+        if self.fail_next:
+            self.fail_next -= 1
+            raise OSError(ETIMEDOUT)
+        too_soon = (self._last_us is not None and
+                    now - self._last_us < self.min_interval_ms * 1000)
+        self._last_us = now
+        t, h = self.script(now) if self.script else (self.temperature, self.humidity)
+        hv = int(round(h * 10))
+        tv = int(round(abs(t) * 10)) | (0x8000 if t < 0 else 0)
+        buf[0] = hv >> 8
+        buf[1] = hv & 0xFF
+        buf[2] = tv >> 8
+        buf[3] = tv & 0xFF
+        buf[4] = (buf[0] + buf[1] + buf[2] + buf[3]) & 0xFF
+        if self.corrupt_next or too_soon:
+            if self.corrupt_next:
+                self.corrupt_next -= 1
+            buf[4] ^= 0x5A
+
+
+# ───────── GPIO devices ─────────
+
+class FakeHCSR04:
+    """Echoes a trigger pulse with a pulse of 58 us per cm on the echo pin.
+    distance_cm=None models no echo (the echo line stays low). With an IRQ
+    armed on the echo pin the pulse is played at once, the clock moving to
+    each edge, since nothing else would advance time to deliver it."""
+
+    def __init__(self, trig, echo, distance_cm=100.0, delay_us=450):
+        from .machine import Pin
+        self.distance_cm = distance_cm
+        self.delay_us = delay_us
+        self.pings = 0
+        self._window = None
+        self.trig = Pin(trig)
+        self.echo = Pin(echo)
+        self.trig.listeners.append(self._trigger)
+        self.echo.source = self._level
+
+    def _trigger(self, pin, level):
+        if level or self.distance_cm is None:
+            return
+        clock = state.board.clock
+        t = clock.now_us() + self.delay_us
+        width = int(self.distance_cm * 58)
+        self._window = (t, t + width)
+        self.pings += 1
+        if self.echo._handler is not None:
+            clock.advance(self.delay_us)
+            self.echo._edge(0, 1)
+            clock.advance(width)
+            self.echo._edge(1, 0)
+
+    def _level(self, now_us):
+        w = self._window
+        return w is not None and w[0] <= now_us < w[1]
+
+
+class FakeQuadrature:
+    """Quadrature encoder on two pins; step(n) drives |n| Gray-code steps."""
+
+    _SEQ = ((0, 0), (0, 1), (1, 1), (1, 0))
+
+    def __init__(self, pin_a, pin_b, step_us=200):
+        from .machine import Pin
+        self.a = Pin(pin_a)
+        self.b = Pin(pin_b)
+        self.step_us = step_us
+        self._i = 0
+        self.a.drive(0)
+        self.b.drive(0)
+
+    def step(self, n=1):
+        d = 1 if n > 0 else -1
+        clock = state.board.clock
+        for _ in range(abs(n)):
+            self._i = (self._i + d) & 3
+            a, b = self._SEQ[self._i]
+            clock.charge(self.step_us)
+            self.a.drive(a)
+            self.b.drive(b)
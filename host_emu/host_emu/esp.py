@@ -0,0 +1,8 @@
+# esp.py
+# Host stand-in for the `esp` module (DHT bit-banging only).
+
+from .machine import dht_readinto
+
+
+def osdebug(level):
+    pass
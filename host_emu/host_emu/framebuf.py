@@ -0,0 +1,148 @@
+# framebuf.py
+# Host stand-in for MicroPython's `framebuf`, monochrome formats only.
+#
+# Pixel layout matches the device exactly, so the bytes a driver sends to a
+# display are the same as on hardware. text() draws placeholder glyphs (a
+# fixed per-character pattern inside the 8x8 cell), not the real font.
+
+MONO_VLSB = 0
+MONO_HLSB = 3
+MONO_HMSB = 4
+MVLSB = MONO_VLSB
+
+
+def _glyph(ch):
+    c = ord(ch)
+    if c <= 32 or c > 126:
+        return b"\x00" * 8
+    # 7 rows x 5 columns, one column byte per x (bit n = row n)
+    h = (c * 2654435761) & 0xFFFFFFFF
+    cols = bytearray(8)
+    for x in range(5):
+        cols[x + 1] = ((h >> (x * 6)) & 0x3F) | 0x41   # keep top/bottom rows
+    return bytes(cols)
+
+
+class FrameBuffer:
+    def __init__(self, buffer, width, height, format=MONO_VLSB, stride=None):
+        if format not in (MONO_VLSB, MONO_HLSB, MONO_HMSB):
+            raise ValueError("invalid format")
+        self.buf = buffer
+        self.width = width
+        self.height = height
+        self.format = format
+        self.stride = stride or width
+        if format == MONO_VLSB:
+            need = ((height + 7) // 8) * self.stride
+        else:
+            need = ((self.stride + 7) // 8) * height
+        if len(buffer) < need:
+            raise ValueError("buffer too small")
+
+    # ───────── pixel access ─────────
+    def _index(self, x, y):
+        if self.format == MONO_VLSB:
+            return (y >> 3) * self.stride + x, y & 7
+        i = (y * self.stride + x) >> 3
+        bit = x & 7
+        return i, (7 - bit if self.format == MONO_HLSB else bit)
+
+    def _get(self, x, y):
+        i, b = self._index(x, y)
+        return (self.buf[i] >> b) & 1
+
+    def _set(self, x, y, c):
+        i, b = self._index(x, y)
+        if c:
+            self.buf[i] |= 1 << b
+        else:
+            self.buf[i] &= ~(1 << b) & 0xFF
+
+    def pixel(self, x, y, c=None):
+        if not (0 <= x < self.width and 0 <= y < self.height):
+            return None
+        if c is None:
+            return self._get(x, y)
+        self._set(x, y, c)
+
+    # ───────── drawing ─────────
+    def fill(self, c):
+        v = 0xFF if c else 0x00
+        if self.format == MONO_VLSB:
+            n = ((self.height + 7) // 8) * self.stride
+        else:
+            n = ((self.stride + 7) // 8) * self.height
+        for i in range(n):
+            self.buf[i] = v
+
+    def fill_rect(self, x, y, w, h, c):
+        x0 = max(0, x)
+        y0 = max(0, y)
+        x1 = min(self.width, x + w)
+        y1 = min(self.height, y + h)
+        for yy in range(y0, y1):
+            for xx in range(x0, x1):
+                self._set(xx, yy, c)
+
+    def hline(self, x, y, w, c):
+        self.fill_rect(x, y, w, 1, c)
+
+    def vline(self, x, y, h, c):
+        self.fill_rect(x, y, 1, h, c)
+
+    def rect(self, x, y, w, h, c, f=False):
+        if f:
+            self.fill_rect(x, y, w, h, c)
+            return
+        self.fill_rect(x, y, w, 1, c)
+        self.fill_rect(x, y + h - 1, w, 1, c)
+        self.fill_rect(x, y, 1, h, c)
+        self.fill_rect(x + w - 1, y, 1, h, c)
+
+    def line(self, x0, y0, x1, y1, c):
+        dx = abs(x1 - x0)
+        dy = -abs(y1 - y0)
+        sx = 1 if x0 < x1 else -1
+        sy = 1 if y0 < y1 else -1
+        err = dx + dy
+        while True:
+            self.pixel(x0, y0, c)
+            if x0 == x1 and y0 == y1:
+                return
+            e2 = 2 * err
+            if e2 >= dy:
+                err += dy
+                x0 += sx
+            if e2 <= dx:
+                err += dx
+                y0 += sy
+
+    def text(self, s, x, y, c=1):
+        for ch in s:
+            g = _glyph(ch)
+            for cx in range(8):
+                col = g[cx]
+                for cy in range(8):
+                    if col >> cy & 1:
+                        self.pixel(x + cx, y + cy, c)
+            x += 8
+
+    def scroll(self, dx, dy):
+        w, h = self.width, self.height
+        snap = [[self._get(x, y) for x in range(w)] for y in range(h)]
+        for y in range(h):
+            for x in range(w):
+                sx, sy = x - dx, y - dy
+                if 0 <= sx < w and 0 <= sy < h:
+                    self._set(x, y, snap[sy][sx])
+
+    def blit(self, fbuf, x, y, key=-1, palette=None):
+        for yy in range(fbuf.height):
+            for xx in range(fbuf.width):
+                c = fbuf._get(xx, yy)
+                if c != key:
+                    self.pixel(x + xx, y + yy, c)
+
+
+def FrameBuffer1(buffer, width, height, stride=None):
+    return FrameBuffer(buffer, width, height, MONO_VLSB, stride)
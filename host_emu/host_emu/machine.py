@@ -0,0 +1,391 @@
+# machine.py
+# Host stand-in for MicroPython's `machine` module, backed by the emulated
+# board in host_emu.board.
+
+from . import state
+
+ENODEV = 19
+EIO = 5
+ETIMEDOUT = 110
+
+
+def _board():
+    return state.board
+
+
+# ───────── Pin ─────────
+
+class Pin:
+    IN = 1
+    OUT = 3
+    OPEN_DRAIN = 7
+    PULL_UP = 2
+    PULL_DOWN = 1
+    IRQ_RISING = 1
+    IRQ_FALLING = 2
+    IRQ_LOW_LEVEL = 4
+    IRQ_HIGH_LEVEL = 8
+
+    def __new__(cls, id, *args, **kwargs):
+        # like the ESP32 port, Pin(n) always refers to the same pin object
+        pins = _board().pins
+        pin = pins.get(id)
+        if pin is None:
+            pin = object.__new__(cls)
+            pin.id = id
+            pin.mode = cls.IN
+            pin.pull = None
+            pin._level = 0
+            pin._driven = False
+            pin.source = None          # callable(now_us) -> level
+            pin.analog = 0             # 16-bit level seen by ADC
+            pin.analog_source = None   # callable(now_us) -> 0..65535
+            pin.listeners = []         # callable(pin, level) on output change
+            pin._handler = None
+            pin._trigger = 0
+            pin._hard = False
+            pins[id] = pin
+        return pin
+
+    def __init__(self, id, mode=-1, pull=-1, *, value=None, **kwargs):
+        if mode != -1:
+            self.mode = mode
+        if pull != -1:
+            self.pull = pull
+        if value is not None:
+            self._set(value)
+
+    def __repr__(self):
+        return "Pin({})".format(self.id)
+
+    def init(self, mode=-1, pull=-1, *, value=None, **kwargs):
+        self.__init__(self.id, mode, pull, value=value)
+
+    def value(self, v=None):
+        b = _board()
+        if v is None:
+            b.count("gpio_reads")
+            b.clock.charge(b.timing.gpio_us)
+            return self._read()
+        b.count("gpio_writes")
+        b.clock.charge(b.timing.gpio_us)
+        self._set(v)
+
+    __call__ = value
+
+    def on(self):
+        self.value(1)
+
+    def off(self):
+        self.value(0)
+
+    def _read(self):
+        if self.source is not None:
+            return 1 if self.source(_board().clock.now_us()) else 0
+        if not self._driven and self.mode == self.IN:
+            return 1 if self.pull == self.PULL_UP else 0
+        return self._level
+
+    def _set(self, v):
+        old = self._read()
+        self._level = 1 if v else 0
+        self._driven = True
+        for fn in self.listeners:
+            fn(self, self._level)
+        self._edge(old, self._level)
+
+    def irq(self, handler=None, trigger=IRQ_RISING | IRQ_FALLING, *,
+            hard=False, **kwargs):
+        self._handler = handler
+        self._trigger = trigger if handler else 0
+        self._hard = hard
+        return None
+
+    # ───── test side ─────
+    def drive(self, level):
+        """Drive the pin from outside (sensor output, button, ...)."""
+        self._set(level)
+        b = _board()
+        if b.auto_schedule:
+            b.run_scheduled()
+
+    def pulse(self, width_us=50):
+        self.drive(1)
+        _board().clock.charge(width_us)
+        self.drive(0)
+
+    def _edge(self, old, new):
+        if old == new or self._handler is None:
+            return
+        if new and not (self._trigger & self.IRQ_RISING):
+            return
+        if not new and not (self._trigger & self.IRQ_FALLING):
+            return
+        b = _board()
+        b.count("irqs")
+        b.clock.charge(b.timing.irq_latency_us)
+        if self._hard:
+            self._handler(self)
+        else:
+            # soft IRQs are delivered through the scheduler queue
+            try:
+                b.schedule(self._handler, self)
+            except RuntimeError:
+                pass
+
+
+# ───────── PWM ─────────
+
+class PWM:
+    def __init__(self, dest, *, freq=None, duty=None, duty_u16=None,
+                 duty_ns=None):
+        self.pin = dest if isinstance(dest, Pin) else Pin(dest)
+        self._freq = 5000
+        self._duty_u16 = 32768
+        self.writes = 0
+        self.active = True
+        self.init(freq=freq, duty=duty, duty_u16=duty_u16, duty_ns=duty_ns)
+
+    def init(self, *, freq=None, duty=None, duty_u16=None, duty_ns=None):
+        if freq is not None:
+            self._freq = freq
+        if duty is not None:
+            self.duty(duty)
+        if duty_u16 is not None:
+            self.duty_u16(duty_u16)
+        if duty_ns is not None:
+            self.duty_ns(duty_ns)
+        self.active = True
+
+    def _write(self, u16):
+        b = _board()
+        b.count("pwm_writes")
+        b.clock.charge(b.timing.pwm_write_us)
+        self.writes += 1
+        self._duty_u16 = max(0, min(65535, int(u16)))
+
+    def freq(self, f=None):
+        if f is None:
+            return self._freq
+        self._freq = f
+
+    def duty(self, d=None):
+        """10-bit duty, as on the ESP32 port."""
+        if d is None:
+            return self._duty_u16 >> 6
+        self._write(min(1023, max(0, int(d))) << 6)
+
+    def duty_u16(self, d=None):
+        if d is None:
+            return self._duty_u16
+        self._write(d)
+
+    def duty_ns(self, ns=None):
+        period_ns = 1000000000 // self._freq
+        if ns is None:
+            return self._duty_u16 * period_ns // 65535
+        self._write(int(ns) * 65535 // period_ns)
+
+    def high_us(self):
+        """Pulse width currently on the pin (test helper)."""
+        return self._duty_u16 * 1000000 / 65535 / self._freq
+
+    def deinit(self):
+        self.active = False
+
+
+# ───────── ADC ─────────
+
+class ADC:
+    ATTN_0DB = 0
+    ATTN_2_5DB = 1
+    ATTN_6DB = 2
+    ATTN_11DB = 3
+    WIDTH_9BIT = 9
+    WIDTH_10BIT = 10
+    WIDTH_11BIT = 11
+    WIDTH_12BIT = 12
+
+    def __init__(self, pin, *, atten=None):
+        self.pin = pin if isinstance(pin, Pin) else Pin(pin)
+        self._atten = atten
+        self._width = 12
+
+    def atten(self, a):
+        self._atten = a
+
+    def width(self, w):
+        self._width = w
+
+    def read_u16(self):
+        b = _board()
+        b.count("gpio_reads")
+        p = self.pin
+        if p.analog_source is not None:
+            v = p.analog_source(b.clock.now_us())
+        else:
+            v = p.analog
+        return max(0, min(65535, int(v)))
+
+    def read(self):
+        return self.read_u16() >> (16 - self._width)
+
+    def read_uv(self):
+        return self.read_u16() * 3300000 // 65535
+
+
+# ───────── I2C ─────────
+
+class I2C:
+    def __init__(self, id=-1, *, scl=None, sda=None, freq=400000,
+                 timeout=50000):
+        self.id = id
+        self.init(scl=scl, sda=sda, freq=freq)
+
+    def init(self, *, scl=None, sda=None, freq=400000, **kwargs):
+        self.scl = scl.id if isinstance(scl, Pin) else (22 if scl is None else scl)
+        self.sda = sda.id if isinstance(sda, Pin) else (21 if sda is None else sda)
+        self.freq = freq
+
+    def _device(self, addr, nbytes):
+        b = _board()
+        b.clock.charge(b.timing.i2c_us(nbytes, self.freq))
+        dev = b.i2c_devices(self.scl, self.sda).get(addr)
+        if dev is None or not dev.present:
+            b.count("i2c_errors")
+            raise OSError(ENODEV)
+        if dev.fail_next:
+            dev.fail_next -= 1
+            b.count("i2c_errors")
+            raise OSError(EIO)
+        b.count("i2c_transactions")
+        b.count("i2c_bytes", nbytes)
+        return dev
+
+    def scan(self):
+        b = _board()
+        return sorted(a for a, d in b.i2c_devices(self.scl, self.sda).items()
+                      if d.present)
+
+    def readfrom_mem(self, addr, memaddr, nbytes, *, addrsize=8):
+        return bytes(self._device(addr, nbytes + 1).read(memaddr, nbytes))
+
+    def readfrom_mem_into(self, addr, memaddr, buf, *, addrsize=8):
+        data = self._device(addr, len(buf) + 1).read(memaddr, len(buf))
+        buf[:] = data
+
+    def writeto_mem(self, addr, memaddr, buf, *, addrsize=8):
+        self._device(addr, len(buf) + 1).write(memaddr, bytes(buf))
+
+    def readfrom(self, addr, nbytes, stop=True):
+        return bytes(self._device(addr, nbytes).read_raw(nbytes))
+
+    def readfrom_into(self, addr, buf, stop=True):
+        buf[:] = self._device(addr, len(buf)).read_raw(len(buf))
+
+    def writeto(self, addr, buf, stop=True):
+        self._device(addr, len(buf)).write_raw(bytes(buf))
+        return len(buf)
+
+    def writevto(self, addr, vector, stop=True):
+        data = b"".join(bytes(v) for v in vector)
+        self._device(addr, len(data)).write_raw(data)
+        return len(data)
+
+
+class SoftI2C(I2C):
+    def __init__(self, scl, sda, *, freq=400000, timeout=50000):
+        super().__init__(-1, scl=scl, sda=sda, freq=freq)
+
+
+# ───────── Encoder (PCNT) ─────────
+
+class Encoder:
+    """
+    ESP32 PCNT quadrature counter as exposed by recent ports. Counting
+    happens "in hardware": no IRQ or scheduler cost per edge, only the
+    register read in value().
+    """
+
+    _DELTA = (0, 1, -1, 0, -1, 0, 0, 1, 1, 0, 0, -1, 0, -1, 1, 0)
+
+    def __init__(self, id, phase_a=None, phase_b=None, *, phases=4,
+                 filter_ns=0, **kwargs):
+        self.id = id
+        self.a = phase_a if isinstance(phase_a, Pin) else Pin(phase_a)
+        self.b = phase_b if isinstance(phase_b, Pin) else Pin(phase_b)
+        self._div = 4 // phases
+        self._count = 0
+        self._state = (self.a._read() << 1) | self.b._read()
+        self.a.listeners.append(self._edge)
+        self.b.listeners.append(self._edge)
+
+    def _edge(self, pin, level):
+        ab = (self.a._read() << 1) | self.b._read()
+        self._count += self._DELTA[(self._state << 2) | ab]
+        self._state = ab
+
+    def value(self, v=None):
+        b = _board()
+        b.clock.charge(b.timing.gpio_us)
+        count = int(self._count / self._div)
+        if v is not None:
+            self._count = v * self._div
+        return count
+
+    def deinit(self):
+        for p in (self.a, self.b):
+            if self._edge in p.listeners:
+                p.listeners.remove(self._edge)
+
+
+# ───────── misc ─────────
+
+def time_pulse_us(pin, pulse_level, timeout_us=1000000):
+    """Steps the clock through the pin's scripted waveform; the wait is
+    charged like any other modeled cost."""
+    b = _board()
+    clock = b.clock
+    step = 2
+    start = clock.now_us()
+    while pin._read() != pulse_level:
+        if clock.now_us() - start >= timeout_us:
+            return -2
+        clock.charge(step)
+    start = clock.now_us()
+    while pin._read() == pulse_level:
+        if clock.now_us() - start >= timeout_us:
+            return -1
+        clock.charge(step)
+    return clock.now_us() - start
+
+
+def dht_readinto(pin, buf):
+    b = _board()
+    pid = pin.id if isinstance(pin, Pin) else pin
+    b.clock.charge(b.timing.dht_read_us)
+    b.count("dht_reads")
+    dev = b.dht.get(pid)
+    if dev is None:
+        raise OSError(ETIMEDOUT)
+    dev.readinto(buf)
+
+
+def disable_irq():
+    return 0
+
+
+def enable_irq(state=0):
+    pass
+
+
+def freq(hz=None):
+    return 240000000
+
+
+def unique_id():
+    return b"\x24\x0a\xc4\x00\x00\x01"
+
+
+def reset():
+    raise SystemExit("machine.reset()")
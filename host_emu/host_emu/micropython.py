@@ -0,0 +1,40 @@
+# micropython.py
+# Host stand-in for the `micropython` module.
+
+from . import state
+
+
+def const(x):
+    return x
+
+
+def schedule(func, arg):
+    state.board.schedule(func, arg)
+
+
+def alloc_emergency_exception_buf(size):
+    pass
+
+
+def native(f):
+    return f
+
+
+def viper(f):
+    return f
+
+
+def opt_level(level=None):
+    return 0 if level is None else None
+
+
+def heap_lock():
+    return 0
+
+
+def heap_unlock():
+    return 0
+
+
+def mem_info(verbose=False):
+    print("mem: host emulation")
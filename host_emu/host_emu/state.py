@@ -0,0 +1,6 @@
+# state.py
+# The board the emulated modules talk to. install()/reset() replace it.
+
+from .board import Board
+
+board = Board()
@@ -0,0 +1,91 @@
+# uasyncio.py
+# Host stand-in for `uasyncio`: CPython's asyncio plus the MicroPython
+# additions the drivers use. Sleeping also runs pending scheduled callbacks,
+# which is where the VM would have run them on the device.
+
+import asyncio as _asyncio
+from asyncio import *  # noqa: F401,F403
+from asyncio import CancelledError, TimeoutError  # noqa: F401
+
+from . import state
+
+
+# MicroPython lets a driver create_task() before the loop runs; the task
+# starts with run(). CPython refuses, so such coroutines wait here.
+_deferred = []
+
+
+class _DeferredTask:
+    def __init__(self, coro):
+        self.coro = coro
+
+    def cancel(self):
+        if self in _deferred:
+            _deferred.remove(self)
+            self.coro.close()
+
+
+def create_task(coro):
+    try:
+        _asyncio.get_running_loop()
+    except RuntimeError:
+        t = _DeferredTask(coro)
+        _deferred.append(t)
+        return t
+    return _asyncio.create_task(coro)
+
+
+def run(main):
+    async def _main():
+        while _deferred:
+            _asyncio.create_task(_deferred.pop(0).coro)
+        return await main
+    return _asyncio.run(_main())
+
+
+def drop_deferred():
+    """Close tasks created outside a loop that never got to run."""
+    while _deferred:
+        _deferred.pop().coro.close()
+
+
+async def sleep(t):
+    state.board.run_scheduled()
+    await _asyncio.sleep(t)
+
+
+async def sleep_ms(ms):
+    state.board.run_scheduled()
+    await _asyncio.sleep(ms / 1000)
+
+
+async def wait_for_ms(aw, timeout):
+    return await _asyncio.wait_for(aw, timeout / 1000)
+
+
+class ThreadSafeFlag:
+    """Single-waiter flag that may be set from an IRQ handler."""
+
+    def __init__(self):
+        self._flag = False
+        self._event = None
+
+    def set(self):
+        self._flag = True
+        if self._event is not None:
+            self._event.set()
+
+    def clear(self):
+        self._flag = False
+        if self._event is not None:
+            self._event.clear()
+
+    async def wait(self):
+        if not self._flag:
+            if self._event is None:
+                self._event = _asyncio.Event()
+            self._event.clear()
+            # re-check: set() may have landed between the test and clear()
+            if not self._flag:
+                await self._event.wait()
+        self._flag = False
@@ -0,0 +1,2 @@
+from .bus import SharedBus, get_bus, buses
+from .breaker import CircuitBreaker, CLOSED, OPEN, HALF_OPEN
@@ -0,0 +1,65 @@
+# breaker.py
+# Per-device circuit breaker: after `threshold` consecutive failed
+# operations the device is considered dead and is not probed again until
+# a cool-down has passed. The first operation after the cool-down is a
+# single probe; if it fails the cool-down doubles (up to max_cooldown_ms).
+
+from time import ticks_ms, ticks_diff
+
+CLOSED = "closed"          # device healthy, operations allowed
+OPEN = "open"              # device dead, operations skipped
+HALF_OPEN = "half_open"    # cool-down over, next operation is a probe
+
+
+class CircuitBreaker:
+    def __init__(self, threshold=3, cooldown_ms=2000, max_cooldown_ms=60000):
+        self.threshold = threshold
+        self.base_cooldown_ms = cooldown_ms
+        self.max_cooldown_ms = max_cooldown_ms
+        self.cooldown_ms = cooldown_ms
+        self.state = CLOSED
+        self.failures = 0          # consecutive failures
+        self.trips = 0             # closed -> open transitions
+        self.skipped = 0           # operations refused while open
+        self._opened_ms = 0
+
+    def allow(self):
+        """True if the caller may touch the device now."""
+        if self.state == OPEN:
+            if ticks_diff(ticks_ms(), self._opened_ms) < self.cooldown_ms:
+                self.skipped += 1
+                return False
+            self.state = HALF_OPEN
+        return True
+
+    def success(self):
+        self.failures = 0
+        if self.state != CLOSED:
+            self.state = CLOSED
+            self.cooldown_ms = self.base_cooldown_ms
+
+    def failure(self):
+        """Record a failed operation. Returns True only when this tripped a
+        closed breaker; a failed probe re-opens it silently."""
+        self.failures += 1
+        if self.state == HALF_OPEN:
+            # probe failed, back off further; still the same trip
+            self.cooldown_ms = min(self.cooldown_ms * 2, self.max_cooldown_ms)
+            self.state = OPEN
+            self._opened_ms = ticks_ms()
+            return False
+        if self.state == OPEN or self.failures < self.threshold:
+            return False
+        self.state = OPEN
+        self.trips += 1
+        self._opened_ms = ticks_ms()
+        return True
+
+    def status(self):
+        return {
+            "state": self.state,
+            "failures": self.failures,
+            "trips": self.trips,
+            "skipped": self.skipped,
+            "cooldown_ms": self.cooldown_ms,
+        }
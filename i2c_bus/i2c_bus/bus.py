@@ -0,0 +1,212 @@
+# bus.py
+# One shared I2C instance per SCL/SDA pin pair: a hardware peripheral
+# while one is free, SoftI2C after that.
+#
+# Drivers on the same physical bus get the same SharedBus instead of each
+# creating their own I2C/SoftI2C object:
+#     from i2c_bus import get_bus
+#     i2c = get_bus(scl=22, sda=21, freq=400000)
+#     i2c.readfrom_mem(0x68, 0x3B, 14)
+#
+# SharedBus has the same read/write methods as machine.I2C, so it can be
+# passed anywhere an I2C object is expected. It counts transactions, bytes
+# and errors per device address, and its asyncio lock serializes multi-step
+# transactions between tasks:
+#     async with i2c.lock:
+#         ...several reads/writes that must not interleave...
+
+from machine import I2C, SoftI2C, Pin
+from time import sleep_us
+import uasyncio as asyncio
+
+DEFAULT_FREQ = 400000
+HW_BUSES = 2          # hardware I2C peripherals (ESP32: 0 and 1)
+
+_buses = {}
+
+
+class SharedBus:
+    """id: hardware I2C peripheral, or None for a bit-banged SoftI2C."""
+
+    def __init__(self, id, scl, sda, freq):
+        self.id = id
+        self.scl = scl
+        self.sda = sda
+        self.freq = freq
+        self.i2c = self._open(freq)
+        self.lock = asyncio.Lock()
+        self._stats = {}     # addr -> [transactions, bytes, errors]
+        self.recoveries = 0
+
+    def set_freq(self, freq):
+        """Re-initialise the bus at a new clock."""
+        self.freq = freq
+        self.i2c = self._open(freq)
+
+    def _open(self, freq):
+        if self.id is None:
+            return SoftI2C(scl=Pin(self.scl), sda=Pin(self.sda), freq=freq)
+        return I2C(self.id, scl=Pin(self.scl), sda=Pin(self.sda), freq=freq)
+
+    def recover(self):
+        """
+        Free a bus held by a slave that was reset mid-transfer: clock SCL
+        until the slave releases SDA (at most 9 pulses), issue a STOP and
+        hand the pins back to the I2C peripheral.
+        Returns True if SDA is high afterwards.
+        """
+        self.recoveries += 1
+        half = 500000 // self.freq + 1          # half clock period, us
+        scl = Pin(self.scl, Pin.OPEN_DRAIN, value=1)
+        sda = Pin(self.sda, Pin.OPEN_DRAIN, value=1)
+        for _ in range(9):
+            if sda.value():
+                break
+            scl.value(0)
+            sleep_us(half)
+            scl.value(1)
+            sleep_us(half)
+        # STOP condition: SDA rises while SCL is high
+        scl.value(0)
+        sleep_us(half)
+        sda.value(0)
+        sleep_us(half)
+        scl.value(1)
+        sleep_us(half)
+        sda.value(1)
+        sleep_us(half)
+        released = sda.value() == 1
+        self.set_freq(self.freq)
+        return released
+
+    # ───────── statistics ─────────
+    def _count(self, addr, nbytes):
+        s = self._stats.get(addr)
+        if s is None:
+            s = self._stats[addr] = [0, 0, 0]
+        s[0] += 1
+        s[1] += nbytes
+
+    def _error(self, addr):
+        s = self._stats.get(addr)
+        if s is None:
+            s = self._stats[addr] = [0, 0, 0]
+        s[2] += 1
+
+    def stats(self, addr=None):
+        """Counters for one device, or for every device seen on the bus."""
+        if addr is not None:
+            s = self._stats.get(addr, (0, 0, 0))
+            return {"transactions": s[0], "bytes": s[1], "errors": s[2]}
+        return {a: self.stats(a) for a in self._stats}
+
+    def reset_stats(self):
+        self._stats.clear()
+
+    # ───────── machine.I2C interface ─────────
+    def scan(self):
+        return self.i2c.scan()
+
+    def readfrom_mem(self, addr, memaddr, nbytes, *, addrsize=8):
+        try:
+            data = self.i2c.readfrom_mem(addr, memaddr, nbytes, addrsize=addrsize)
+        except OSError:
+            self._error(addr)
+            raise
+        self._count(addr, nbytes)
+        return data
+
+    def readfrom_mem_into(self, addr, memaddr, buf, *, addrsize=8):
+        try:
+            self.i2c.readfrom_mem_into(addr, memaddr, buf, addrsize=addrsize)
+        except OSError:
+            self._error(addr)
+            raise
+        self._count(addr, len(buf))
+
+    def writeto_mem(self, addr, memaddr, buf, *, addrsize=8):
+        try:
+            self.i2c.writeto_mem(addr, memaddr, buf, addrsize=addrsize)
+        except OSError:
+            self._error(addr)
+            raise
+        self._count(addr, len(buf))
+
+    def readfrom(self, addr, nbytes, stop=True):
+        try:
+            data = self.i2c.readfrom(addr, nbytes, stop)
+        except OSError:
+            self._error(addr)
+            raise
+        self._count(addr, nbytes)
+        return data
+
+    def readfrom_into(self, addr, buf, stop=True):
+        try:
+            self.i2c.readfrom_into(addr, buf, stop)
+        except OSError:
+            self._error(addr)
+            raise
+        self._count(addr, len(buf))
+
+    def writeto(self, addr, buf, stop=True):
+        try:
+            acks = self.i2c.writeto(addr, buf, stop)
+        except OSError:
+            self._error(addr)
+            raise
+        self._count(addr, len(buf))
+        return acks
+
+    def writevto(self, addr, vector, stop=True):
+        try:
+            acks = self.i2c.writevto(addr, vector, stop)
+        except OSError:
+            self._error(addr)
+            raise
+        self._count(addr, sum(len(b) for b in vector))
+        return acks
+
+    # ───────── locked async variants ─────────
+    async def areadfrom_mem_into(self, addr, memaddr, buf):
+        async with self.lock:
+            self.readfrom_mem_into(addr, memaddr, buf)
+
+    async def awriteto_mem(self, addr, memaddr, buf):
+        async with self.lock:
+            self.writeto_mem(addr, memaddr, buf)
+
+    async def awriteto(self, addr, buf):
+        async with self.lock:
+            return self.writeto(addr, buf)
+
+
+def get_bus(scl=22, sda=21, freq=DEFAULT_FREQ, id=None):
+    """
+    Return the SharedBus for this pin pair, creating it on first use.
+    id: hardware I2C peripheral; by default the lowest one not taken yet,
+    and SoftI2C once all HW_BUSES are in use.
+    The bus runs at the lowest freq any of its devices asked for.
+    """
+    key = (scl, sda)
+    bus = _buses.get(key)
+    if bus is None:
+        if id is None:
+            id = _free_id()
+        bus = _buses[key] = SharedBus(id, scl, sda, freq)
+    elif freq < bus.freq:
+        bus.set_freq(freq)
+    return bus
+
+
+def _free_id():
+    used = [b.id for b in _buses.values()]
+    for i in range(HW_BUSES):
+        if i not in used:
+            return i
+    return None
+
+
+def buses():
+    """Every SharedBus created so far."""
+    return list(_buses.values())
@@ -10,11 +10,17 @@ class MethodWrapper:
 
 
 
+from logger import get_logger
+
+_log = get_logger("led")
+
+
 class LED:
-    def __init__(self, pin, active_high=True, simulate=False):
+    def __init__(self, pin, active_high=True, simulate=False, verbose=True):
         self.pin = pin
         self.active_high = active_high
         self.simulate = simulate
+        self.verbose = verbose  # False: no console output
         self._state = False  # LED is initially off
         self._on_change = None  # NEW: callback for state changes
         
@@ -22,7 +28,8 @@ class LED:
             from machine import Pin
             self._led = Pin(pin, Pin.OUT)
 
-        print(f"[INIT] LED on pin {pin} (active_high={active_high}, simulate={simulate})")
+        if self.verbose:
+            _log.info("LED on pin %s (active_high=%s, simulate=%s)", pin, active_high, simulate)
 
     def __getitem__(self, key):
         method = getattr(self, key)
@@ -54,5 +61,6 @@ class LED:
                 self._led.value(1 if self._state == self.active_high else 0)
             if self._on_change:
                 self._on_change("led", ("state", self._state))
-            print(f"[LED] {'ON' if self._state else 'OFF'} (triggered)")
+            if self.verbose:
+                _log.debug("pin %s %s", self.pin, "ON" if self._state else "OFF")
 
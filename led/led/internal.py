@@ -1,7 +1,10 @@
 from .driver import LED
+from logger import get_logger
+
+_log = get_logger("led")
 
 class InternalLED(LED):
     def __init__(self, simulate=False):
         # On ESP32, internal LED is usually on GPIO2 and active high
         super().__init__(pin=2, active_high=True, simulate=simulate)
-        print("[INIT] InternalLED initialized on pin 2")
+        _log.info("InternalLED initialized on pin 2")
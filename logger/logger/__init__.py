@@ -0,0 +1,4 @@
+from .log import (Logger, get_logger, set_level, add_sink, remove_sink,
+                  set_sinks, sinks, DEBUG, INFO, WARNING, ERROR, CRITICAL, OFF)
+from .sinks import PrintSink, RingSink
+from .log import enable_ring, dump
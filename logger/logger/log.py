@@ -0,0 +1,147 @@
+# log.py
+# Leveled logging for the drivers.
+#
+# Messages use %-style arguments that are only formatted when the level is
+# enabled, so a disabled call costs one method call and one int compare:
+#
+#     _log = get_logger("mpu6050")
+#     _log.debug("read %d bytes from 0x%02x", n, reg)    # free when off
+#     if _log.debug_on:                                  # skip the call too
+#         _log.debug("frame %s", expensive())
+#
+# Every logger shares the global sink list (PrintSink by default). The
+# level is global unless set per logger with set_level(level, name).
+
+from .sinks import PrintSink, RingSink
+
+DEBUG = 10
+INFO = 20
+WARNING = 30
+ERROR = 40
+CRITICAL = 50
+OFF = 100
+
+_names = {DEBUG: "DEBUG", INFO: "INFO", WARNING: "WARN", ERROR: "ERROR",
+          CRITICAL: "CRIT"}
+
+_level = INFO
+_loggers = {}
+_overrides = {}
+_sinks = [PrintSink()]
+_ring = None
+
+
+class Logger:
+    def __init__(self, name):
+        self.name = name
+        self._apply(_overrides.get(name, _level))
+
+    def _apply(self, level):
+        # cached per level so hot paths can test a plain attribute
+        self.level = level
+        self.debug_on = level <= DEBUG
+        self.info_on = level <= INFO
+
+    def enabled(self, level):
+        return level >= self.level
+
+    def log(self, level, msg, *args):
+        if level < self.level:
+            return
+        self._emit(level, msg, args)
+
+    def debug(self, msg, *args):
+        if DEBUG < self.level:
+            return
+        self._emit(DEBUG, msg, args)
+
+    def info(self, msg, *args):
+        if INFO < self.level:
+            return
+        self._emit(INFO, msg, args)
+
+    def warning(self, msg, *args):
+        if WARNING < self.level:
+            return
+        self._emit(WARNING, msg, args)
+
+    def error(self, msg, *args):
+        if ERROR < self.level:
+            return
+        self._emit(ERROR, msg, args)
+
+    def critical(self, msg, *args):
+        if CRITICAL < self.level:
+            return
+        self._emit(CRITICAL, msg, args)
+
+    def _emit(self, level, msg, args):
+        if args:
+            try:
+                msg = msg % args
+            except Exception:
+                msg = "{} {}".format(msg, args)
+        for sink in _sinks:
+            sink.write(level, self.name, msg)
+
+
+def get_logger(name):
+    lg = _loggers.get(name)
+    if lg is None:
+        lg = _loggers[name] = Logger(name)
+    return lg
+
+
+def set_level(level, name=None):
+    """Global level, or the level of one logger when name is given."""
+    global _level
+    if name is not None:
+        _overrides[name] = level
+        get_logger(name)._apply(level)
+        return
+    _level = level
+    for n, lg in _loggers.items():
+        if n not in _overrides:
+            lg._apply(level)
+
+
+def level_name(level):
+    return _names.get(level, str(level))
+
+
+def add_sink(sink):
+    _sinks.append(sink)
+    return sink
+
+
+def remove_sink(sink):
+    if sink in _sinks:
+        _sinks.remove(sink)
+
+
+def set_sinks(*new):
+    """Replace all sinks; set_sinks() discards every message."""
+    _sinks[:] = new
+
+
+def sinks():
+    return tuple(_sinks)
+
+
+def enable_ring(entries=32, width=80, console=True):
+    """Add (once) a RAM ring sink, optionally dropping the console sink."""
+    global _ring
+    if _ring is None:
+        _ring = RingSink(entries, width)
+        add_sink(_ring)
+    if not console:
+        for s in sinks():
+            if isinstance(s, PrintSink):
+                remove_sink(s)
+    return _ring
+
+
+def dump(out=print):
+    """Print (or pass to `out`) the ring contents, oldest first."""
+    if _ring is not None:
+        _ring.dump(out)
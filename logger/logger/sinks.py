@@ -0,0 +1,82 @@
+# sinks.py
+# Log sinks. A sink only needs write(level, name, msg).
+
+from array import array
+
+try:
+    from time import ticks_ms
+except ImportError:                      # CPython
+    from time import monotonic
+
+    def ticks_ms():
+        return int(monotonic() * 1000)
+
+
+def _lv(level):
+    from .log import level_name
+    return level_name(level)
+
+
+class PrintSink:
+    def write(self, level, name, msg):
+        print("[{}] {}: {}".format(_lv(level), name, msg))
+
+
+class RingSink:
+    """
+    Keeps the last `entries` messages in RAM, each cut to `width` bytes.
+    Storage is allocated once; writing never grows the heap beyond the
+    encoded message. dump() replays the ring, e.g. after a fault.
+    """
+
+    def __init__(self, entries=32, width=80):
+        self.entries = entries
+        self.width = width
+        self._buf = bytearray(entries * width)
+        self._len = array('H', [0] * entries)
+        self._lvl = array('B', [0] * entries)
+        self._t = array('L', [0] * entries)
+        self._names = [None] * entries
+        self._head = 0
+        self.count = 0              # messages written since clear()
+        self.dropped = 0            # messages overwritten
+
+    def write(self, level, name, msg):
+        i = self._head
+        data = msg.encode() if isinstance(msg, str) else msg
+        n = min(len(data), self.width)
+        o = i * self.width
+        self._buf[o:o + n] = data[:n]
+        self._len[i] = n
+        self._lvl[i] = level
+        self._t[i] = ticks_ms() & 0xFFFFFFFF
+        self._names[i] = name
+        self._head = (i + 1) % self.entries
+        if self.count >= self.entries:
+            self.dropped += 1
+        self.count += 1
+
+    def clear(self):
+        self._head = 0
+        self.count = 0
+        self.dropped = 0
+
+    def records(self):
+        """[(ticks_ms, level, name, msg)] oldest first."""
+        n = min(self.count, self.entries)
+        start = (self._head - n) % self.entries
+        out = []
+        for k in range(n):
+            i = (start + k) % self.entries
+            o = i * self.width
+            raw = bytes(self._buf[o:o + self._len[i]])
+            try:
+                msg = raw.decode()
+            except UnicodeError:        # cut inside a multi-byte character
+                msg = str(raw)
+            out.append((self._t[i], self._lvl[i], self._names[i], msg))
+        return out
+
+    def dump(self, out=print):
+        for t, level, name, msg in self.records():
+            out("{:>10} [{}] {}: {}".format(t, _lv(level), name, msg))
@@ -1,23 +1,157 @@
 # sensors.py
 import machine
+from array import array
+from time import ticks_ms, ticks_diff, ticks_add
+import uasyncio as asyncio
 from .edge_detector import EdgeDetector
+from logger import get_logger
+
+_log = get_logger("pir")
+
+_MINUTE_MS = 60000
+
 
 class PIRSensor(EdgeDetector):
     """
     Passive-infrared motion sensor.
     Calls watch_state("pir", {"motion": True}) on motion detected,
     and {"motion": False} when motion ends.
+
+    With hold_s set it reports occupancy instead of raw motion:
+    {"occupied": True} on the first motion, {"occupied": False} once no
+    motion was seen for hold_s. Each minute's occupied fraction is kept in
+    a fixed ring of history_min entries (duty_cycle()); with report_min
+    set, {"duty_pct": [...]} for the last report_min minutes is sent every
+    report_min minutes. The hold-off timer runs in an asyncio task started
+    by a watch_state callback (constructor or method) or init_watch(); call
+    update() yourself without one.
     """
     MOTION = True
     IDLE = False
+    _occupancy = False
 
-    def __init__(self, pin_num, *, watch_state=None):
+    def __init__(self, pin_num, *, watch_state=None, hub=None,
+                 hold_s=None, history_min=60, report_min=0):
         # PIR modules typically output active-high and don't need internal pull resistors
-        super().__init__(pin_num, pull=None, watch_state=watch_state)
+        super().__init__(pin_num, pull=None, watch_state=watch_state, hub=hub)
+        if hold_s is None:
+            return
+        now = ticks_ms()
+        self._hold_ms = int(hold_s * 1000)
+        self._report_min = report_min
+        self._motion = bool(self.pin.value())
+        self._occupied = False
+        self._last_motion_ms = now
+        # duty cycle: occupied ms in the current minute, per-minute permille ring
+        self._duty = array('H', [0] * history_min)
+        self._duty_i = 0
+        self._minutes = 0
+        self._minute_start = now
+        self._acc_ms = 0
+        self._mark_ms = now
+        self._task = None
+        self.transitions = 0
+        self._occupancy = True         # last: edges before this report raw motion
+        if self._motion:
+            self._set_occupied(True, now)
+        if watch_state is not None:
+            self._start()
 
     def _dispatch(self, level):
+        if self._occupancy:
+            self._on_motion(bool(level))
+            return
         if self._watch_state:
             try:
                 self._watch_state("pir", {"motion": bool(level)})
             except Exception as exc:
-                print("PIRSensor watch_state error:", exc)
+                _log.error("watch_state error: %s", exc)
+
+    # ───────── occupancy ─────────
+    def occupied(self):
+        return self._occupied
+
+    def duty_cycle(self, minutes=None):
+        """Occupied percentage of each completed minute, oldest first."""
+        n = min(self._minutes, len(self._duty))
+        if minutes is not None and minutes < n:
+            n = minutes
+        size = len(self._duty)
+        start = self._duty_i - n
+        return [self._duty[(start + i) % size] / 10 for i in range(n)]
+
+    def watch_state(self, fn):
+        super().watch_state(fn)
+        self._start()
+
+    def init_watch(self):
+        super().init_watch()
+        self._start()
+
+    def deinit_watch(self):
+        super().deinit_watch()
+        if self._occupancy:
+            self._task = None
+
+    def update(self, now=None):
+        """Expire the hold-off timer and close finished minutes."""
+        if now is None:
+            now = ticks_ms()
+        if (self._occupied and not self._motion and
+                ticks_diff(now, self._last_motion_ms) >= self._hold_ms):
+            # vacant since the hold ran out, not since this call
+            self._set_occupied(False, ticks_add(self._last_motion_ms, self._hold_ms))
+        self._roll(now)
+        self._account(now)
+
+    def _on_motion(self, motion):
+        now = ticks_ms()
+        self._motion = motion
+        # the hold-off counts from the end of the last motion
+        self._last_motion_ms = now
+        if motion and not self._occupied:
+            self._set_occupied(True, now)
+
+    def _set_occupied(self, occupied, at):
+        self._roll(at)
+        self._account(at)
+        self._occupied = occupied
+        self.transitions += 1
+        self._emit({"occupied": occupied})
+
+    def _account(self, at):
+        d = ticks_diff(at, self._mark_ms)
+        if d > 0:
+            if self._occupied:
+                self._acc_ms += d
+            self._mark_ms = at
+
+    def _roll(self, now):
+        while ticks_diff(now, self._minute_start) >= _MINUTE_MS:
+            end = ticks_add(self._minute_start, _MINUTE_MS)
+            self._account(end)
+            self._duty[self._duty_i] = min(1000, self._acc_ms // 60)
+            self._duty_i = (self._duty_i + 1) % len(self._duty)
+            self._minutes += 1
+            self._acc_ms = 0
+            self._minute_start = end
+            if self._report_min and self._minutes % self._report_min == 0:
+                self._emit({"duty_pct": self.duty_cycle(self._report_min)})
+
+    def _emit(self, update):
+        if self._watch_state:
+            try:
+                self._watch_state("pir", update)
+            except Exception as exc:
+                _log.error("watch_state error: %s", exc)
+
+    def _start(self):
+        if self._occupancy and self._task is None:
+            self._task = asyncio.create_task(self._occupancy_loop())
+
+    async def _occupancy_loop(self):
+        me = self._task
+        # fine enough for a hold in seconds and a per-minute duty cycle
+        while self._task is me:
+            self.update()
+            await asyncio.sleep_ms(1000)
@@ -15,16 +15,21 @@ class MethodWrapper:
 
 # oled_wrapper.py  ──────────────────────────────────────────────────────
 from .ssd1306 import SSD1306_I2C as _Base       # official MicroPython driver
-from machine   import I2C, Pin
+from i2c_bus   import get_bus
+from logger    import get_logger
 import framebuf
 
+_log = get_logger("oled")
+
 class OLED(_Base):
     """SSD1306 128×64 OLED wrapper with normal & tiny fonts."""
 
-    # ───────────────── constructor (no args) ──────────────────────────
-    def __init__(self):
-        i2c = I2C(0, scl=Pin(22), sda=Pin(21))        # edit pins if needed
-        super().__init__(128, 64, i2c, addr=0x3C, external_vcc=False)
+    # ───────────────── constructor ────────────────────────────────────
+    def __init__(self, *, bus=None, scl=22, sda=21, freq=400000, addr=0x3C):
+        # shares the hardware bus with any other driver on the same pins;
+        # bus may also be an existing I2C/SharedBus object
+        i2c = bus if bus is not None else get_bus(scl=scl, sda=sda, freq=freq)
+        super().__init__(128, 64, i2c, addr=addr, external_vcc=False)
 
         # temp 8×8 buffer for downsizing characters to 4×6
         self._tmp_buf = bytearray(8)                  # 8×8 / 8 = 8 bytes
@@ -85,9 +90,8 @@ class OLED(_Base):
         """Clear screen, then write `text` on `row` with chosen font size."""
         #self.clear()
         parts = text.split(",")
-        print('this is text')
-        print('this is parts : ', parts)
-        print('this is reserve map: ', self.reserveMap)
+        if _log.debug_on:
+            _log.debug("write %r, parts %r, reserve map %r", text, parts, self.reserveMap)
         if(parts[0] in self.reserveMap):
             self.write_line(text, self.reserveMap[parts[0]] , clear_line=False, col=col, tiny=tiny) 
         else:
@@ -1,31 +1,77 @@
 # edge_detector.py
 import machine, micropython
 import time
+from array import array
+from logger import get_logger
+
+_log = get_logger("edge")
+
 
 class EdgeDetector:
     """
     Detect rising/falling edges on a GPIO pin and notify a watcher:
     Calls: watch_state(peripheral_name, { field_name: True/False })
+
+    The hard IRQ only stamps each edge (ticks_us, level) into a preallocated
+    ring and makes sure one drain is scheduled; the drain then handles every
+    pending edge in order. Nothing is lost while a drain is pending; edges
+    are only dropped when the ring itself is full (counted in `overflows`).
+    ring_size must be a power of two.
+
+    With hub=<gpio_hub.GPIOHub> the detector registers with the shared hub
+    instead of installing its own IRQ; the hub's dispatcher then delivers
+    the edges and the local ring is not allocated.
+
+    events() returns an async iterator of (level, ticks_us) for every edge
+    that passes debounce, alongside watch_state:
+        async for level, t_us in sensor.events():
+            ...
     """
 
     def __init__(self, pin_num, *, pull=None, watch_state=None,
                  peripheral_name="device", field_name="state",
-                 debounce_ms=0):
+                 debounce_ms=0, ring_size=32, hub=None):
+        if ring_size & (ring_size - 1):
+            raise ValueError("ring_size must be a power of two")
         self.pin = machine.Pin(pin_num, machine.Pin.IN, pull)
+        self._hub = hub
         self._watch_state = watch_state
         self._saved_watch_state = watch_state
         self._peripheral_name = peripheral_name
         self._field_name = field_name
         self._debounce_ms = debounce_ms
-        self._last_evt_ms = 0
+        self._debounce_us = debounce_ms * 1000
+        self._last_evt_us = None
         self._last_level = None
-        self._busy = 0
+        self._edge_us = 0              # timestamp of the edge being dispatched
+        self._streams = []
+
+        # counters
+        self.edges = 0                 # edges taken out of the ring
+        self.overflows = 0             # edges lost to a full ring
+        self.sched_fails = 0           # schedule queue full, retried on next edge
+        self.debounced = 0             # edges filtered by debounce_ms
+
+        self._head = 0
+        self._tail = 0
+        self._mask = 0
+        if hub is not None:
+            hub.register(self.pin, self._edge)
+            return
+
+        # edge ring: written by the IRQ (head), read by the drain (tail)
+        self._ring_t = array('L', [0] * ring_size)
+        self._ring_l = bytearray(ring_size)
+        self._mask = ring_size - 1
+        self._pending = False
+        self._drain_ref = self._drain  # bound method allocated once, not per IRQ
 
         micropython.alloc_emergency_exception_buf(100)
 
         self.pin.irq(
             trigger=machine.Pin.IRQ_RISING | machine.Pin.IRQ_FALLING,
             handler=self._irq_handler,
+            hard=True,
         )
 
     def watch_state(self, fn):
@@ -44,28 +90,79 @@ class EdgeDetector:
         self._saved_watch_state = self._watch_state
         self._watch_state = None
 
+    def events(self, size=16, policy="drop_oldest"):
+        """New gpio_hub.EventStream fed with every edge; close() it when
+        done. See EventStream for the backpressure policies."""
+        from gpio_hub import EventStream
+        s = EventStream(size, policy, self._streams.remove)
+        self._streams.append(s)
+        return s
+
+    def edge_stats(self):
+        return {
+            "edges": self.edges,
+            "pending": (self._head - self._tail) & self._mask,
+            "overflows": self.overflows,
+            "sched_fails": self.sched_fails,
+            "debounced": self.debounced,
+        }
+
+    def poll(self):
+        """Drain pending edges now (e.g. after a failed schedule)."""
+        if self._hub is not None:
+            self._hub.poll()
+        else:
+            self._drain(0)
+
     # ───────── internal ─────────
     def _irq_handler(self, pin):
-        level = pin.value()
-        if self._busy == 0:
-            self._busy = 1 if level else -1
+        # hard IRQ: no allocation, only array/int stores
+        h = self._head
+        nxt = (h + 1) & self._mask
+        if nxt == self._tail:
+            self.overflows += 1
+        else:
+            self._ring_t[h] = time.ticks_us()
+            self._ring_l[h] = pin.value()
+            self._head = nxt
+        if not self._pending:
+            self._pending = True
             try:
-                micropython.schedule(self._dispatch, level)
+                micropython.schedule(self._drain_ref, 0)
             except RuntimeError:
-                # Schedule queue is full – drop this event
-                self._busy = 0
-
+                # schedule queue full; the edge stays in the ring
+                self._pending = False
+                self.sched_fails += 1
+
+    def _drain(self, _):
+        # cleared first: an edge arriving during the drain schedules another
+        self._pending = False
+        tail = self._tail
+        while tail != self._head:
+            t = self._ring_t[tail]
+            level = self._ring_l[tail]
+            tail = (tail + 1) & self._mask
+            self._tail = tail
+            self._edge(level, t)
+
+    def _edge(self, level, t):
+        # one captured edge, from the local drain or the hub's dispatcher
+        self.edges += 1
+        # debounce on the edge timestamps, not on when the drain runs;
+        # a negative diff means ticks_us wrapped after a long quiet time
+        if self._debounce_us:
+            if self._last_evt_us is not None:
+                d = time.ticks_diff(t, self._last_evt_us)
+                if 0 <= d < self._debounce_us:
+                    self.debounced += 1
+                    return
+            self._last_evt_us = t
+        self._edge_us = t
+        for s in self._streams:
+            s.push(level, t)
+        self._dispatch(level)
 
     def _dispatch(self, level):
-        self._busy = 0  # Ensure busy is cleared even on debounce
-        now = time.ticks_ms()
-
-        # Debounce
-        if self._debounce_ms:
-            if time.ticks_diff(now, self._last_evt_ms) < self._debounce_ms:
-                return
-            self._last_evt_ms = now
-
         # Skip same level if no debounce (for gas/PIR)
         if not self._debounce_ms and level == self._last_level:
             return
@@ -78,6 +175,4 @@ class EdgeDetector:
                     self._field_name: bool(level)
                 })
             except Exception as exc:
-                print(f"{self._peripheral_name} watch_state error:", exc)
-
-
+                _log.error("%s watch_state error: %s", self._peripheral_name, exc)
@@ -8,11 +8,16 @@ class MethodWrapper:
         else:
             return self.func(args)
 
+from logger import get_logger
+
+_log = get_logger("relay")
+
 class Relay:
-    def __init__(self, pin, active_high=True, simulate=False):
+    def __init__(self, pin, active_high=True, simulate=False, verbose=True):
         self.pin = pin
         self.active_high = active_high
         self.simulate = simulate
+        self.verbose = verbose
         self._state = False  # Relay is initially off
         self._on_change = None  # NEW: callback for state changes
 
@@ -20,7 +25,8 @@ class Relay:
             from machine import Pin
             self._relay = Pin(pin, Pin.OUT)
 
-        print(f"[INIT] Relay on pin {pin} (active_high={active_high}, simulate={simulate})")
+        if self.verbose:
+            _log.info("Relay on pin %s (active_high=%s, simulate=%s)", pin, active_high, simulate)
 
     def __getitem__(self, key):
         method = getattr(self, key)
@@ -52,4 +58,5 @@ class Relay:
                 self._relay(1 if self._state == self.active_high else 0)
             if self._on_change:
                 self._on_change("relay", ("state", self._state))
-            print(f"[Relay] {'ON' if self._state else 'OFF'} (triggered)")
+            if self.verbose:
+                _log.debug("pin %s %s", self.pin, "ON" if self._state else "OFF")
@@ -1 +1,2 @@
 from .driver import Servo
+from .motion import ServoGroup
@@ -15,14 +15,31 @@ class MethodWrapper:
 
 
 from machine import Pin, PWM
+from array import array
+from . import motion
 
 class Servo:
+    """
+    Hobby servo on a PWM pin.
+
+    The pulse is written with duty_ns() where the port has it, else
+    duty_u16(), and only falls back to the 10-bit duty(); at 50 Hz that is
+    ~20 us per step, about 2 degrees on a 180 degree servo. Angles go
+    through a table of the output value per whole degree, built once, with
+    linear interpolation in between.
+
+    move_to() glides to an angle without blocking the event loop, see
+    servo_motor.motion for the profiles; angle() still jumps at once.
+    """
+
     def __init__(self,
                  pin: int | Pin,
                  freq: int = 50,
                  min_us: int = 500,
                  max_us: int = 2500,
-                 angle_range: int = 180):
+                 angle_range: int = 180,
+                 speed: float = 120,
+                 tick_ms: int = 20):
 
         self._pwm = PWM(pin if isinstance(pin, Pin) else Pin(pin), freq=freq)
 
@@ -32,7 +49,22 @@ class Servo:
         self._max_us      = max_us
         self._angle_range = angle_range
         self._us_per_deg  = (max_us - min_us) / angle_range
-        self._duty_max    = 1023                       # ESP32 → 10-bit PWM
+        self.speed        = speed                      # deg/s for move_to()
+        self.tick_ms      = tick_ms
+        self._traj        = None                       # move in progress
+
+        # best available output and its units per microsecond of pulse
+        if hasattr(self._pwm, "duty_ns"):
+            self._out, self._per_us = self._pwm.duty_ns, 1000
+        elif hasattr(self._pwm, "duty_u16"):
+            self._out, self._per_us = self._pwm.duty_u16, 65535 / self._period_us
+        else:
+            self._out, self._per_us = self._pwm.duty, 1023 / self._period_us
+
+        # output value per whole degree, 0..angle_range
+        self._lut = array('L', [
+            int((min_us + d * self._us_per_deg) * self._per_us)
+            for d in range(angle_range + 1)])
 
         self._current_deg = angle_range // 2           # default start
         self.angle(self._current_deg)
@@ -44,21 +76,56 @@ class Servo:
     def write_us(self, us: int) -> None:
         """Directly set the high-time in microseconds."""
         us = max(self._min_us, min(self._max_us, us))
-        duty = int(us * self._duty_max / self._period_us)
-        self._pwm.duty(duty)
+        self._out(int(us * self._per_us))
+
+    def _clamp(self, degrees):
+        return max(0, min(degrees, self._angle_range))
+
+    def _write_angle(self, degrees):
+        lut = self._lut
+        i = int(degrees)
+        if i >= self._angle_range:
+            self._out(lut[self._angle_range])
+        else:
+            d0 = lut[i]
+            self._out(d0 + int((lut[i + 1] - d0) * (degrees - i)))
+        self._current_deg = degrees
 
     # ---------- high-level helpers ---------- #
     def angle(self, degrees: float | int) -> None:
-        """Move servo to `degrees` (0 → angle_range)."""
-        degrees = max(0, min(degrees, self._angle_range))
-        us = int(self._min_us + degrees * self._us_per_deg)
-        self.write_us(us)
-        self._current_deg = degrees                    # remember the target
+        """Move servo to `degrees` (0 → angle_range) at once, cancelling
+        any move_to() in progress."""
+        self._traj = None
+        self._write_angle(self._clamp(degrees))
 
     def get_angle(self) -> float:
-        """Return the last angle value passed to `angle()` (degrees)."""
+        """Return the angle last written, including mid-move (degrees)."""
         return self._current_deg
 
+    async def move_to(self, degrees, *, duration_ms=None, speed=None,
+                      profile=motion.TRAPEZOID):
+        """
+        Glide to `degrees` over duration_ms, or as fast as `speed` deg/s
+        (default self.speed) allows. profile: "trapezoid", "ease" or
+        "linear". Returns on arrival, or early when another move_to(),
+        angle() or stop() takes over.
+        """
+        degrees = self._clamp(degrees)
+        if duration_ms is None:
+            duration_ms = motion.duration_ms(degrees - self._current_deg,
+                                             speed or self.speed, profile)
+        t = motion.Trajectory(self, self._current_deg, degrees, duration_ms, profile)
+        self._traj = t
+        await motion.run([t], self.tick_ms)
+
+    def moving(self) -> bool:
+        return self._traj is not None
+
+    def stop(self) -> None:
+        """Hold the current angle and end any move in progress."""
+        self._traj = None
+
     def deinit(self) -> None:
         """Release the PWM peripheral when finished."""
-        self._pwm.deinit()
\ No newline at end of file
+        self._traj = None
+        self._pwm.deinit()
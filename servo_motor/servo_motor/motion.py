@@ -0,0 +1,133 @@
+# motion.py
+# Timed moves for Servo: a trajectory maps elapsed time to an angle, and
+# ServoGroup advances any number of them from one asyncio task per tick.
+#
+#     arm = ServoGroup([base, shoulder, elbow])
+#     await arm.move((90, 45, 120), speed=60)          # all arrive together
+#     await base.move_to(10, duration_ms=800, profile="ease")
+
+from time import ticks_ms, ticks_diff
+import uasyncio as asyncio
+
+LINEAR = "linear"
+EASE = "ease"
+TRAPEZOID = "trapezoid"
+
+# peak speed of each profile relative to the mean speed of the move; the
+# trapezoid spends RAMP of the move accelerating and RAMP decelerating
+RAMP = 0.25
+_PEAK = {LINEAR: 1.0, EASE: 1.5, TRAPEZOID: 1.0 / (1.0 - RAMP)}
+
+
+def _shape(profile, u):
+    """Fraction of the distance covered at fraction u of the time."""
+    if u >= 1.0:
+        return 1.0
+    if profile == EASE:
+        return u * u * (3.0 - 2.0 * u)             # smoothstep
+    if profile == TRAPEZOID:
+        v = _PEAK[TRAPEZOID]
+        if u < RAMP:
+            return 0.5 * v / RAMP * u * u
+        if u > 1.0 - RAMP:
+            r = 1.0 - u
+            return 1.0 - 0.5 * v / RAMP * r * r
+        return v * (u - 0.5 * RAMP)
+    return u
+
+
+def duration_ms(distance, speed, profile=TRAPEZOID):
+    """Shortest move over `distance` degrees whose peak stays at `speed` deg/s."""
+    if profile not in _PEAK:
+        raise ValueError("profile must be 'linear', 'ease' or 'trapezoid'")
+    if speed <= 0:
+        raise ValueError("speed must be positive")
+    return int(abs(distance) * _PEAK[profile] * 1000 / speed)
+
+
+class Trajectory:
+    """One servo moving from `start` to `end` over `ms` milliseconds."""
+
+    def __init__(self, servo, start, end, ms, profile):
+        self.servo = servo
+        self.start = start
+        self.delta = end - start
+        self.end = end
+        self.ms = ms
+        self.profile = profile
+        self.t0 = ticks_ms()
+
+    def step(self, now):
+        """Write the angle due at `now`; True once the move is finished."""
+        dt = ticks_diff(now, self.t0)
+        if dt >= self.ms:
+            self.servo._write_angle(self.end)
+            return True
+        self.servo._write_angle(self.start + self.delta * _shape(self.profile, dt / self.ms))
+        return False
+
+
+class ServoGroup:
+    """
+    Servos moved in lockstep: move() gives every servo the same duration,
+    the one the slowest of them needs, and one task writes all of them each
+    tick_ms (20 ms = one frame of a 50 Hz servo signal).
+    """
+
+    def __init__(self, servos, tick_ms=20):
+        self.servos = list(servos)
+        self.tick_ms = tick_ms
+
+    def __len__(self):
+        return len(self.servos)
+
+    def _plan(self, targets, duration_ms_, speed, profile):
+        if len(targets) != len(self.servos):
+            raise ValueError("need one target per servo")
+        if duration_ms_ is None:
+            duration_ms_ = 0
+            for s, a in zip(self.servos, targets):
+                if a is not None:
+                    d = duration_ms(s._clamp(a) - s.get_angle(),
+                                    speed or s.speed, profile)
+                    if d > duration_ms_:
+                        duration_ms_ = d
+        trajs = []
+        for s, a in zip(self.servos, targets):
+            if a is not None:
+                t = Trajectory(s, s.get_angle(), s._clamp(a), duration_ms_, profile)
+                s._traj = t                # takes the servo from any other move
+                trajs.append(t)
+        return trajs
+
+    async def move(self, targets, *, duration_ms=None, speed=None,
+                   profile=TRAPEZOID):
+        """
+        Move servo i to targets[i] (None leaves it alone). Without
+        duration_ms the move takes as long as the servo with the furthest
+        way needs at `speed` deg/s (default: each servo's own .speed).
+        Returns when all have arrived or were taken over by another move.
+        """
+        await run(self._plan(targets, duration_ms, speed, profile), self.tick_ms)
+
+    def stop(self):
+        for s in self.servos:
+            s.stop()
+
+
+async def run(trajs, tick_ms):
+    """Advance trajectories until all are done or superseded."""
+    while trajs:
+        now = ticks_ms()
+        i = 0
+        while i < len(trajs):
+            t = trajs[i]
+            # a later move_to()/angle() on the servo replaces this one
+            if t.servo._traj is not t or t.step(now):
+                if t.servo._traj is t:
+                    t.servo._traj = None
+                trajs.pop(i)
+            else:
+                i += 1
+        if trajs:
+            await asyncio.sleep_ms(tick_ms)
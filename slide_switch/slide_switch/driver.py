@@ -8,17 +8,23 @@ class MethodWrapper:
         else:
             return self.func(args)
 
+from logger import get_logger
+
+_log = get_logger("switch")
+
 class SlideSwitch:
-    def __init__(self, pin, simulate=True):
+    def __init__(self, pin, simulate=True, verbose=True):
         self.pin = pin
         self.simulate = simulate
+        self.verbose = verbose
         self._state = False  # False = OFF, True = ON
 
         if not self.simulate:
             from machine import Pin
             self._switch = Pin(pin, Pin.IN, Pin.PULL_UP)
 
-        print(f"[INIT] SlideSwitch on pin {pin} (simulate={simulate})")
+        if self.verbose:
+            _log.info("SlideSwitch on pin %s (simulate=%s)", pin, simulate)
     
     def __getitem__(self, key):
         method = getattr(self, key)
@@ -28,7 +34,8 @@ class SlideSwitch:
         """Set simulated position (True = ON, False = OFF)"""
         if self.simulate:
             self._state = state
-            print(f"[SIM SET] SlideSwitch state set to: {'ON' if state else 'OFF'}")
+            if self.verbose:
+                _log.debug("simulated state set to %s", "ON" if state else "OFF")
 
     def read(self):
         if self.simulate:
@@ -0,0 +1,4 @@
+from .rng import XorShift32
+from .synthetic import SyntheticSource
+from .traces import BinaryTrace, CsvTrace, open_trace, record
+from .replay import Replay
@@ -0,0 +1,128 @@
+# replay.py
+# Serves frames from a source (trace file or synthetic generator) to a
+# simulated driver, one frame per read or paced by the clock.
+
+from array import array
+
+try:
+    from time import ticks_ms, ticks_diff
+except ImportError:                      # CPython
+    from time import monotonic
+
+    def ticks_ms():
+        return int(monotonic() * 1000)
+
+    def ticks_diff(a, b):
+        return a - b
+
+
+class Replay:
+    """
+    time_scale=None: free-running, every read returns the next frame, so a
+                     pipeline runs through the trace as fast as it can read.
+    time_scale=k:    paced, the frame returned is the one at k times the
+                     elapsed wall time (k=60 plays a minute per second);
+                     reads faster than the trace rate repeat the last frame.
+    loop:            rewind at the end instead of holding the last frame.
+
+        rp = Replay(open_trace("/traces/kitchen.trc"), loop=True)
+        rp.read_into(frame)
+    """
+
+    def __init__(self, source, *, time_scale=None, loop=True, block=64):
+        self.source = source
+        self.channels = source.channels
+        self.rate_hz = source.rate_hz
+        self.time_scale = time_scale
+        self.loop = loop
+        self._buf = array('f', [0.0] * (self.channels * block))
+        self._block = block
+        self._n = 0            # frames in _buf
+        self._i = 0            # next frame in _buf
+        self._last = 0         # offset of the last frame served
+        self._pos = 0          # frames consumed from the start of the trace
+        self._t0 = None
+        self.frames = 0
+        self.loops = 0
+        self.exhausted = False
+
+    def rewind(self):
+        self.source.rewind()
+        self._n = self._i = self._pos = 0
+        self._t0 = None
+        self.exhausted = False
+
+    def _fill(self):
+        n = self.source.read_block(self._buf, self._block)
+        if not n and self.loop and self._pos:
+            self.source.rewind()
+            self.loops += 1
+            n = self.source.read_block(self._buf, self._block)
+        self._n = n
+        self._i = 0
+        return n
+
+    def _advance(self):
+        # moves to the next frame; False when the trace has ended
+        if self._i >= self._n and not self._fill():
+            self.exhausted = True
+            return False
+        self._last = self._i * self.channels
+        self._i += 1
+        self._pos += 1
+        self.frames += 1
+        return True
+
+    def _catch_up(self):
+        now = ticks_ms()
+        if self._t0 is None:
+            self._t0 = now
+        target = int(ticks_diff(now, self._t0) * self.time_scale *
+                     self.rate_hz / 1000)
+        # skip whole frames the clock has already passed, the last one is read
+        while self._pos < target:
+            if not self._advance():
+                break
+        if self._pos == 0:
+            self._advance()
+
+    def read_into(self, out):
+        """Copy the current frame into out; returns False once the trace
+        has ended (out then keeps the last frame)."""
+        if self.time_scale is None:
+            self._advance()
+        else:
+            self._catch_up()
+        if self._pos == 0:
+            return False
+        buf = self._buf
+        j = self._last
+        for i in range(self.channels):
+            out[i] = buf[j + i]
+        return not self.exhausted
+
+    def read(self):
+        out = [0.0] * self.channels
+        self.read_into(out)
+        return tuple(out)
+
+    def read_block(self, buf, frames):
+        """Up to `frames` consecutive frames straight from the source,
+        looping if enabled. Bypasses pacing; for bulk pipelines."""
+        done = self.source.read_block(buf, frames)
+        if done < frames and self.loop:
+            c = self.channels
+            while done < frames:
+                self.source.rewind()
+                self.loops += 1
+                view = memoryview(buf)[done * c:]
+                n = self.source.read_block(view, frames - done)
+                if not n:
+                    break
+                done += n
+        self.frames += done
+        self._n = self._i = 0
+        return done
+
+    def close(self):
+        self.source.close()
@@ -0,0 +1,33 @@
+# rng.py
+# Small seeded generator so every simulated device has its own repeatable
+# sample stream, independent of the global `random` state.
+
+_MASK = 0xFFFFFFFF
+_INV = 1.0 / 4294967296.0
+
+
+class XorShift32:
+    def __init__(self, seed=1):
+        self.seed(seed)
+
+    def seed(self, seed):
+        # scramble small seeds (0, 1, 2, ...) so neighbours do not correlate
+        s = (seed * 2654435761 + 0x9E3779B9) & _MASK
+        self._s = s or 0x6D2B79F5
+
+    def next(self):
+        s = self._s
+        s ^= (s << 13) & _MASK
+        s ^= s >> 17
+        s ^= (s << 5) & _MASK
+        self._s = s
+        return s
+
+    def random(self):
+        """Uniform float in [0, 1)."""
+        return self.next() * _INV
+
+    def gauss(self):
+        """Approximately standard normal (sum of four uniforms)."""
+        return (self.random() + self.random() + self.random() +
+                self.random() - 2.0) * 1.7320508
@@ -0,0 +1,114 @@
+# synthetic.py
+# Block generator of synthetic sensor samples: baseline + white noise +
+# mean-reverting drift + occasional decaying events. fill() produces a whole
+# block of frames into a caller-owned array('f') in one call.
+
+from array import array
+from math import sqrt
+
+from .rng import XorShift32
+
+
+def _per_channel(value, channels):
+    if isinstance(value, (int, float)):
+        return array('f', [value] * channels)
+    if len(value) != channels:
+        raise ValueError("expected {} values".format(channels))
+    return array('f', value)
+
+
+class SyntheticSource:
+    """
+    base:        per-channel baseline value.
+    noise:       white-noise standard deviation per channel.
+    drift:       random-walk step per channel (units per sqrt(second)),
+                 pulled back to the baseline with time constant drift_tau_s.
+    event_rate:  events per second (any channel set).
+    event_amp:   peak event amplitude per channel; the sign is random.
+    event_ms:    event length; the amplitude decays linearly to zero.
+
+        src = SyntheticSource((24.0, 50.0), noise=(0.1, 0.3), seed=7)
+        buf = array('f', [0] * 2 * 256)
+        n = src.read_block(buf, 256)
+    """
+
+    def __init__(self, base, *, noise=0.0, drift=0.0, drift_tau_s=600,
+                 event_rate=0.0, event_amp=0.0, event_ms=500, rate_hz=100,
+                 seed=1):
+        self.channels = len(base)
+        self.rate_hz = rate_hz
+        c = self.channels
+        self._base = _per_channel(base, c)
+        self._noise = _per_channel(noise, c)
+        self._drift = _per_channel(drift, c)
+        self._amp = _per_channel(event_amp, c)
+        self._walk = array('f', [0.0] * c)
+        self._event = array('f', [0.0] * c)    # current event amplitude
+        self._event_step = array('f', [0.0] * c)
+        self._seed = seed
+        self._drift_step = 1.0 / sqrt(rate_hz)
+        self._decay = 1.0 - 1.0 / (drift_tau_s * rate_hz) if drift_tau_s else 1.0
+        self._event_p = event_rate / rate_hz
+        self._event_len = max(1, int(event_ms * rate_hz // 1000))
+        self._event_left = 0
+        self.rng = XorShift32(seed)
+        self.index = 0
+        self.events = 0
+
+    def rewind(self):
+        self.rng.seed(self._seed)
+        for i in range(self.channels):
+            self._walk[i] = 0.0
+            self._event[i] = 0.0
+        self._event_left = 0
+        self.index = 0
+        self.events = 0
+
+    def skip(self, frames):
+        # keeps the random sequence identical to reading the frames
+        buf = array('f', [0.0] * self.channels)
+        for _ in range(frames):
+            self.read_block(buf, 1)
+        return frames
+
+    def read_block(self, buf, frames):
+        """Fill buf with `frames` frames (channels floats each). Never ends."""
+        c = self.channels
+        rng = self.rng
+        base = self._base
+        noise = self._noise
+        drift = self._drift
+        walk = self._walk
+        event = self._event
+        step = self._event_step
+        decay = self._decay
+        dstep = self._drift_step
+        p = self._event_p
+        j = 0
+        for _ in range(frames):
+            if self._event_left:
+                self._event_left -= 1
+            elif p and rng.random() < p:
+                self._event_left = self._event_len
+                self.events += 1
+                sign = 1.0 if rng.next() & 1 else -1.0
+                for i in range(c):
+                    event[i] = sign * self._amp[i]
+                    step[i] = event[i] / self._event_len
+            for i in range(c):
+                w = walk[i] * decay + drift[i] * dstep * rng.gauss()
+                walk[i] = w
+                v = base[i] + w + event[i]
+                if noise[i]:
+                    v += noise[i] * rng.gauss()
+                if self._event_left:
+                    event[i] -= step[i]
+                else:
+                    event[i] = 0.0
+                buf[j] = v
+                j += 1
+        self.index += frames
+        return frames
+
+    def close(self):
+        pass
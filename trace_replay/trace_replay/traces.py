@@ -0,0 +1,158 @@
+# traces.py
+# Recorded sensor traces, binary or CSV, read in blocks.
+#
+# Binary layout (little-endian):
+#     header  "<4sBBf"  magic b"TRC1", typecode ('h' or 'f'), channels, rate_hz
+#     scales  "<{channels}f"  value = stored * scale ('f' traces use 1.0)
+#     frames  channels values of the typecode per frame
+# Blocks are read straight into a preallocated array with readinto(), so a
+# trace of any length streams in constant memory without a parse step.
+#
+# CSV: a header row of column names, then one frame per row. An optional
+# "t" column (seconds) is ignored; rate_hz is given by the caller.
+
+from array import array
+import struct
+
+_HDR = "<4sBBf"
+_MAGIC = b"TRC1"
+
+
+class BinaryTrace:
+    def __init__(self, path, block=256):
+        self.path = path
+        self._f = open(path, "rb")
+        magic, tc, channels, rate_hz = struct.unpack(
+            _HDR, self._f.read(struct.calcsize(_HDR)))
+        if magic != _MAGIC or tc not in (ord('h'), ord('f')):
+            self._f.close()
+            raise ValueError("not a trace file: {}".format(path))
+        self.channels = channels
+        self.rate_hz = rate_hz
+        self.typecode = chr(tc)
+        self.scales = array('f', struct.unpack(
+            "<{}f".format(channels), self._f.read(4 * channels)))
+        self._data_start = struct.calcsize(_HDR) + 4 * channels
+        self._frame_bytes = channels * (2 if self.typecode == 'h' else 4)
+        self._raw = array(self.typecode, [0] * (channels * block))
+        self._block = block
+        self.index = 0
+
+    def rewind(self):
+        self._f.seek(self._data_start)
+        self.index = 0
+
+    def skip(self, frames):
+        self._f.seek(frames * self._frame_bytes, 1)
+        self.index += frames
+        return frames
+
+    def read_block(self, buf, frames):
+        """Fill buf with up to `frames` frames; returns how many (0 at end)."""
+        c = self.channels
+        raw = self._raw
+        scales = self.scales
+        done = 0
+        while done < frames:
+            want = min(frames - done, self._block)
+            if want == self._block:
+                n = self._f.readinto(raw)
+            else:
+                n = self._f.readinto(memoryview(raw)[:want * c])
+            n = (n or 0) // self._frame_bytes
+            j = done * c
+            for k in range(n * c):
+                buf[j + k] = raw[k] * scales[k % c]
+            done += n
+            if n < want:
+                break
+        self.index += done
+        return done
+
+    def close(self):
+        self._f.close()
+
+
+class CsvTrace:
+    def __init__(self, path, columns=None, rate_hz=1.0):
+        self.path = path
+        self._f = open(path, "r")
+        names = [s.strip() for s in self._f.readline().split(",")]
+        if columns is None:
+            columns = [n for n in names if n != "t"]
+        self._cols = [names.index(n) for n in columns]
+        self.columns = columns
+        self.channels = len(columns)
+        self.rate_hz = rate_hz
+        self.index = 0
+
+    def rewind(self):
+        self._f.seek(0)
+        self._f.readline()
+        self.index = 0
+
+    def skip(self, frames):
+        n = 0
+        while n < frames and self._f.readline():
+            n += 1
+        self.index += n
+        return n
+
+    def read_block(self, buf, frames):
+        c = self.channels
+        cols = self._cols
+        done = 0
+        while done < frames:
+            line = self._f.readline()
+            if not line:
+                break
+            line = line.strip()
+            if not line:
+                continue
+            row = line.split(",")
+            j = done * c
+            for i in range(c):
+                buf[j + i] = float(row[cols[i]])
+            done += 1
+        self.index += done
+        return done
+
+    def close(self):
+        self._f.close()
+
+
+def open_trace(path, **kwargs):
+    """CsvTrace for *.csv, BinaryTrace otherwise."""
+    if path.endswith(".csv"):
+        return CsvTrace(path, **kwargs)
+    return BinaryTrace(path, **kwargs)
+
+
+def record(path, source, frames, *, typecode='h', scales=None, block=256):
+    """Write `frames` frames of any source (e.g. a SyntheticSource) to a
+    binary trace. For 'h' traces, scales gives the resolution per channel
+    (default 0.001)."""
+    c = source.channels
+    if typecode == 'f':
+        scales = [1.0] * c
+    elif scales is None:
+        scales = [0.001] * c
+    buf = array('f', [0.0] * (c * block))
+    raw = array(typecode, [0] * (c * block))
+    written = 0
+    with open(path, "wb") as f:
+        f.write(struct.pack(_HDR, _MAGIC, ord(typecode), c, source.rate_hz))
+        f.write(struct.pack("<{}f".format(c), *scales))
+        while written < frames:
+            n = source.read_block(buf, min(block, frames - written))
+            if not n:
+                break
+            for k in range(n * c):
+                v = buf[k]
+                if typecode == 'h':
+                    v = int(round(v / scales[k % c]))
+                    v = -32768 if v < -32768 else 32767 if v > 32767 else v
+                raw[k] = v
+            f.write(memoryview(raw)[:n * c])
+            written += n
+    return written
@@ -1,5 +1,7 @@
 import machine
+import micropython
 import time
+import uasyncio as asyncio
 
 class MethodWrapper:
     def __init__(self, func):
@@ -15,29 +17,203 @@ class MethodWrapper:
         else:
             return self.func(args)
         
+# round trip of sound at ~20 degC: 58.3 us per cm of distance
+_US_PER_CM = 58.3
+
+
 class UltrasonicSensor:
-    def __init__(self, trig_pin, echo_pin):
+    """
+    HC-SR04 style ranger.
+
+    get_distance() waits on the echo with machine.time_pulse_us, so a
+    missing echo costs at most 2 * timeout_us instead of hanging (the
+    timeout applies to the wait for the rising edge and again to the
+    pulse itself). It never waits out min_interval_ms: a ping asked for
+    too soon after the previous one returns None and counts as busy.
+    measure() does the same without blocking: it sleeps out the interval,
+    a hard IRQ on the echo pin stamps both edges and the coroutine sleeps
+    until the falling one (or the timeout). Both return cm, or None when
+    there was no valid echo; misses are counted in stats().
+
+    burst()/measure_burst() take n pings and reduce them with a median or
+    a trimmed mean after dropping readings further than max_dev_cm (or
+    max_dev_rel of the median, whichever is larger) from the median.
+    """
+
+    def __init__(self, trig_pin, echo_pin, *, timeout_us=30000,
+                 min_cm=2, max_cm=400, min_interval_ms=60):
         self.trig = machine.Pin(trig_pin, machine.Pin.OUT)
         self.echo = machine.Pin(echo_pin, machine.Pin.IN)
         self.trig.off()
-        
+        self._timeout_us = timeout_us
+        self._min_cm = min_cm
+        self._max_cm = max_cm
+        # echoes of the previous ping must die out before the next one
+        self._min_interval_ms = min_interval_ms
+        self._last_ping_ms = time.ticks_add(time.ticks_ms(), -min_interval_ms)
+
+        # async path: edge times written by the echo IRQ
+        self._t_rise = 0
+        self._t_fall = 0
+        self._rose = False
+        self._flag = None
+        self._armed = False
+        self._lock = None
+
+        self.pings = 0
+        self.timeouts = 0              # no echo, or one longer than timeout_us
+        self.busy = 0                  # too soon, or echo still high from an earlier ping
+        self.out_of_range = 0
+
     def __getitem__(self, key):
         method = getattr(self, key)
         return MethodWrapper(method)
 
-    def get_distance(self):
+    # ───────── helpers ─────────
+    def _trigger(self):
         self.trig.off()
         time.sleep_us(2)
         self.trig.on()
         time.sleep_us(10)
         self.trig.off()
+        self._last_ping_ms = time.ticks_ms()
+        self.pings += 1
+
+    def _to_cm(self, us):
+        cm = us / _US_PER_CM
+        if cm < self._min_cm or cm > self._max_cm:
+            self.out_of_range += 1
+            return None
+        return cm
+
+    def _wait_ms(self):
+        return self._min_interval_ms - time.ticks_diff(time.ticks_ms(), self._last_ping_ms)
+
+    # ───────── blocking ─────────
+    def get_distance(self):
+        """One ping, blocking for at most ~2 * timeout_us; cm or None.
+        None without pinging within min_interval_ms of the last ping."""
+        if self._armed:
+            self._disarm()
+        if self._wait_ms() > 0 or self.echo.value():
+            self.busy += 1
+            return None
+        self._trigger()
+        us = machine.time_pulse_us(self.echo, 1, self._timeout_us)
+        if us < 0:
+            self.timeouts += 1
+            return None
+        return self._to_cm(us)
+
+    def burst(self, n=5, **kwargs):
+        """n blocking pings reduced by filter_readings(); cm or None.
+        Sleeps min_interval_ms between pings, so it blocks for about
+        n * (min_interval_ms + timeout_us)."""
+        readings = []
+        for _ in range(n):
+            wait = self._wait_ms()
+            if wait > 0:
+                time.sleep_ms(wait)
+            readings.append(self.get_distance())
+        return filter_readings(readings, **kwargs)
+
+    # ───────── async ─────────
+    def _arm(self):
+        if self._flag is None:
+            self._flag = asyncio.ThreadSafeFlag()
+            self._lock = asyncio.Lock()
+            micropython.alloc_emergency_exception_buf(100)
+        self.echo.irq(handler=self._echo_irq,
+                      trigger=machine.Pin.IRQ_RISING | machine.Pin.IRQ_FALLING,
+                      hard=True)
+        self._armed = True
+
+    def _disarm(self):
+        self.echo.irq(handler=None)
+        self._armed = False
+
+    def _echo_irq(self, pin):
+        t = time.ticks_us()
+        if pin.value():
+            self._t_rise = t
+            self._rose = True
+        elif self._rose:
+            self._t_fall = t
+            self._flag.set()
+
+    async def measure(self):
+        """One ping without blocking the event loop; cm or None."""
+        if not self._armed:
+            self._arm()
+        async with self._lock:
+            wait = self._wait_ms()
+            if wait > 0:
+                await asyncio.sleep_ms(wait)
+            if self.echo.value():
+                self.busy += 1
+                return None
+            self._rose = False
+            self._flag.clear()
+            self._trigger()
+            try:
+                # the echo starts ~0.5 ms after the trigger; allow for that
+                await asyncio.wait_for_ms(self._flag.wait(),
+                                          self._timeout_us // 1000 + 2)
+            except asyncio.TimeoutError:
+                self.timeouts += 1
+                return None
+            us = time.ticks_diff(self._t_fall, self._t_rise)
+            if us > self._timeout_us:
+                self.timeouts += 1
+                return None
+            return self._to_cm(us)
+
+    async def measure_burst(self, n=5, **kwargs):
+        """n pings via measure(), reduced by filter_readings(); cm or None."""
+        readings = []
+        for _ in range(n):
+            readings.append(await self.measure())
+        return filter_readings(readings, **kwargs)
+
+    def stats(self):
+        return {"pings": self.pings, "timeouts": self.timeouts,
+                "busy": self.busy, "out_of_range": self.out_of_range}
+
 
-        while self.echo.value() == 0:
-            pulse_start = time.ticks_us()
+def filter_readings(readings, *, method="median", trim=0.2,
+                    max_dev_cm=5.0, max_dev_rel=0.1, min_valid=None):
+    """
+    Combine ping results (cm or None) into one distance. Missing readings
+    are dropped, then those further from the median than
+    max(max_dev_cm, max_dev_rel * median). method="median" returns the
+    median of the rest, method="trimmed" their mean after cutting `trim`
+    of the readings off each end. None if fewer than min_valid (default:
+    a majority of the pings) survive.
+    """
+    n = len(readings)
+    if min_valid is None:
+        min_valid = n // 2 + 1
+    vals = sorted(r for r in readings if r is not None)
+    if not vals:
+        return None
+    med = _median(vals)
+    dev = max(max_dev_cm, max_dev_rel * med)
+    vals = [v for v in vals if abs(v - med) <= dev]
+    if len(vals) < min_valid:
+        return None
+    if method == "median":
+        return _median(vals)
+    if method != "trimmed":
+        raise ValueError("method must be 'median' or 'trimmed'")
+    k = int(len(vals) * trim)
+    if k and len(vals) > 2 * k:
+        vals = vals[k:-k]
+    return sum(vals) / len(vals)
 
-        while self.echo.value() == 1:
-            pulse_end = time.ticks_us()
 
-        duration = time.ticks_diff(pulse_end, pulse_start)
-        distance = (duration / 2) * 0.0343  # in cm
-        return distance
+def _median(sorted_vals):
+    m = len(sorted_vals)
+    h = m // 2
+    if m & 1:
+        return sorted_vals[h]
+    return (sorted_vals[h - 1] + sorted_vals[h]) / 2